@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Import the full episode history of a Radio France show into its archive.
+
+The regular builds only look at the first listing pages. A backfill walks
+the show's pagination to the end, fetches episodes concurrently under a
+request rate limit, and merges them into the archive in batches. Progress
+is journaled after every batch, so an interrupted backfill resumes from the
+listing page it was on. The next regular build publishes the new episodes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+from build_feed import (
+    SKIP_BEFORE_MIN_DATE,
+    BuildReport,
+    CrawlBudget,
+    PageParser,
+    RadioFranceFeedConfig,
+    atomic_write_text,
+    crawl_new_episodes,
+    create_session,
+    get_episode_links_from_page,
+    index_archive,
+    iter_archive,
+    iter_validated_archive,
+    load_crawl_state,
+    merge_sorted_episodes,
+    save_crawl_state,
+    sort_episodes_newest_first,
+    write_archive_stream,
+)
+from feed_registry import load_registry
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_BATCH_SIZE = 50
+# A link failing this many times across runs is left out of the backfill.
+MAX_LINK_ATTEMPTS = 3
+
+
+class RateLimitedSession:
+    """Space out GET and HEAD requests of a session shared by many threads."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        requests_per_second: float | None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ) -> None:
+        self.session = session
+        self.interval = 1 / requests_per_second if requests_per_second else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_slot(self) -> None:
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+    def get(self, url, **kwargs):
+        self._wait_for_slot()
+        return self.session.get(url, **kwargs)
+
+    def head(self, url, **kwargs):
+        self._wait_for_slot()
+        return self.session.head(url, **kwargs)
+
+
+def default_journal_file(config: RadioFranceFeedConfig) -> Path:
+    return Path(".cache") / f"{Path(config.archive_file).stem}-backfill.json"
+
+
+def load_journal(path: Path, config: RadioFranceFeedConfig) -> dict:
+    journal = {
+        "show_url": config.show_url,
+        "next_page": config.show_url,
+        "pages_done": 0,
+        "links_added": 0,
+        "failures": {},
+        "page_failures": {},
+        "finished": False,
+    }
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            journal.update(json.load(f))
+
+    if journal["show_url"] != config.show_url:
+        raise ValueError(f"{path} journals a backfill of {journal['show_url']}")
+    return journal
+
+
+def save_journal(path: Path, journal: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(journal, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    atomic_write_text(path, text)
+
+
+def commit_batch(config: RadioFranceFeedConfig, episodes: list[dict]) -> int:
+    """Merge episodes into the archive file; returns the archive size."""
+    old_episodes = iter_archive(config)
+    if not index_archive(config).newest_first:
+        old_episodes = sort_episodes_newest_first(old_episodes)
+
+    return write_archive_stream(
+        config,
+        iter_validated_archive(merge_sorted_episodes(old_episodes, episodes)),
+    )
+
+
+def backfill(
+    config: RadioFranceFeedConfig,
+    journal_file: Path,
+    session=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pages: int | None = None,
+) -> dict:
+    """Walk the show's listing pages from the journal's position to the end."""
+    # Nothing is published here, so enclosure lengths are fetched inline.
+    config = replace(config, prefetch_lengths=False)
+    session = session or create_session(config.http2)
+    journal = load_journal(journal_file, config)
+    state = load_crawl_state(config)
+    known_urls = index_archive(config).urls
+    batch = []
+    pages = 0
+
+    def commit() -> None:
+        if batch:
+            total = commit_batch(config, batch)
+            journal["links_added"] += len(batch)
+            print(f"Committed {len(batch)} episodes, archive now has {total}")
+            batch.clear()
+        save_crawl_state(config, state)
+        save_journal(journal_file, journal)
+
+    # Whatever stops the walk, the episodes crawled so far and the journal
+    # position are saved, so a resumed backfill does not repeat them.
+    try:
+        # One parser pool for the whole backfill, not one per listing page.
+        with PageParser(config.parse_processes) as parser:
+            while journal["next_page"] and not journal["finished"]:
+                if max_pages is not None and pages >= max_pages:
+                    break
+
+                page_url = journal["next_page"]
+                print(f"Listing page {journal['pages_done'] + 1}: {page_url}")
+                try:
+                    links, next_page_url, records = get_episode_links_from_page(
+                        session, page_url, config
+                    )
+                except requests.RequestException as exc:
+                    # Retries are spent; stop here so the next run resumes on this page.
+                    print(f"  -> listing page failed, stopping: {exc}")
+                    failures = journal["page_failures"]
+                    failures[page_url] = failures.get(page_url, 0) + 1
+                    break
+                journal["page_failures"].pop(page_url, None)
+                given_up = {
+                    link
+                    for link, attempts in journal["failures"].items()
+                    if attempts >= MAX_LINK_ATTEMPTS
+                }
+                report = BuildReport()
+                new_episodes = crawl_new_episodes(
+                    session,
+                    config,
+                    links,
+                    records,
+                    known_urls | given_up,
+                    state,
+                    datetime.now(timezone.utc),
+                    CrawlBudget(None),
+                    report,
+                    parser=parser,
+                )
+
+                for link in report.failed_links:
+                    journal["failures"][link] = journal["failures"].get(link, 0) + 1
+                for episode in new_episodes:
+                    journal["failures"].pop(episode["url"], None)
+                    known_urls.add(episode["url"])
+                batch.extend(new_episodes)
+
+                reached_min_date = config.stop_when_before_min_published_date and any(
+                    state["skipped"].get(link, {}).get("reason") == SKIP_BEFORE_MIN_DATE
+                    for link in links
+                )
+                journal["pages_done"] += 1
+                journal["next_page"] = None if reached_min_date else next_page_url
+                journal["finished"] = not journal["next_page"]
+                pages += 1
+
+                if len(batch) >= batch_size or journal["finished"]:
+                    commit()
+    finally:
+        commit()
+    return journal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    configs = load_registry()
+    parser.add_argument("feed", choices=sorted(configs))
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_REQUESTS_PER_SECOND,
+        help="maximum requests per second, 0 for no limit",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-pages", type=int, help="stop after this many listing pages")
+    parser.add_argument("--journal", type=Path, help="journal file to resume from")
+    parser.add_argument("--restart", action="store_true", help="discard the journal first")
+    args = parser.parse_args(argv)
+
+    config = replace(configs[args.feed], fetch_workers=args.workers)
+    journal_file = args.journal or default_journal_file(config)
+    if args.restart:
+        journal_file.unlink(missing_ok=True)
+
+    journal = backfill(
+        config,
+        journal_file,
+        RateLimitedSession(create_session(config.http2), args.rate),
+        args.batch_size,
+        args.max_pages,
+    )
+
+    print()
+    print(f"Listing pages done: {journal['pages_done']}")
+    print(f"Episodes added: {journal['links_added']}")
+    print(f"Links failing: {len(journal['failures'])}")
+    print("Backfill finished" if journal["finished"] else f"Resume from {journal['next_page']}")
+    return 1 if journal["next_page"] in journal["page_failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Compare the stdlib and orjson codecs on archives and JSON-LD.
+
+    python -m benchmarks.bench_json_codec [SIZE ...]
+
+Reads and writes the committed archives and synthetic ones of each size
+with both codecs: a read streams the file through iter_archive_file, a
+write joins iter_archive_json. "jsonld" parses the JSON-LD of synthetic
+episode and listing pages. Seconds are the best of three runs. Both codecs
+must parse the same values and write the same bytes.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+import json_codec
+from build_feed import JSONLD_SCRIPT_RE, iter_archive_file, iter_archive_json
+from benchmarks.synthetic import (
+    synthetic_episode_page,
+    synthetic_listing_page,
+    write_synthetic_archive,
+)
+
+
+DEFAULT_SIZES = (10_000, 100_000)
+REAL_ARCHIVES = (
+    "episodes.json",
+    "francois-rollin-episodes.json",
+    "roselyne-bachelot-episodes.json",
+)
+JSONLD_PAGES = 2_000
+REPEAT = 3
+
+
+@contextmanager
+def codec(name: str) -> Iterator[None]:
+    """Run with orjson, or with the stdlib as if orjson were not installed."""
+    installed = json_codec.orjson
+    if name == "json":
+        json_codec.orjson = None
+    try:
+        yield
+    finally:
+        json_codec.orjson = installed
+
+
+def best_of(function: Callable):
+    seconds = math.inf
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = function()
+        seconds = min(seconds, time.perf_counter() - started)
+    return seconds, result
+
+
+def jsonld_scripts() -> list[bytes]:
+    pages = [synthetic_episode_page(index) for index in range(JSONLD_PAGES)]
+    pages.append(synthetic_listing_page(1_000))
+    return [
+        match.group(1)
+        for page in pages
+        for match in JSONLD_SCRIPT_RE.finditer(page.encode("utf-8"))
+    ]
+
+
+def main(argv: list[str]) -> int:
+    sizes = [int(arg) for arg in argv] or list(DEFAULT_SIZES)
+    codecs = ["json", "orjson"] if json_codec.orjson is not None else ["json"]
+    print(f"{'input':<38}  {'step':<6}  " + "  ".join(f"{name:>8}" for name in codecs))
+
+    with tempfile.TemporaryDirectory() as directory:
+        archives = [Path(name) for name in REAL_ARCHIVES if Path(name).exists()]
+        for size in sizes:
+            archives.append(write_synthetic_archive(Path(directory) / f"synthetic-{size}.json", size))
+
+        for path in archives:
+            text = path.read_text(encoding="utf-8")
+            reads, writes = [], []
+            for name in codecs:
+                with codec(name):
+                    seconds, items = best_of(lambda: list(iter_archive_file(path)))
+                    reads.append((seconds, items))
+                    seconds, written = best_of(lambda: "".join(iter_archive_json(items)))
+                    writes.append((seconds, written))
+            assert all(items == reads[0][1] for _, items in reads), "codecs parsed different items"
+            assert all(written == text for _, written in writes), f"{path.name} was not rewritten as is"
+            label = f"{path.name} ({len(reads[0][1])})"
+            for step, results in (("read", reads), ("write", writes)):
+                timings = "  ".join(f"{seconds:>8.3f}" for seconds, _ in results)
+                print(f"{label:<38}  {step:<6}  {timings}")
+
+    scripts = jsonld_scripts()
+    results = []
+    for name in codecs:
+        with codec(name):
+            results.append(best_of(lambda: [json_codec.loads(script) for script in scripts]))
+    assert all(values == results[0][1] for _, values in results), "codecs parsed different JSON-LD"
+    timings = "  ".join(f"{seconds:>8.3f}" for seconds, _ in results)
+    label = f"JSON-LD scripts ({len(scripts)})"
+    print(f"{label:<38}  {'parse':<6}  {timings}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""Compare full-page and strained link discovery on big listing pages.
+
+    python -m benchmarks.bench_listing_links [EPISODES_PER_PAGE ...]
+
+"full" is the previous code path: a whole-page BeautifulSoup parse, then
+one urljoin/urlparse per anchor and a list scan to dedupe. "strained"
+parses only anchors, links and scripts with lxml, resolves each distinct
+href once and dedupes with an ordered dict. Seconds cover parsing, links
+and the next page; both modes must also yield the same listing records.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from build_feed import (
+    BASE_URL,
+    RadioFranceFeedConfig,
+    extract_episode_links_from_soup,
+    extract_listing_episodes_from_soup,
+    find_next_page_url,
+    parse_listing_page,
+    show_episode_url,
+)
+from feed_registry import registry_config
+from benchmarks.synthetic import SYNTHETIC_SHOW_PATH, synthetic_listing_page
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+DEFAULT_SIZES = (100, 1_000, 5_000)
+CONFIG = dataclasses.replace(
+    FRANCE_CULTURE_CONFIG,
+    show_url=BASE_URL + SYNTHETIC_SHOW_PATH,
+    show_path=SYNTHETIC_SHOW_PATH + "/",
+)
+
+
+def full_links(soup: BeautifulSoup, config: RadioFranceFeedConfig) -> list[str]:
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        full_url = show_episode_url(anchor["href"], config)
+        if full_url and full_url not in links:
+            links.append(full_url)
+    return links
+
+
+def discover(html_page: str, strained: bool) -> tuple[BeautifulSoup, list[str], str | None]:
+    if strained:
+        soup = parse_listing_page(html_page)
+        links = extract_episode_links_from_soup(soup, CONFIG)
+    else:
+        soup = BeautifulSoup(html_page, "html.parser")
+        links = full_links(soup, CONFIG)
+    return soup, links, find_next_page_url(soup, CONFIG.show_url)
+
+
+def main(argv: list[str]) -> int:
+    sizes = [int(arg) for arg in argv] or list(DEFAULT_SIZES)
+    print(f"{'episodes':>9}  {'mode':<9}  {'seconds':>8}")
+
+    for size in sizes:
+        html_page = synthetic_listing_page(size)
+        outputs = []
+        for mode, strained in (("full", False), ("strained", True)):
+            started = time.perf_counter()
+            soup, links, next_page_url = discover(html_page, strained)
+            elapsed = time.perf_counter() - started
+            records = extract_listing_episodes_from_soup(soup, links)
+            outputs.append((links, next_page_url, records))
+            print(f"{size:>9}  {mode:<9}  {elapsed:>8.3f}")
+        assert outputs[0] == outputs[1], "strained discovery changed the output"
+        assert len(outputs[1][0]) == size
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""Compare reading whole episode pages with the streamed early-abort read.
+
+    python -m benchmarks.bench_page_fetch [PAGES]
+
+Pages are synthetic but sized like radiofrance.fr episode pages. Wire bytes
+are the gzip size of what each mode reads, as the server sends it.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import zlib
+
+from build_feed import EPISODE_PAGE_CHUNK, parse_episode_page, read_episode_page
+from benchmarks.synthetic import synthetic_episode_page
+
+
+DEFAULT_PAGES = 64
+
+
+def wire_size(data: bytes) -> int:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return len(compressor.compress(data) + compressor.flush())
+
+
+def chunks(data: bytes, read: list[int]):
+    for start in range(0, len(data), EPISODE_PAGE_CHUNK):
+        chunk = data[start : start + EPISODE_PAGE_CHUNK]
+        read.append(len(chunk))
+        yield chunk
+
+
+def run(pages: list[bytes], streamed: bool) -> tuple[float, int, int]:
+    read = []
+    wire = 0
+    started = time.perf_counter()
+    for page in pages:
+        before = sum(read)
+        if streamed:
+            text = read_episode_page(chunks(page, read))
+        else:
+            text = b"".join(chunks(page, read)).decode("utf-8", errors="replace")
+        wire += wire_size(page[: sum(read) - before])
+        assert parse_episode_page(text)["audio_url"]
+    return time.perf_counter() - started, sum(read), wire
+
+
+def main(argv: list[str]) -> int:
+    count = int(argv[0]) if argv else DEFAULT_PAGES
+    pages = [synthetic_episode_page(index).encode("utf-8") for index in range(count)]
+
+    print(f"{count} pages, {EPISODE_PAGE_CHUNK // 1024} KiB chunks")
+    print(f"{'mode':<9}  {'seconds':>8}  {'KiB read':>9}  {'KiB wire':>9}")
+    for label, streamed in (("full", False), ("streamed", True)):
+        seconds, read, wire = run(pages, streamed)
+        print(f"{label:<9}  {seconds:8.2f}  {read / count / 1024:9.1f}  {wire / count / 1024:9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
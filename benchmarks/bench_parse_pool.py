@@ -0,0 +1,46 @@
+"""Time episode page parsing in-thread and through the process pool.
+
+    python -m benchmarks.bench_parse_pool [PAGES [PROCESSES]]
+
+Pages are synthetic but sized like radiofrance.fr episode pages, so the
+numbers show how parsing scales once fetch threads deliver pages faster
+than one core can parse them.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from build_feed import PageParser
+from benchmarks.synthetic import synthetic_episode_page
+
+
+DEFAULT_PAGES = 64
+FETCH_WORKERS = 8
+
+
+def run(pages: list[str], processes: int) -> float:
+    started = time.perf_counter()
+    with PageParser(processes) as parse, ThreadPoolExecutor(FETCH_WORKERS) as pool:
+        results = list(pool.map(parse, pages))
+    assert all(result and result["audio_url"] for result in results)
+    return time.perf_counter() - started
+
+
+def main(argv: list[str]) -> int:
+    count = int(argv[0]) if argv else DEFAULT_PAGES
+    processes = int(argv[1]) if len(argv) > 1 else os.cpu_count() or 1
+    pages = [synthetic_episode_page(index) for index in range(count)]
+    size = sum(len(page) for page in pages) / count / 1024
+
+    print(f"{count} pages of {size:.0f} KiB, {FETCH_WORKERS} fetch threads")
+    print(f"in-thread parsing: {run(pages, 0):.2f}s")
+    print(f"{processes} parse processes: {run(pages, processes):.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
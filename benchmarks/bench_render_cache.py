@@ -0,0 +1,52 @@
+"""Time feed rendering with a cold and a warm item render cache.
+
+    python -m benchmarks.bench_render_cache [SIZE ...]
+
+The warm run adds one new episode, as a typical scheduled run does, so it
+should render a single item whatever the archive size.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from build_feed import write_feed_documents
+from feed_registry import registry_config
+from benchmarks.synthetic import iter_synthetic_episodes, new_synthetic_episodes
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+DEFAULT_SIZES = (1_000, 10_000)
+
+
+def main(argv: list[str]) -> int:
+    sizes = [int(arg) for arg in argv] or list(DEFAULT_SIZES)
+    print(f"{'episodes':>9}  {'cache':<5}  {'seconds':>8}")
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = dataclasses.replace(
+                FRANCE_CULTURE_CONFIG,
+                output_file=str(Path(tmp) / "feed.xml"),
+                render_cache_file=str(Path(tmp) / "render-cache.sqlite"),
+                gzip_level=None,
+            )
+            runs = (
+                ("cold", list(iter_synthetic_episodes(size))),
+                ("warm", new_synthetic_episodes(1) + list(iter_synthetic_episodes(size))),
+            )
+            for name, episodes in runs:
+                started = time.perf_counter()
+                write_feed_documents(config, episodes, len(episodes))
+                elapsed = time.perf_counter() - started
+                print(f"{size:>9}  {name:<5}  {elapsed:>8.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
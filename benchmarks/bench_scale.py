@@ -0,0 +1,213 @@
+"""Time the offline builder functions on synthetic inputs of growing size.
+
+    python -m benchmarks.bench_scale [--sizes 1000 10000 100000]
+        [--save benchmarks/baseline.json | --check benchmarks/baseline.json]
+
+Every function runs on a synthetic archive or Audiomeans feed of each size.
+Seconds are the best of --repeat untraced runs; peak MiB comes from one more
+run under tracemalloc, counting only what the function itself allocates.
+The growth column is the exponent k in seconds ~ size**k since the previous
+size: about 1 is linear, 2 is quadratic.
+
+--save merges the results into a baseline, replacing the functions and
+sizes that ran. --check compares against one and exits 1 when a function
+got slower or bigger than the tolerances allow.
+Timings only compare on the machine that wrote the baseline; peak memory
+compares anywhere.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable
+
+from build_feed import (
+    build_rss,
+    iter_rss_chunks,
+    merge_episodes,
+    sort_episodes_newest_first,
+    sort_rss_items_newest_first,
+    validate_archive,
+)
+from feed_registry import registry_config
+from keep_integrale import CONFIG as GROSSES_TETES_CONFIG, build_split_feeds, render_xml
+from benchmarks.synthetic import (
+    iter_synthetic_episodes,
+    new_synthetic_episodes,
+    synthetic_audiomeans_feed,
+)
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_REPEAT = 3
+DEFAULT_TIME_TOLERANCE = 1.0
+DEFAULT_MEMORY_TOLERANCE = 0.25
+NOW = "Thu, 01 Oct 2026 07:00:00 GMT"
+
+RADIO_FRANCE_CONFIG = dataclasses.replace(FRANCE_CULTURE_CONFIG, render_cache_file=None)
+SPLIT_CONFIG = dataclasses.replace(GROSSES_TETES_CONFIG, websub_hub=None)
+
+
+def episodes(size: int) -> list[dict]:
+    return list(iter_synthetic_episodes(size))
+
+
+def shuffled_episodes(size: int) -> list[dict]:
+    items = episodes(size)
+    random.Random(size).shuffle(items)
+    return items
+
+
+def unsorted_rss(size: int) -> bytes:
+    return b"".join(iter_rss_chunks(RADIO_FRANCE_CONFIG, shuffled_episodes(size)))
+
+
+def integrale_render_args(size: int) -> tuple:
+    roots, sources = build_split_feeds(synthetic_audiomeans_feed(size), SPLIT_CONFIG, NOW)
+    return roots[SPLIT_CONFIG.output_integrale], SPLIT_CONFIG.style_file, sources
+
+
+# Each case builds its arguments outside the measured call, once per run,
+# since some of the functions change their input in place.
+CASES: dict[str, tuple[Callable[[int], tuple], Callable]] = {
+    "validate_archive": (lambda size: (episodes(size),), validate_archive),
+    "merge_episodes": (
+        lambda size: (episodes(size), new_synthetic_episodes(5)),
+        merge_episodes,
+    ),
+    "sort_episodes_newest_first": (
+        lambda size: (shuffled_episodes(size),),
+        sort_episodes_newest_first,
+    ),
+    "build_rss": (
+        lambda size: (RADIO_FRANCE_CONFIG, episodes(size)),
+        build_rss,
+    ),
+    "sort_rss_items_newest_first": (
+        lambda size: (unsorted_rss(size),),
+        sort_rss_items_newest_first,
+    ),
+    "build_split_feeds": (
+        lambda size: (synthetic_audiomeans_feed(size), SPLIT_CONFIG, NOW),
+        build_split_feeds,
+    ),
+    "render_xml": (
+        integrale_render_args,
+        render_xml,
+    ),
+}
+
+
+def measure(setup: Callable[[int], tuple], function: Callable, size: int, repeat: int) -> dict:
+    seconds = math.inf
+    for _ in range(repeat):
+        args = setup(size)
+        started = time.perf_counter()
+        function(*args)
+        seconds = min(seconds, time.perf_counter() - started)
+
+    args = setup(size)
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 4), "peak_mib": round(peak / (1 << 20), 2)}
+
+
+def run_suite(
+    sizes: list[int],
+    names: list[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+) -> dict[str, dict[str, dict]]:
+    """Results keyed by function name, then by size as a string (JSON keys)."""
+    results = {}
+    print(f"{'function':<28}  {'items':>7}  {'seconds':>8}  {'peak MiB':>9}  {'growth':>6}")
+    for name in names or list(CASES):
+        setup, function = CASES[name]
+        results[name] = {}
+        previous = None
+        for size in sizes:
+            result = measure(setup, function, size, repeat)
+            results[name][str(size)] = result
+            growth = ""
+            if previous and previous[1] > 0 and result["seconds"] > 0:
+                growth = f"{math.log(result['seconds'] / previous[1]) / math.log(size / previous[0]):.2f}"
+            print(
+                f"{name:<28}  {size:>7}  {result['seconds']:>8.3f}  "
+                f"{result['peak_mib']:>9.1f}  {growth:>6}"
+            )
+            previous = (size, result["seconds"])
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, dict]],
+    baseline: dict[str, dict[str, dict]],
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> list[str]:
+    """Describe every measurement that exceeds its baseline by more than the tolerance.
+
+    Sizes or functions missing from the baseline are not compared.
+    """
+    problems = []
+    limits = (("seconds", time_tolerance), ("peak_mib", memory_tolerance))
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            expected = baseline.get(name, {}).get(size)
+            if expected is None:
+                continue
+            for metric, tolerance in limits:
+                limit = expected[metric] * (1 + tolerance)
+                if result[metric] > limit:
+                    problems.append(
+                        f"{name} at {size} items: {metric} {result[metric]} "
+                        f"exceeds baseline {expected[metric]} (limit {limit:.4g})"
+                    )
+    return problems
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--functions", nargs="+", choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    gate = parser.add_mutually_exclusive_group()
+    gate.add_argument("--save", type=Path, nargs="?", const=DEFAULT_BASELINE)
+    gate.add_argument("--check", type=Path, nargs="?", const=DEFAULT_BASELINE)
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.functions, args.repeat)
+
+    if args.save:
+        baseline = json.loads(args.save.read_text(encoding="utf-8")) if args.save.exists() else {}
+        for name, by_size in results.items():
+            baseline.setdefault(name, {}).update(by_size)
+        args.save.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.save}")
+    if args.check:
+        baseline = json.loads(args.check.read_text(encoding="utf-8"))
+        problems = regressions(results, baseline, args.time_tolerance, args.memory_tolerance)
+        for problem in problems:
+            print(f"Regression: {problem}")
+        if problems:
+            return 1
+        print(f"No regressions against {args.check}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,104 @@
+"""Compare peak memory of the list and streaming archive-to-feed pipelines.
+
+    python -m benchmarks.bench_streaming [SIZE ...]
+
+Both pipelines merge a handful of new episodes into a synthetic archive,
+write the archive and write the feed. Peaks come from tracemalloc.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from build_feed import (
+    RadioFranceFeedConfig,
+    filter_episodes_by_min_date,
+    index_archive,
+    iter_archive,
+    iter_archive_file,
+    iter_episodes_since_min_date,
+    iter_validated_archive,
+    load_archive,
+    merge_episodes,
+    merge_sorted_episodes,
+    save_archive,
+    write_archive_stream,
+    write_feed_documents,
+    write_rss,
+)
+from feed_registry import registry_config
+from benchmarks.synthetic import new_synthetic_episodes, write_synthetic_archive
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+DEFAULT_SIZES = (10_000, 100_000)
+NEW_EPISODES = 5
+
+
+def list_pipeline(config: RadioFranceFeedConfig, new_episodes: list[dict]) -> None:
+    archive = load_archive(config)
+    episodes = filter_episodes_by_min_date(config, merge_episodes(archive, new_episodes))
+    save_archive(config, episodes)
+    write_rss(config, episodes)
+
+
+def streaming_pipeline(config: RadioFranceFeedConfig, new_episodes: list[dict]) -> None:
+    index_archive(config)
+    total = write_archive_stream(
+        config,
+        iter_episodes_since_min_date(
+            config,
+            iter_validated_archive(
+                merge_sorted_episodes(iter_archive(config), new_episodes)
+            ),
+        ),
+    )
+    write_feed_documents(config, iter_archive_file(config.archive_file), total)
+
+
+def measure(
+    pipeline: Callable[[RadioFranceFeedConfig, list[dict]], None],
+    directory: Path,
+    size: int,
+) -> tuple[float, float]:
+    config = dataclasses.replace(
+        FRANCE_CULTURE_CONFIG,
+        archive_file=str(directory / "episodes.json"),
+        output_file=str(directory / "feed.xml"),
+        state_file=str(directory / "state.json"),
+        gzip_level=None,
+        render_cache_file=None,
+    )
+    write_synthetic_archive(config.archive_file, size)
+    new_episodes = new_synthetic_episodes(NEW_EPISODES)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    pipeline(config, new_episodes)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1 << 20), elapsed
+
+
+def main(argv: list[str]) -> int:
+    sizes = [int(arg) for arg in argv] or list(DEFAULT_SIZES)
+    print(f"{'episodes':>9}  {'pipeline':<9}  {'peak MiB':>9}  {'seconds':>8}")
+
+    for size in sizes:
+        for name, pipeline in (("list", list_pipeline), ("streaming", streaming_pipeline)):
+            with tempfile.TemporaryDirectory() as tmp:
+                peak, elapsed = measure(pipeline, Path(tmp), size)
+            print(f"{size:>9}  {name:<9}  {peak:>9.1f}  {elapsed:>8.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,164 @@
+"""Synthetic Radio France archives and Audiomeans feeds for benchmarks."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Iterator
+
+from build_feed import iter_archive_json
+
+
+SYNTHETIC_START = datetime(2026, 10, 1, 7, tzinfo=timezone.utc)
+
+
+def synthetic_episode(index: int) -> dict:
+    """Episode number index, one hour older than episode index - 1."""
+    published = SYNTHETIC_START - timedelta(hours=index)
+    slug = f"episode-synthetique-{index}"
+    return {
+        "title": f"Épisode synthétique {index}",
+        "description": (
+            "Un épisode généré pour mesurer le pipeline du flux. " * 4
+        ).strip(),
+        "audio_url": f"https://media.radiofrance-podcast.net/podcast09/{slug}.m4a",
+        "audio_type": "audio/mp4",
+        "duration_seconds": 3540,
+        "duration_itunes": "59:00",
+        "published": published.isoformat(),
+        "image": "https://www.radiofrance.fr/pikapi/images/synthetic/300x300",
+        "url": f"https://www.radiofrance.fr/franceculture/podcasts/synthetique/{slug}",
+        "audio_length": 85000000 + index,
+    }
+
+
+def iter_synthetic_episodes(count: int, start: int = 0) -> Iterator[dict]:
+    for index in range(start, start + count):
+        yield synthetic_episode(index)
+
+
+def write_synthetic_archive(path: str | Path, count: int) -> Path:
+    """Write a newest-first archive of count episodes, as the builder would."""
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_archive_json(iter_synthetic_episodes(count)):
+            f.write(chunk)
+    return path
+
+
+def new_synthetic_episodes(count: int) -> list[dict]:
+    """Episodes newer than every archived one, as a run would discover."""
+    return [synthetic_episode(-index) for index in range(1, count + 1)]
+
+
+def synthetic_episode_page(index: int) -> str:
+    """An episode page sized like radiofrance.fr ones, JSON-LD in the head."""
+    episode = synthetic_episode(index)
+    jsonld = {
+        "@graph": [
+            {
+                "@type": "RadioEpisode",
+                "name": episode["title"],
+                "description": episode["description"],
+                "dateCreated": episode["published"],
+                "image": {"url": episode["image"]},
+                "mainEntity": {
+                    "contentUrl": episode["audio_url"],
+                    "duration": "PT59M",
+                    "encodingFormat": "audio/mp4",
+                },
+            }
+        ]
+    }
+    filler = "".join(
+        f'<div class="card"><a href="/franceculture/podcasts/autre-{n}">'
+        f"<span>Autre émission {n}</span></a><p>{'Texte ' * 20}</p></div>"
+        for n in range(400)
+    )
+    return (
+        "<html><head>"
+        f'<meta property="og:title" content="{episode["title"]}">'
+        f'<script type="application/ld+json">{json.dumps(jsonld)}</script>'
+        f"</head><body>{filler}</body></html>"
+    )
+
+
+AUDIOMEANS_TITLES = (
+    "L'INTÉGRALE - Émission synthétique {index}",
+    "BEST OF - Les meilleurs moments {index}",
+    "MOMENT CULTE - Extrait {index}",
+    "LE MEILLEUR DE RUQUIER - Histoire {index}",
+)
+
+
+def synthetic_audiomeans_feed(count: int) -> bytes:
+    """An Audiomeans-style Grosses Têtes feed of count items, newest first.
+
+    Titles cycle through the integrale, best-of and remaining families, so
+    every split feed gets a share of the items; one best-of in four is too
+    short to count as one.
+    """
+    items = []
+    for index in range(count):
+        published = SYNTHETIC_START - timedelta(hours=index)
+        title = AUDIOMEANS_TITLES[index % len(AUDIOMEANS_TITLES)].format(index=index)
+        duration = "00:12:00" if index % 8 == 5 else "01:30:00"
+        items.append(
+            "<item>"
+            f"<title>{title}</title>"
+            f'<guid isPermaLink="false">urn:synthetic:{index}</guid>'
+            f"<pubDate>{format_datetime(published, usegmt=True)}</pubDate>"
+            f'<enclosure url="https://audio.audiomeans.fr/synthetique/{index}.mp3"'
+            f' length="{52000000 + index}" type="audio/mpeg"/>'
+            f"<itunes:duration>{duration}</itunes:duration>"
+            "<description>Un épisode généré pour mesurer le découpage du flux.</description>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">'
+        "<channel>"
+        "<title>Les Grosses Têtes</title>"
+        "<link>https://www.rtl.fr/emission/les-grosses-tetes</link>"
+        "<description>Flux synthétique</description>"
+        "<itunes:author>RTL</itunes:author>"
+        "<itunes:explicit>false</itunes:explicit>"
+        f"{''.join(items)}"
+        "</channel></rss>"
+    ).encode("utf-8")
+
+
+SYNTHETIC_SHOW_PATH = "/franceculture/podcasts/synthetique"
+
+
+def synthetic_listing_page(count: int, start: int = 0) -> str:
+    """A show listing page linking count episodes, each card linking its episode thrice."""
+    cards = []
+    for index in range(start, start + count):
+        path = synthetic_episode(index)["url"].removeprefix("https://www.radiofrance.fr")
+        cards.append(
+            f'<li class="card"><a href="{path}"><img src="/img/{index}.jpg" alt=""></a>'
+            f'<h3><a href="{path}">Épisode synthétique {index}</a></h3>'
+            f'<a href="/franceculture/podcasts/autre-{index % 40}">Autre émission</a>'
+            f"<p>{'Texte ' * 20}</p>"
+            f'<a href="{path}">Écouter</a></li>'
+        )
+    jsonld = {
+        "@graph": [
+            {
+                "@type": "RadioEpisode",
+                "url": episode["url"],
+                "name": episode["title"],
+            }
+            for episode in iter_synthetic_episodes(count, start)
+        ]
+    }
+    return (
+        "<html><head>"
+        f'<link rel="next" href="{SYNTHETIC_SHOW_PATH}?p={start // max(count, 1) + 2}">'
+        f'<script type="application/ld+json">{json.dumps(jsonld)}</script>'
+        f'</head><body><nav><a href="{SYNTHETIC_SHOW_PATH}">Accueil</a></nav>'
+        f"<ul>{''.join(cards)}</ul></body></html>"
+    )
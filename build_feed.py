@@ -3,26 +3,57 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import html
 import json
+import math
+import multiprocessing
 import os
 import re
+import sqlite3
 import tempfile
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
+from itertools import groupby, islice
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Container, Iterable, Iterator
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from dateutil.parser import isoparse
 from feedgen.feed import FeedGenerator
+from feedgen.version import version_str as FEEDGEN_VERSION
 from lxml import etree
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from feed_validation import validate_feed_file
+from http2_transport import HTTP2Adapter
+from json_codec import JSONDecodeError, iter_dumps_list, loads as json_loads
+from static_pages import DEFAULT_HTML_PAGE_SIZE, render_static_pages, stale_page_files
+from websub import PENDING_PINGS_FILE, feed_item_ids, record_pending_ping
+
+try:
+    import brotli
+except ImportError:  # optional dependency, only needed for .br variants
+    brotli = None
+
 
 BASE_URL = "https://www.radiofrance.fr"
 DEFAULT_PUBLIC_BASE_URL = "https://datojulien.github.io/GTRSS/"
@@ -31,6 +62,56 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Personal Radio France RSS generator)"
 }
 
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+HISTORY_NS = "http://purl.org/syndication/history/1.0"
+SITEMAP_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+HISTORY_LINK_RELS = ("current", "prev-archive", "next-archive")
+
+DEFAULT_GZIP_LEVEL = 9
+
+ITEM_OPEN = b"    <item>"
+ITEM_CLOSE = b"</item>\n"
+CHANNEL_CLOSE = b"  </channel>"
+# Bump when render_item() output changes for the same episode and config.
+RENDER_CACHE_VERSION = 1
+
+HTML_TIMEOUT_SECONDS = 25
+EPISODE_PAGE_CHUNK = 16 * 1024
+# Compressed bytes read past the parsed prefix so the connection is reused;
+# the rest of a typical page is smaller than a new TCP and TLS handshake.
+EPISODE_PAGE_DRAIN_BYTES = 64 * 1024
+JSONLD_SCRIPT_RE = re.compile(
+    rb"<script\b[^>]*\btype=[\"']application/ld\+json[\"'][^>]*>(.*?)</script\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+HEAD_CLOSE_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+LISTING_PAGE_TAGS = SoupStrainer(["a", "link", "script"])
+HEAD_TIMEOUT_SECONDS = 20
+# Budget kept free for a link until the run has observed real durations.
+MIN_TASK_RESERVE_SECONDS = 10.0
+# Retries of a failed GET or HEAD, and urllib3's sleep factor between them.
+SESSION_RETRIES = 3
+SESSION_BACKOFF_FACTOR = 0.75
+# urllib3 sleeps 0 before the first retry, then 2x, 4x... the factor.
+SESSION_RETRY_SLEEP_SECONDS = sum(
+    SESSION_BACKOFF_FACTOR * 2**n for n in range(1, SESSION_RETRIES)
+)
+# Freshness percentiles cover episodes published within this window.
+FRESHNESS_WINDOW = timedelta(days=30)
+FRESHNESS_RETENTION = timedelta(days=90)
+FRESHNESS_PERCENTILES = (50, 90, 99)
+# Fewer episode pages than this are parsed in-process; a pool would cost more.
+PARSE_POOL_MIN_PAGES = 4
+# A GET or HEAD slower than this percentile of its host's recent latencies
+# is hedged. Until a host has HEDGE_MIN_SAMPLES, the initial delay applies.
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 10
+HEDGE_WINDOW = 200
+HEDGE_INITIAL_DELAY_SECONDS = 3.0
+HEDGE_MIN_DELAY_SECONDS = 0.25
+HEDGE_MAX_WORKERS = 16
+
 
 @dataclass(frozen=True)
 class RadioFranceFeedConfig:
@@ -52,32 +133,31 @@ class RadioFranceFeedConfig:
     max_pages_to_check: int = 1
     min_published_date: str | None = None
     stop_when_before_min_published_date: bool = False
-
-
-FRANCE_CULTURE_CONFIG = RadioFranceFeedConfig(
-    show_url="https://www.radiofrance.fr/franceculture/podcasts/le-cours-de-l-histoire",
-    show_path="/franceculture/podcasts/le-cours-de-l-histoire/",
-    output_file="feed.xml",
-    style_file="feed-style.xsl",
-    archive_file="episodes.json",
-    feed_title="Le Cours de l'histoire — Flux frais",
-    feed_subtitle="Flux personnel généré depuis le site Radio France",
-    feed_description=(
-        "Un flux RSS personnel qui récupère les épisodes depuis le site web de "
-        "France Culture lorsque le flux officiel n’est pas encore à jour."
-    ),
-    feed_image=(
-        "https://www.radiofrance.fr/pikapi/images/"
-        "d1d9dd6a-bb4b-4811-bfc0-e846eaeb317f/300x300"
-    ),
-    feed_author_name="Radio France / France Culture",
-    itunes_author="France Culture",
-    itunes_category="History",
-    source_label="France Culture",
-)
+    state_file: str | None = None
+    crawl_budget_seconds: float | None = 240.0
+    revalidate_days: int | None = 7
+    html_page_size: int | None = DEFAULT_HTML_PAGE_SIZE
+    current_feed_size: int | None = None
+    archive_page_size: int = 100
+    gzip_level: int | None = DEFAULT_GZIP_LEVEL
+    brotli_quality: int | None = None
+    render_cache_file: str | None = None
+    fetch_workers: int = 4
+    parse_processes: int | None = None
+    sitemap_url: str | None = None
+    official_feed_url: str | None = None
+    prefetch_lengths: bool = True
+    freshness_file: str | None = None
+    websub_hub: str | None = None
+    websub_pending_file: str = PENDING_PINGS_FILE
+    http2: bool = False
+    hedge_budget: float | None = None
 
 
 ARCHIVE_REQUIRED_TEXT_FIELDS = ("title", "url", "audio_url", "audio_type", "published")
+ARCHIVE_READ_CHUNK = 1 << 16
+ARCHIVE_ITEM_END = "\n  }"
+ARCHIVE_TOKEN_RE = re.compile(r"\S")
 ARCHIVE_OPTIONAL_FIELDS = (
     "description",
     "duration_seconds",
@@ -85,6 +165,24 @@ ARCHIVE_OPTIONAL_FIELDS = (
     "image",
     "audio_length",
 )
+# Listing-page records carrying every field a feed item renders need no
+# episode page fetch; a record missing any of them falls back to the page.
+LISTING_REQUIRED_FIELDS = (
+    "title",
+    "description",
+    "audio_url",
+    "duration_seconds",
+    "published",
+    "image",
+)
+
+SKIP_NO_EPISODE_DATA = "no-episode-data"
+SKIP_BEFORE_MIN_DATE = "before-min-published-date"
+# A page may gain its audio later; a publication date does not move.
+SKIP_RECHECK_AFTER = {
+    SKIP_NO_EPISODE_DATA: timedelta(hours=12),
+    SKIP_BEFORE_MIN_DATE: timedelta(days=30),
+}
 
 
 def public_base_url() -> str:
@@ -98,35 +196,329 @@ def public_file_url(filename: str) -> str:
     return urljoin(public_base_url(), filename)
 
 
-def create_session() -> requests.Session:
-    retry = Retry(
-        total=3,
-        connect=3,
-        read=3,
-        status=3,
-        backoff_factor=0.75,
+def session_retry() -> Retry:
+    return Retry(
+        total=SESSION_RETRIES,
+        connect=SESSION_RETRIES,
+        read=SESSION_RETRIES,
+        status=SESSION_RETRIES,
+        backoff_factor=SESSION_BACKOFF_FACTOR,
         status_forcelist=(429, 500, 502, 503, 504),
         allowed_methods=("GET", "HEAD"),
         raise_on_status=False,
     )
+
+
+def create_session(http2: bool = False) -> requests.Session:
+    """A session with the builder's headers and retries, over HTTP/2 when asked."""
+    retry = session_retry()
     adapter = HTTPAdapter(max_retries=retry)
     session = requests.Session()
     session.headers.update(HEADERS)
-    session.mount("https://", adapter)
+    session.mount("https://", HTTP2Adapter(max_retries=retry) if http2 else adapter)
     session.mount("http://", adapter)
     return session
 
 
-def fetch_html(session: requests.Session, url: str) -> str:
-    response = session.get(url, timeout=25)
+class CrawlBudget:
+    """Wall-clock allowance for one feed run, counted from creation."""
+
+    def __init__(
+        self,
+        seconds: float | None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.seconds = seconds
+        self.clock = clock
+        self.started = clock()
+        self.task_durations: list[float] = []
+
+    def remaining(self) -> float:
+        if self.seconds is None:
+            return float("inf")
+        return self.seconds - (self.clock() - self.started)
+
+    def expected_task_seconds(self) -> float:
+        recent = self.task_durations[-5:]
+        return max([MIN_TASK_RESERVE_SECONDS, *recent])
+
+    def can_start(self) -> bool:
+        return self.remaining() > self.expected_task_seconds()
+
+    def timeout(self, default: float) -> float:
+        """Timeout of each attempt, so that a request and all its retries fit the budget."""
+        attempts = SESSION_RETRIES + 1
+        per_attempt = (self.remaining() - SESSION_RETRY_SLEEP_SECONDS) / attempts
+        return max(1.0, min(default, per_attempt))
+
+    @contextmanager
+    def task(self) -> Iterator[None]:
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.task_durations.append(self.clock() - started)
+
+
+class HedgedSession:
+    """Hedge the GET and HEAD requests of a session shared by many threads.
+
+    A request that has not answered within its host's threshold is sent a
+    second time, and the first response wins; the other one is closed when
+    it arrives. The threshold is the HEDGE_PERCENTILE of the host's recent
+    latencies, counted from when the request starts running: time spent
+    queued behind other callers' requests is not latency. Hedges stay under
+    budget_ratio times the requests sent. Other methods go straight to the
+    session.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        budget_ratio: float,
+        max_workers: int = HEDGE_MAX_WORKERS,
+        initial_delay: float = HEDGE_INITIAL_DELAY_SECONDS,
+        min_delay: float = HEDGE_MIN_DELAY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.session = session
+        self.budget_ratio = budget_ratio
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.clock = clock
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="hedge")
+
+    def threshold(self, host: str) -> float:
+        with self._lock:
+            latencies = list(self._latencies.get(host, ()))
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return self.initial_delay
+        return max(self.min_delay, percentile(latencies, HEDGE_PERCENTILE))
+
+    def _timed(
+        self,
+        host: str,
+        method: str,
+        url: str,
+        kwargs: dict,
+        running: threading.Event | None = None,
+    ) -> requests.Response:
+        if running is not None:
+            running.set()
+        started = self.clock()
+        response = self.session.request(method, url, **kwargs)
+        with self._lock:
+            self._latencies.setdefault(host, deque(maxlen=HEDGE_WINDOW)).append(
+                self.clock() - started
+            )
+        return response
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged >= self.budget_ratio * self.requests:
+                self.over_budget += 1
+                return False
+            self.hedged += 1
+            return True
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if method not in ("GET", "HEAD"):
+            return self.session.request(method, url, **kwargs)
+
+        host = urlparse(url).netloc
+        with self._lock:
+            self.requests += 1
+        running = threading.Event()
+        primary = self._executor.submit(self._timed, host, method, url, kwargs, running)
+        # A cancelled primary never runs; its done callback ends the wait.
+        primary.add_done_callback(lambda future: running.set())
+        running.wait()
+        if wait([primary], timeout=self.threshold(host)).done or not self._may_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, host, method, url, kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if not future.exception()), None)
+            if winner is not None:
+                break
+        else:
+            # Both failed: report the primary's error, as without hedging.
+            return primary.result()
+
+        if winner is hedge:
+            with self._lock:
+                self.hedge_wins += 1
+        loser = primary if winner is hedge else hedge
+        loser.add_done_callback(close_response)
+        return winner.result()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.session.post(url, **kwargs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "over_budget": self.over_budget,
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def close_response(future: Future) -> None:
+    """Release the connection of a hedged request whose twin already won."""
+    if not future.cancelled() and not future.exception():
+        future.result().close()
+
+
+@dataclass
+class BuildReport:
+    new_episodes: int = 0
+    total_episodes: int = 0
+    cached_skips: int = 0
+    deferred_links: list[str] = field(default_factory=list)
+    failed_links: list[str] = field(default_factory=list)
+    revalidated: int = 0
+    updated_episodes: int = 0
+    official_episodes: int = 0
+    enriched_episodes: int = 0
+    pending_lengths: int = 0
+    freshness: dict = field(default_factory=dict)
+    hub_ping_queued: bool = False
+    hedging: dict = field(default_factory=dict)
+
+
+def request_timeout(budget: CrawlBudget | None, default: float) -> float:
+    return budget.timeout(default) if budget else default
+
+
+def fetch_html(
+    session: requests.Session,
+    url: str,
+    timeout: float = HTML_TIMEOUT_SECONDS,
+) -> str:
+    response = session.get(url, timeout=timeout)
     response.raise_for_status()
     response.encoding = "utf-8"
     return response.text
 
 
-def fetch_content_length(session: requests.Session, url: str) -> int:
+def read_episode_page(chunks: Iterable[bytes]) -> str:
+    """Decode an episode page up to the last part parse_episode_page() reads.
+
+    Reading stops once the head has closed and the first RadioEpisode
+    JSON-LD block is complete: the meta tags live in the head, and the page
+    is cut right after both. Without such a block the whole body is read.
+    """
+    page = bytearray()
+    head_end = None
+    episode_end = None
+    scan_from = 0
+
+    for chunk in chunks:
+        page += chunk
+        if head_end is None:
+            match = HEAD_CLOSE_RE.search(page, max(0, len(page) - len(chunk) - 8))
+            head_end = match.end() if match else None
+
+        while episode_end is None:
+            match = JSONLD_SCRIPT_RE.search(page, scan_from)
+            if not match:
+                # Resume at the last script opening rather than rescanning.
+                last_script = page.rfind(b"<script", scan_from)
+                scan_from = last_script if last_script != -1 else max(scan_from, len(page) - 8)
+                break
+            scan_from = match.end()
+            try:
+                data = json_loads(match.group(1))
+            except (JSONDecodeError, UnicodeDecodeError):
+                continue
+            if radio_episode_in_graph(data):
+                episode_end = match.end()
+
+        if head_end is not None and episode_end is not None:
+            del page[max(head_end, episode_end) :]
+            break
+
+    # Same decoding as response.text with response.encoding = "utf-8".
+    return page.decode("utf-8", errors="replace")
+
+
+def fetch_episode_html(
+    session: requests.Session,
+    url: str,
+    timeout: float = HTML_TIMEOUT_SECONDS,
+) -> str:
+    """Stream an episode page up to the part read_episode_page() needs.
+
+    requests negotiates gzip/deflate (and br with brotli installed) and
+    iter_content() decompresses, so only compressed bytes cross the wire.
+    A short remainder is read and discarded so the connection goes back to
+    the pool; closing a partly read response would drop it, and the next
+    page would pay a new handshake. Longer remainders are still cut off.
+    """
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        chunks = response.iter_content(EPISODE_PAGE_CHUNK)
+        page = read_episode_page(chunks)
+        drain_from = response.raw.tell()
+        for _ in chunks:
+            if response.raw.tell() - drain_from > EPISODE_PAGE_DRAIN_BYTES:
+                break
+        return page
+
+
+def fetch_html_if_modified(
+    session: requests.Session,
+    url: str,
+    validators: dict,
+    timeout: float = HTML_TIMEOUT_SECONDS,
+) -> tuple[str | None, dict]:
+    """Conditional GET; returns no text when the server answers 304."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return None, validators
+
+    response.raise_for_status()
+    response.encoding = "utf-8"
+    return response.text, {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def fetch_content_length(
+    session: requests.Session,
+    url: str,
+    timeout: float = HEAD_TIMEOUT_SECONDS,
+) -> int:
     try:
-        response = session.head(url, allow_redirects=True, timeout=20)
+        response = session.head(url, allow_redirects=True, timeout=timeout)
         response.raise_for_status()
         content_length = response.headers.get("Content-Length")
         if content_length and content_length.isdigit():
@@ -154,6 +546,162 @@ def atomic_write_text(path: str | Path, text: str) -> None:
     atomic_write_bytes(path, text.encode("utf-8"))
 
 
+def file_sha256(path: str | Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class AtomicOutput:
+    """Stream a file and its precompressed siblings to temporary files.
+
+    On a clean exit the target and siblings are replaced together, unless the
+    new bytes match the existing target. On an exception nothing is replaced,
+    nor when validate raises on the complete temporary file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        gzip_level: int | None = None,
+        brotli_quality: int | None = None,
+        validate: Callable[[Path], None] | None = None,
+    ) -> None:
+        if brotli_quality is not None and brotli is None:
+            raise RuntimeError("brotli_quality requires the optional brotli package")
+
+        self.path = Path(path)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.validate = validate
+        self.changed = False
+
+    def _temp_file(self, suffix: str = ""):
+        return tempfile.NamedTemporaryFile(
+            "wb",
+            delete=False,
+            dir=str(self.path.parent),
+            prefix=f".{self.path.name}{suffix}.",
+        )
+
+    def __enter__(self) -> "AtomicOutput":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._digest = hashlib.sha256()
+        self._files = {"": self._temp_file()}
+        self._gzip = None
+        self._brotli = None
+
+        if self.gzip_level is not None:
+            self._files[".gz"] = self._temp_file(".gz")
+            # Same bytes as gzip.compress(data, mtime=0): a bare header, so
+            # the .gz output is stable for identical input.
+            self._gzip = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+        if self.brotli_quality is not None:
+            self._files[".br"] = self._temp_file(".br")
+            self._brotli = brotli.Compressor(quality=self.brotli_quality)
+
+        return self
+
+    def write(self, data: bytes) -> None:
+        self._digest.update(data)
+        self._files[""].write(data)
+        if self._gzip:
+            self._files[".gz"].write(self._gzip.compress(data))
+        if self._brotli:
+            self._files[".br"].write(self._brotli.process(data))
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if self._gzip and exc_type is None:
+            self._files[".gz"].write(self._gzip.flush())
+        if self._brotli and exc_type is None:
+            self._files[".br"].write(self._brotli.finish())
+        for tmp in self._files.values():
+            tmp.close()
+
+        temps = {suffix: Path(tmp.name) for suffix, tmp in self._files.items()}
+        if exc_type is None and self.validate is not None:
+            try:
+                self.validate(temps[""])
+            except BaseException:
+                for tmp_path in temps.values():
+                    tmp_path.unlink(missing_ok=True)
+                raise
+
+        if exc_type is not None:
+            for tmp_path in temps.values():
+                tmp_path.unlink(missing_ok=True)
+            return False
+
+        siblings = {
+            suffix: self.path.with_name(self.path.name + suffix)
+            for suffix in (".gz", ".br")
+        }
+        unchanged = (
+            self.path.exists()
+            and all(siblings[suffix].exists() for suffix in temps if suffix)
+            and file_sha256(self.path) == self._digest.hexdigest()
+        )
+
+        if unchanged:
+            for tmp_path in temps.values():
+                tmp_path.unlink()
+        else:
+            for suffix, sibling in siblings.items():
+                if suffix in temps:
+                    os.replace(temps[suffix], sibling)
+            os.replace(temps[""], self.path)
+
+        for suffix, sibling in siblings.items():
+            if suffix not in temps:
+                sibling.unlink(missing_ok=True)
+
+        self.changed = not unchanged
+        return False
+
+
+def write_if_changed(
+    path: str | Path,
+    data: bytes,
+    gzip_level: int | None = None,
+    brotli_quality: int | None = None,
+) -> bool:
+    """Atomically write data and its precompressed siblings when data changed."""
+    with AtomicOutput(path, gzip_level, brotli_quality) as output:
+        output.write(data)
+    return output.changed
+
+
+def remove_output(path: str | Path) -> None:
+    """Delete a generated file together with its precompressed siblings."""
+    target = Path(path)
+    target.unlink(missing_ok=True)
+    for suffix in (".gz", ".br"):
+        target.with_name(target.name + suffix).unlink(missing_ok=True)
+
+
+def write_static_pages(
+    rss: bytes,
+    output_file: str | Path,
+    style_file: str | Path,
+    page_size: int | None = DEFAULT_HTML_PAGE_SIZE,
+) -> list[Path]:
+    """Write changed HTML pages for a feed and drop pages that no longer exist."""
+    if not page_size:
+        return []
+
+    rendered = render_static_pages(rss, output_file, style_file, page_size)
+    written = []
+
+    for path, data in rendered.items():
+        if write_if_changed(path, data):
+            written.append(path)
+
+    for path in stale_page_files(output_file, rendered):
+        path.unlink()
+
+    return written
+
+
 def clean_text(value: str | None) -> str:
     if not value:
         return ""
@@ -209,6 +757,21 @@ def parse_duration_to_seconds(duration: str | None) -> int | None:
     )
 
 
+def parse_clock_duration_to_seconds(duration: str | None) -> int | None:
+    """Parse an itunes:duration value: SS, MM:SS or HH:MM:SS."""
+    if not duration:
+        return None
+
+    parts = duration.strip().split(":")
+    if len(parts) > 3 or not all(part.isdigit() for part in parts):
+        return None
+
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
 def seconds_to_itunes_duration(seconds: int | None) -> str | None:
     if not seconds:
         return None
@@ -289,35 +852,55 @@ def square_radiofrance_image_url(url: str | None, size: str = "300x300") -> str
     return urlunparse(parsed._replace(path=square_path, query="", fragment=""))
 
 
-def extract_episode_links_from_soup(
-    soup: BeautifulSoup,
-    config: RadioFranceFeedConfig,
-) -> list[str]:
-    links = []
-    show_path = config.show_path.rstrip("/")
+@lru_cache(maxsize=None)
+def show_path_pattern(show_path: str) -> re.Pattern:
+    """Match paths below show_path: a "/" child or a legacy "-" slug."""
+    return re.compile(re.escape(show_path.rstrip("/")) + "[/-]")
 
-    for anchor in soup.find_all("a", href=True):
-        href = anchor["href"]
 
-        full_url = urljoin(BASE_URL, href)
-        parsed_url = urlparse(full_url)
+def show_episode_url(href: str, config: RadioFranceFeedConfig) -> str | None:
+    """Absolute URL of href when it points below the show page, else None."""
+    full_url = urljoin(BASE_URL, href)
 
-        if parsed_url.path == show_path:
-            continue
+    if not show_path_pattern(config.show_path).match(urlparse(full_url).path):
+        return None
 
-        if not (
-            parsed_url.path.startswith(show_path + "/")
-            or parsed_url.path.startswith(show_path + "-")
-        ):
-            continue
+    if full_url == config.show_url:
+        return None
+
+    return full_url
+
+
+def parse_listing_page(html_page: str) -> BeautifulSoup:
+    """Parse only what link discovery reads from a listing page.
 
-        if full_url == config.show_url:
+    That is the anchors, the rel=next link and the embedded JSON scripts.
+    lxml tokenizes the page; the other tags never enter the tree.
+    """
+    return BeautifulSoup(html_page, "lxml", parse_only=LISTING_PAGE_TAGS)
+
+
+def extract_episode_links_from_soup(
+    soup: BeautifulSoup,
+    config: RadioFranceFeedConfig,
+) -> list[str]:
+    # Listing cards link each episode several times; resolve each href once.
+    hrefs = dict.fromkeys(anchor["href"] for anchor in soup.find_all("a", href=True))
+    # Dot segments only drop whole segments, so an href below the show page
+    # always spells out the show's last path segment.
+    show_slug = config.show_path.rstrip("/").rsplit("/", 1)[-1]
+    links = {}
+
+    for href in hrefs:
+        if show_slug not in href:
             continue
 
-        if full_url not in links:
-            links.append(full_url)
+        full_url = show_episode_url(href, config)
 
-    return links
+        if full_url:
+            links.setdefault(full_url)
+
+    return list(links)
 
 
 def find_next_page_url(soup: BeautifulSoup, current_url: str) -> str | None:
@@ -329,25 +912,99 @@ def find_next_page_url(soup: BeautifulSoup, current_url: str) -> str | None:
     return urljoin(current_url, next_tag["href"])
 
 
+def iter_jsonld_objects(data) -> Iterable[dict]:
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from iter_jsonld_objects(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_jsonld_objects(value)
+
+
+def is_radio_episode(item: dict) -> bool:
+    item_type = item.get("@type")
+    if isinstance(item_type, list):
+        return "RadioEpisode" in item_type
+    return item_type == "RadioEpisode"
+
+
+def iter_embedded_json(soup: BeautifulSoup) -> Iterable:
+    for script in soup.find_all(
+        "script",
+        type=["application/ld+json", "application/json"],
+    ):
+        if not script.string:
+            continue
+
+        try:
+            data = json_loads(script.string)
+        except JSONDecodeError:
+            continue
+
+        yield data
+
+        # SvelteKit hydration payloads wrap the fetched JSON in a string body.
+        if isinstance(data, dict) and isinstance(data.get("body"), str):
+            try:
+                yield json_loads(data["body"])
+            except JSONDecodeError:
+                continue
+
+
+def extract_listing_episodes_from_soup(
+    soup: BeautifulSoup,
+    links: Iterable[str],
+) -> dict[str, dict]:
+    records = {}
+    links = set(links)
+
+    for data in iter_embedded_json(soup):
+        for item in iter_jsonld_objects(data):
+            if not is_radio_episode(item):
+                continue
+
+            item_url = item.get("url") or item.get("@id")
+            if not isinstance(item_url, str):
+                continue
+
+            full_url = urljoin(BASE_URL, item_url).split("#", 1)[0]
+            if full_url not in links or full_url in records:
+                continue
+
+            records[full_url] = episode_fields_from_jsonld(item)
+
+    return records
+
+
 def get_episode_links_from_page(
     session: requests.Session,
     page_url: str,
     config: RadioFranceFeedConfig,
-) -> tuple[list[str], str | None]:
-    html_page = fetch_html(session, page_url)
-    soup = BeautifulSoup(html_page, "html.parser")
+    budget: CrawlBudget | None = None,
+) -> tuple[list[str], str | None, dict[str, dict]]:
+    html_page = fetch_html(
+        session,
+        page_url,
+        request_timeout(budget, HTML_TIMEOUT_SECONDS),
+    )
+    soup = parse_listing_page(html_page)
+    links = extract_episode_links_from_soup(soup, config)
 
     return (
-        extract_episode_links_from_soup(soup, config),
+        links,
         find_next_page_url(soup, page_url),
+        extract_listing_episodes_from_soup(soup, links),
     )
 
 
 def get_episode_links(
     session: requests.Session,
     config: RadioFranceFeedConfig,
-) -> list[str]:
+    budget: CrawlBudget | None = None,
+) -> tuple[list[str], dict[str, dict]]:
     links = []
+    records = {}
     seen_links = set()
     seen_pages = set()
     page_url = config.show_url
@@ -356,8 +1013,23 @@ def get_episode_links(
         if not page_url or page_url in seen_pages:
             break
 
+        if links and budget and not budget.can_start():
+            print(f"Crawl budget low, not fetching listing page {page_url}")
+            break
+
         seen_pages.add(page_url)
-        page_links, next_page_url = get_episode_links_from_page(session, page_url, config)
+        try:
+            page_links, next_page_url, page_records = get_episode_links_from_page(
+                session,
+                page_url,
+                config,
+                budget,
+            )
+        except requests.RequestException as exc:
+            if not links:
+                raise
+            print(f"Stopping pagination, {page_url} failed: {exc}")
+            break
 
         for link in page_links:
             if link in seen_links:
@@ -365,9 +1037,11 @@ def get_episode_links(
 
             seen_links.add(link)
             links.append(link)
+            if link in page_records:
+                records[link] = page_records[link]
 
             if len(links) >= config.max_links_to_check:
-                return links
+                return links, records
 
         if not config.follow_pagination:
             break
@@ -377,7 +1051,239 @@ def get_episode_links(
     if not links:
         raise RuntimeError(f"No episode links found for {config.show_url}")
 
-    return links
+    return links, records
+
+
+def parse_sitemap(xml_text: str) -> tuple[str, list[tuple[str, str | None]]]:
+    """Return the root name ("sitemapindex" or "urlset") and (loc, lastmod) pairs."""
+    root = etree.fromstring(xml_text.encode("utf-8"), SITEMAP_PARSER)
+    kind = etree.QName(root).localname
+    entries = []
+
+    for child in root:
+        if not isinstance(child.tag, str):
+            continue
+        values = {
+            etree.QName(field).localname: (field.text or "").strip()
+            for field in child
+            if isinstance(field.tag, str)
+        }
+        if values.get("loc"):
+            entries.append((values["loc"], values.get("lastmod") or None))
+
+    return kind, entries
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    try:
+        return parse_iso_date(value)
+    except ValueError:
+        return None
+
+
+def discover_sitemap_links(
+    session: requests.Session,
+    config: RadioFranceFeedConfig,
+    state: dict,
+    known_urls: set[str],
+    budget: CrawlBudget | None = None,
+) -> tuple[list[str], set[str]]:
+    """Find new episode links and changed archived ones from config.sitemap_url.
+
+    Every sitemap is fetched with a conditional GET, and sitemap index
+    entries whose <lastmod> did not move are not fetched at all. Each urlset
+    keeps a watermark, the newest <lastmod> it has shown; archived episodes
+    listed after it are returned as changed. At most max_links_to_check new
+    links come back, newest first; the others wait in state["pending_links"].
+    """
+    sitemaps = state.setdefault("sitemaps", {})
+    found: dict[str, datetime | None] = dict.fromkeys(state.get("pending_links", []))
+    changed = set()
+    queue = deque([(config.sitemap_url, None, None)])
+    seen = set()
+
+    def forget_validators(url: str | None) -> None:
+        # An index answering 304 next run must not hide unread children.
+        if url in sitemaps:
+            sitemaps[url] = {**sitemaps[url], "etag": None, "last_modified": None}
+
+    while queue:
+        url, index_lastmod, parent = queue.popleft()
+        if url in seen:
+            continue
+        seen.add(url)
+
+        if budget and not budget.can_start():
+            print(f"Crawl budget low, not fetching sitemap {url}")
+            forget_validators(parent)
+            for _, _, pending_parent in queue:
+                forget_validators(pending_parent)
+            break
+
+        entry = sitemaps.get(url, {})
+        try:
+            xml_text, validators = fetch_html_if_modified(
+                session,
+                url,
+                entry,
+                request_timeout(budget, HTML_TIMEOUT_SECONDS),
+            )
+        except requests.RequestException as exc:
+            print(f"Sitemap {url} failed: {exc}")
+            forget_validators(parent)
+            continue
+
+        updated = {**entry, **validators, "lastmod": index_lastmod}
+        sitemaps[url] = updated
+        if xml_text is None:
+            continue
+
+        kind, entries = parse_sitemap(xml_text)
+
+        if kind == "sitemapindex":
+            for loc, lastmod in entries:
+                if not lastmod or sitemaps.get(loc, {}).get("lastmod") != lastmod:
+                    queue.append((loc, lastmod, url))
+            continue
+
+        watermark = parse_lastmod(entry.get("watermark"))
+        newest = watermark
+        for loc, lastmod in entries:
+            link = show_episode_url(loc, config)
+            if not link:
+                continue
+
+            modified = parse_lastmod(lastmod)
+            if modified and (newest is None or modified > newest):
+                newest = modified
+
+            if link not in known_urls:
+                if found.get(link) is None or (modified and modified > found[link]):
+                    found[link] = modified
+            elif watermark and modified and modified > watermark:
+                changed.add(link)
+
+        updated["watermark"] = date_to_archive(newest) if newest else None
+
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    links = sorted(
+        (link for link in found if link not in known_urls),
+        key=lambda link: found[link] or oldest,
+        reverse=True,
+    )
+    state["pending_links"] = links[config.max_links_to_check :]
+    return links[: config.max_links_to_check], changed
+
+
+def parse_official_feed(xml_bytes: bytes, config: RadioFranceFeedConfig) -> list[dict]:
+    """Map the items of an official podcast RSS feed to archive records.
+
+    Items are kept when their <link> is an episode page of the show and
+    they have an enclosure, since archive records are keyed by page URL.
+    """
+    root = etree.fromstring(xml_bytes, SITEMAP_PARSER)
+    records = []
+
+    for item in root.iter("item"):
+        url = show_episode_url((item.findtext("link") or "").strip(), config)
+        enclosure = item.find("enclosure")
+        if not url or enclosure is None or not enclosure.get("url"):
+            continue
+
+        try:
+            published = parsedate_to_datetime(item.findtext("pubDate") or "")
+        except (TypeError, ValueError):
+            continue
+        if not published.tzinfo:
+            published = published.replace(tzinfo=timezone.utc)
+
+        audio_url = enclosure.get("url")
+        length = enclosure.get("length") or ""
+        duration_seconds = parse_clock_duration_to_seconds(
+            item.findtext(f"{{{ITUNES_NS}}}duration")
+        )
+        image = item.find(f"{{{ITUNES_NS}}}image")
+
+        records.append({
+            "title": clean_text(item.findtext("title")) or "Épisode sans titre",
+            "description": clean_text(item.findtext("description")),
+            "audio_url": audio_url,
+            "audio_type": normalize_audio_type(enclosure.get("type"), audio_url),
+            "duration_seconds": duration_seconds,
+            "duration_itunes": seconds_to_itunes_duration(duration_seconds),
+            "published": date_to_archive(published.astimezone(timezone.utc)),
+            "image": square_radiofrance_image_url(
+                image.get("href") if image is not None else None
+            ),
+            "url": url,
+            "audio_length": int(length) if length.isdigit() and int(length) else None,
+        })
+
+    return records
+
+
+def fetch_official_episodes(
+    session: requests.Session,
+    config: RadioFranceFeedConfig,
+    state: dict,
+    budget: CrawlBudget | None = None,
+) -> list[dict]:
+    """Conditionally fetch config.official_feed_url; [] when it did not change."""
+    entry = state.get("official_feed", {})
+    response = session.get(
+        config.official_feed_url,
+        headers={
+            key: value
+            for key, value in (
+                ("If-None-Match", entry.get("etag")),
+                ("If-Modified-Since", entry.get("last_modified")),
+            )
+            if value
+        },
+        timeout=request_timeout(budget, HTML_TIMEOUT_SECONDS),
+    )
+    if response.status_code == 304:
+        return []
+
+    response.raise_for_status()
+    state["official_feed"] = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return parse_official_feed(response.content, config)
+
+
+def seed_from_official_feed(
+    config: RadioFranceFeedConfig,
+    records: list[dict],
+    known_urls: set[str],
+) -> tuple[list[dict], list[dict]]:
+    """Split official records into new episodes and archive entries they complete.
+
+    Archived values always win; the official feed only fills missing fields.
+    """
+    by_url = {record["url"]: record for record in records}
+    new_episodes = [record for url, record in by_url.items() if url not in known_urls]
+    filled = []
+
+    for episode in iter_archive(config):
+        record = by_url.get(episode["url"])
+        if record is None:
+            continue
+
+        if record["audio_url"] != episode["audio_url"]:
+            print(f"Official feed has another enclosure for {episode['url']}")
+            continue
+
+        updated = dict(episode)
+        for key, value in record.items():
+            if value and not updated.get(key):
+                updated[key] = value
+
+        if updated != episode:
+            filled.append(updated)
+
+    return new_episodes, filled
 
 
 def find_radio_episode_from_jsonld(soup: BeautifulSoup) -> dict | None:
@@ -388,15 +1294,25 @@ def find_radio_episode_from_jsonld(soup: BeautifulSoup) -> dict | None:
             continue
 
         try:
-            data = json.loads(script.string)
-        except json.JSONDecodeError:
+            data = json_loads(script.string)
+        except JSONDecodeError:
             continue
 
-        graph = data.get("@graph", [])
+        episode = radio_episode_in_graph(data)
+        if episode:
+            return episode
+
+    return None
+
+
+def radio_episode_in_graph(data) -> dict | None:
+    """The first RadioEpisode of a JSON-LD document's @graph."""
+    if not isinstance(data, dict):
+        return None
 
-        for item in graph:
-            if item.get("@type") == "RadioEpisode":
-                return item
+    for item in data.get("@graph", []):
+        if isinstance(item, dict) and item.get("@type") == "RadioEpisode":
+            return item
 
     return None
 
@@ -415,112 +1331,234 @@ def extract_article_metadata(soup: BeautifulSoup) -> dict[str, str | None]:
     }
 
 
-def extract_episode_data(
-    session: requests.Session,
-    url: str,
-) -> dict | None:
-    html_page = fetch_html(session, url)
-    soup = BeautifulSoup(html_page, "html.parser")
-
-    episode = find_radio_episode_from_jsonld(soup)
-    metadata = extract_article_metadata(soup)
-
-    if not episode:
-        return None
-
+def episode_fields_from_jsonld(
+    episode: dict,
+    metadata: dict[str, str | None] | None = None,
+) -> dict:
+    """Map a RadioEpisode JSON-LD object to archive fields, None when absent."""
+    metadata = metadata or {}
     audio = episode.get("mainEntity", {}) or {}
     image = episode.get("image", {}) or {}
 
-    audio_url = audio.get("contentUrl")
-
-    if not audio_url:
-        return None
+    if not isinstance(audio, dict):
+        audio = {}
+    if isinstance(image, str):
+        image = {"url": image}
+    elif not isinstance(image, dict):
+        image = {}
 
+    audio_url = audio.get("contentUrl") or None
     duration_seconds = parse_duration_to_seconds(audio.get("duration"))
-
-    title = (
-        episode.get("headline")
-        or episode.get("name")
-        or metadata.get("og_title")
-        or "Épisode sans titre"
-    )
-
-    description = (
-        episode.get("description")
-        or metadata.get("og_description")
-        or ""
-    )
-
-    image_url = square_radiofrance_image_url(
-        image.get("url") or metadata.get("og_image") or None
-    )
+    title = episode.get("headline") or episode.get("name") or metadata.get("og_title")
+    description = episode.get("description") or metadata.get("og_description")
     published = (
         episode.get("dateCreated")
         or metadata.get("published")
         or metadata.get("modified")
     )
-    published_dt = parse_iso_date(published)
-    audio_type = normalize_audio_type(audio.get("encodingFormat"), audio_url)
 
-    data = {
-        "title": clean_text(title),
-        "description": clean_text(description),
+    try:
+        published = date_to_archive(parse_iso_date(published)) if published else None
+    except ValueError:
+        published = None
+
+    return {
+        "title": clean_text(title) or None,
+        "description": clean_text(description) if description else None,
         "audio_url": audio_url,
-        "audio_type": audio_type,
+        "audio_type": (
+            normalize_audio_type(audio.get("encodingFormat"), audio_url)
+            if audio_url
+            else None
+        ),
         "duration_seconds": duration_seconds,
         "duration_itunes": seconds_to_itunes_duration(duration_seconds),
-        "published": date_to_archive(published_dt),
-        "image": image_url,
-        "url": url,
-        "audio_length": fetch_content_length(session, audio_url),
+        "published": published,
+        "image": square_radiofrance_image_url(
+            image.get("url") or metadata.get("og_image") or None
+        ),
     }
-    validate_episode(data)
-    return data
 
 
-def normalize_archive_episode(episode: dict, index: int) -> dict:
-    if not isinstance(episode, dict):
-        raise ValueError(f"Archive item {index} is not an object")
+def listing_record_is_complete(record: dict | None) -> bool:
+    return bool(record) and all(record.get(key) for key in LISTING_REQUIRED_FIELDS)
 
-    normalized = dict(episode)
-    for key in ARCHIVE_OPTIONAL_FIELDS:
-        normalized.setdefault(key, None)
-    normalized["image"] = square_radiofrance_image_url(normalized.get("image"))
-    normalized["audio_length"] = int(normalized.get("audio_length") or 0)
-    validate_episode(normalized, index=index)
-    return normalized
 
+def parse_episode_page(html_page: str) -> dict | None:
+    soup = BeautifulSoup(html_page, "html.parser")
 
-def validate_episode(episode: dict, index: int | None = None) -> None:
-    label = f"Archive item {index}" if index is not None else "Episode"
+    episode = find_radio_episode_from_jsonld(soup)
+    metadata = extract_article_metadata(soup)
 
-    for key in ARCHIVE_REQUIRED_TEXT_FIELDS:
-        if not isinstance(episode.get(key), str) or not episode[key].strip():
-            raise ValueError(f"{label} has missing or invalid {key}")
+    if not episode:
+        return None
 
-    if not is_http_url(episode["url"]):
-        raise ValueError(f"{label} has invalid url: {episode['url']}")
+    return episode_fields_from_jsonld(episode, metadata)
 
-    if not is_http_url(episode["audio_url"]):
-        raise ValueError(f"{label} has invalid audio_url: {episode['audio_url']}")
 
-    archive_to_date(episode.get("published"))
+def episode_page_fingerprint(html_page: str) -> tuple[str | None, dict | None]:
+    """Hash the parts of an episode page that feed the archive record."""
+    soup = BeautifulSoup(html_page, "html.parser")
+    episode = find_radio_episode_from_jsonld(soup)
 
-    duration_seconds = episode.get("duration_seconds")
-    if duration_seconds is not None and (
-        not isinstance(duration_seconds, int) or duration_seconds < 0
-    ):
-        raise ValueError(f"{label} has invalid duration_seconds")
+    if not episode:
+        return None, None
 
-    audio_length = episode.get("audio_length")
-    if audio_length is not None and (
-        not isinstance(audio_length, int) or audio_length < 0
-    ):
-        raise ValueError(f"{label} has invalid audio_length")
+    metadata = extract_article_metadata(soup)
+    payload = json.dumps([episode, metadata], sort_keys=True, ensure_ascii=False)
+    fingerprint = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return fingerprint, episode_fields_from_jsonld(episode, metadata)
 
 
-def validate_archive(episodes: Iterable[dict]) -> list[dict]:
-    normalized = []
+def episode_fields_from_page(html_page: str, listing_record: dict | None = None) -> dict | None:
+    """Parse an episode page, filling gaps from its listing record.
+
+    Pure CPU work on picklable values, so it can run in a PageParser process.
+    """
+    fields = parse_episode_page(html_page)
+
+    if not fields:
+        return None
+
+    for key, value in (listing_record or {}).items():
+        if fields.get(key) is None:
+            fields[key] = value
+
+    return fields
+
+
+class PageParser:
+    """Run episode_fields_from_page() in a process pool started on first use.
+
+    processes=0 parses in the calling thread; None uses one process per CPU.
+    One parser serves a whole run or backfill, so the pool starts only once.
+    """
+
+    def __init__(self, processes: int | None = None) -> None:
+        self.processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def __call__(self, html_page: str, listing_record: dict | None = None) -> dict | None:
+        if self.processes == 0:
+            return episode_fields_from_page(html_page, listing_record)
+
+        with self._lock:
+            if self._pool is None:
+                # Fetch threads are already running; forking them is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+        return self._pool.submit(episode_fields_from_page, html_page, listing_record).result()
+
+    def __enter__(self) -> "PageParser":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        return False
+
+
+def extract_episode_data(
+    session: requests.Session,
+    url: str,
+    listing_record: dict | None = None,
+    budget: CrawlBudget | None = None,
+    parse: Callable[[str, dict | None], dict | None] = episode_fields_from_page,
+    fetch_length: bool = True,
+) -> dict | None:
+    """Build an archive record for url; fetch_length=False leaves the HEAD for later."""
+    if listing_record_is_complete(listing_record):
+        fields = dict(listing_record)
+    else:
+        fields = parse(
+            fetch_episode_html(session, url, request_timeout(budget, HTML_TIMEOUT_SECONDS)),
+            listing_record,
+        )
+
+        if not fields:
+            return None
+
+    audio_url = fields.get("audio_url")
+
+    if not audio_url:
+        return None
+
+    if not fields.get("published"):
+        raise ValueError(f"Episode has missing published date: {url}")
+
+    data = {
+        "title": fields.get("title") or "Épisode sans titre",
+        "description": fields.get("description") or "",
+        "audio_url": audio_url,
+        "audio_type": fields.get("audio_type") or normalize_audio_type(None, audio_url),
+        "duration_seconds": fields.get("duration_seconds"),
+        "duration_itunes": fields.get("duration_itunes"),
+        "published": fields["published"],
+        "image": fields.get("image"),
+        "url": url,
+        "audio_length": (
+            fetch_content_length(
+                session,
+                audio_url,
+                request_timeout(budget, HEAD_TIMEOUT_SECONDS),
+            )
+            if fetch_length
+            else None
+        ),
+    }
+    validate_episode(data)
+    return data
+
+
+def normalize_archive_episode(episode: dict, index: int) -> dict:
+    if not isinstance(episode, dict):
+        raise ValueError(f"Archive item {index} is not an object")
+
+    normalized = dict(episode)
+    for key in ARCHIVE_OPTIONAL_FIELDS:
+        normalized.setdefault(key, None)
+    normalized["image"] = square_radiofrance_image_url(normalized.get("image"))
+    normalized["audio_length"] = int(normalized.get("audio_length") or 0)
+    validate_episode(normalized, index=index)
+    return normalized
+
+
+def validate_episode(episode: dict, index: int | None = None) -> None:
+    label = f"Archive item {index}" if index is not None else "Episode"
+
+    for key in ARCHIVE_REQUIRED_TEXT_FIELDS:
+        if not isinstance(episode.get(key), str) or not episode[key].strip():
+            raise ValueError(f"{label} has missing or invalid {key}")
+
+    if not is_http_url(episode["url"]):
+        raise ValueError(f"{label} has invalid url: {episode['url']}")
+
+    if not is_http_url(episode["audio_url"]):
+        raise ValueError(f"{label} has invalid audio_url: {episode['audio_url']}")
+
+    archive_to_date(episode.get("published"))
+
+    duration_seconds = episode.get("duration_seconds")
+    if duration_seconds is not None and (
+        not isinstance(duration_seconds, int) or duration_seconds < 0
+    ):
+        raise ValueError(f"{label} has invalid duration_seconds")
+
+    audio_length = episode.get("audio_length")
+    if audio_length is not None and (
+        not isinstance(audio_length, int) or audio_length < 0
+    ):
+        raise ValueError(f"{label} has invalid audio_length")
+
+    if episode.get("discovered") is not None:
+        archive_to_date(episode["discovered"])
+
+
+def iter_validated_archive(episodes: Iterable[dict]) -> Iterator[dict]:
     seen_urls = set()
 
     for index, episode in enumerate(episodes, 1):
@@ -528,45 +1566,251 @@ def validate_archive(episodes: Iterable[dict]) -> list[dict]:
         if item["url"] in seen_urls:
             raise ValueError(f"Duplicate archive URL: {item['url']}")
         seen_urls.add(item["url"])
-        normalized.append(item)
-
-    return normalized
+        yield item
 
 
-def load_archive(config: RadioFranceFeedConfig) -> list[dict]:
+def validate_archive(episodes: Iterable[dict]) -> list[dict]:
+    return list(iter_validated_archive(episodes))
+
+
+def decode_archive_items(decoder: json.JSONDecoder, buffer: str, pos: int) -> tuple:
+    """The list items starting at pos and where the last one ends, or (None, None)."""
+    # Objects written by iter_archive_json close on a line of their own at
+    # an indent of two. Every item up to the last such line in the buffer
+    # is parsed in one call, as a list; the slice only parses when it holds
+    # whole items and commas, so anything else goes to the stdlib scanner,
+    # one item at a time.
+    if buffer.startswith("{", pos):
+        end = buffer.rfind(ARCHIVE_ITEM_END, pos) + len(ARCHIVE_ITEM_END)
+        if end >= len(ARCHIVE_ITEM_END):
+            try:
+                return json_loads(f"[{buffer[pos:end]}]"), end
+            except JSONDecodeError:
+                pass
+    try:
+        item, end = decoder.raw_decode(buffer, pos)
+    except JSONDecodeError:
+        return None, None
+    return [item], end
+
+
+def iter_archive_file(path: str | Path) -> Iterator:
+    """Yield the items of a JSON list file one at a time."""
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def next_token() -> str:
+            nonlocal buffer, pos, eof
+            while True:
+                match = ARCHIVE_TOKEN_RE.search(buffer, pos)
+                if match or eof:
+                    pos = match.start() if match else len(buffer)
+                    return buffer[pos : pos + 1]
+                buffer = f.read(ARCHIVE_READ_CHUNK)
+                pos = 0
+                eof = not buffer
+
+        if next_token() != "[":
+            raise ValueError(f"{path} must contain a JSON list")
+        pos += 1
+        expect_item = True
+
+        while True:
+            token = next_token()
+            if token == "]":
+                pos += 1
+                break
+            if not expect_item:
+                if token != ",":
+                    raise ValueError(f"{path} is not a valid JSON list")
+                pos += 1
+                next_token()
+
+            while True:
+                items, end = decode_archive_items(decoder, buffer, pos)
+                # A value ending at the buffer edge may continue in the next chunk.
+                if (end is None or end == len(buffer)) and not eof:
+                    more = f.read(ARCHIVE_READ_CHUNK)
+                    eof = not more
+                    buffer = buffer[pos:] + more
+                    pos = 0
+                    continue
+                if end is None:
+                    raise ValueError(f"{path} is not a valid JSON list")
+                break
+
+            yield from items
+            pos = end
+            expect_item = False
+
+        if next_token():
+            raise ValueError(f"{path} has trailing data after the JSON list")
+
+
+def iter_archive(config: RadioFranceFeedConfig) -> Iterator[dict]:
     path = Path(config.archive_file)
     if not path.exists():
-        return []
+        return iter(())
+
+    return iter_validated_archive(iter_archive_file(path))
 
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    if not isinstance(data, list):
-        raise ValueError(f"{config.archive_file} must contain a JSON list")
+def load_archive(config: RadioFranceFeedConfig) -> list[dict]:
+    return list(iter_archive(config))
 
-    return validate_archive(data)
+
+@dataclass
+class ArchiveIndex:
+    """What a run needs to know about the archive before crawling."""
+
+    urls: set[str] = field(default_factory=set)
+    recent: list[dict] = field(default_factory=list)
+    unenriched: list[tuple[str, str]] = field(default_factory=list)
+    count: int = 0
+    newest_first: bool = True
+
+
+def index_archive(
+    config: RadioFranceFeedConfig,
+    recent_since: datetime | None = None,
+) -> ArchiveIndex:
+    index = ArchiveIndex()
+    previous = None
+
+    for episode in iter_archive(config):
+        published = episode_published(episode)
+        index.urls.add(episode["url"])
+        index.count += 1
+        if recent_since is not None and published >= recent_since:
+            index.recent.append(episode)
+        if not episode.get("audio_length"):
+            index.unenriched.append((episode["url"], episode["audio_url"]))
+        if previous is not None and published > previous:
+            index.newest_first = False
+        previous = published
+
+    return index
+
+
+def iter_archive_json(episodes: Iterable[dict]) -> Iterator[str]:
+    """Serialize like json.dumps(list, indent=2) without holding the list."""
+    yield from iter_dumps_list(episodes)
+    yield "\n"
+
+
+def write_archive_stream(config: RadioFranceFeedConfig, episodes: Iterable[dict]) -> int:
+    """Write episodes to the archive file; refuses to publish an empty archive."""
+    count = 0
+
+    def counted(items: Iterable[dict]) -> Iterator[dict]:
+        nonlocal count
+        for item in items:
+            count += 1
+            yield item
+
+    with AtomicOutput(config.archive_file) as output:
+        for chunk in iter_archive_json(counted(episodes)):
+            output.write(chunk.encode("utf-8"))
+        if not count:
+            raise RuntimeError(f"No episodes available for {config.feed_title}")
+
+    return count
 
 
 def save_archive(config: RadioFranceFeedConfig, episodes: list[dict]) -> None:
     episodes = validate_archive(episodes)
-    text = json.dumps(episodes, ensure_ascii=False, indent=2) + "\n"
+    text = "".join(iter_archive_json(episodes))
     atomic_write_text(config.archive_file, text)
 
 
-def hydrate_audio_lengths(
+def load_crawl_state(config: RadioFranceFeedConfig) -> dict:
+    state = {"skipped": {}, "validators": {}}
+    if not config.state_file:
+        return state
+
+    path = Path(config.state_file)
+    if not path.exists():
+        return state
+
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{config.state_file} must contain a JSON object")
+
+    state.update(data)
+    return state
+
+
+def save_crawl_state(config: RadioFranceFeedConfig, state: dict) -> None:
+    if not config.state_file:
+        return
+
+    text = json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    atomic_write_text(config.state_file, text)
+
+
+def skip_entry_is_fresh(entry: dict | None, now: datetime) -> bool:
+    if not entry:
+        return False
+
+    ttl = SKIP_RECHECK_AFTER.get(entry.get("reason"))
+    if ttl is None:
+        return False
+
+    try:
+        checked = parse_iso_date(entry.get("checked"))
+    except ValueError:
+        return False
+
+    return now - checked < ttl
+
+
+def record_skip(state: dict, url: str, reason: str, now: datetime) -> None:
+    state["skipped"][url] = {"reason": reason, "checked": date_to_archive(now)}
+
+
+def prune_skip_list(state: dict, now: datetime) -> None:
+    state["skipped"] = {
+        url: entry
+        for url, entry in state["skipped"].items()
+        if skip_entry_is_fresh(entry, now)
+    }
+
+
+def iter_hydrated_episodes(
     session: requests.Session,
     episodes: Iterable[dict],
-) -> list[dict]:
-    hydrated = []
-
+    budget: CrawlBudget | None = None,
+    attempted: Container[str] = (),
+) -> Iterator[dict]:
+    """Fetch missing enclosure lengths inline, except for URLs in attempted."""
     for episode in episodes:
         item = dict(episode)
-        if not item.get("audio_length"):
-            item["audio_length"] = fetch_content_length(session, item["audio_url"])
+        if (
+            not item.get("audio_length")
+            and item["url"] not in attempted
+            and (budget is None or budget.can_start())
+        ):
+            item["audio_length"] = fetch_content_length(
+                session,
+                item["audio_url"],
+                request_timeout(budget, HEAD_TIMEOUT_SECONDS),
+            )
         validate_episode(item)
-        hydrated.append(item)
+        yield item
 
-    return hydrated
+
+def hydrate_audio_lengths(
+    session: requests.Session,
+    episodes: Iterable[dict],
+    budget: CrawlBudget | None = None,
+) -> list[dict]:
+    return list(iter_hydrated_episodes(session, episodes, budget))
 
 
 def merge_episodes(old_episodes: Iterable[dict], new_episodes: Iterable[dict]) -> list[dict]:
@@ -581,27 +1825,48 @@ def merge_episodes(old_episodes: Iterable[dict], new_episodes: Iterable[dict]) -
     return sort_episodes_newest_first(merged.values())
 
 
-def filter_episodes_by_min_date(
+def merge_sorted_episodes(
+    old_episodes: Iterable[dict],
+    new_episodes: Iterable[dict],
+) -> Iterator[dict]:
+    """Heap-merge a newest-first archive stream with a few new episodes.
+
+    New episodes replace archived ones with the same URL, as in merge_episodes.
+    """
+    updates = sort_episodes_newest_first({e["url"]: e for e in new_episodes}.values())
+    replaced = {episode["url"] for episode in updates}
+    kept = (episode for episode in old_episodes if episode["url"] not in replaced)
+    return heapq.merge(kept, updates, key=episode_published, reverse=True)
+
+
+def iter_episodes_since_min_date(
     config: RadioFranceFeedConfig,
     episodes: Iterable[dict],
-) -> list[dict]:
+) -> Iterator[dict]:
     if not config.min_published_date:
-        return list(episodes)
+        yield from episodes
+        return
 
     min_date = parse_iso_date(config.min_published_date)
 
-    return [
-        episode for episode in episodes
-        if archive_to_date(episode.get("published")) >= min_date
-    ]
+    for episode in episodes:
+        if archive_to_date(episode.get("published")) >= min_date:
+            yield episode
+
+
+def filter_episodes_by_min_date(
+    config: RadioFranceFeedConfig,
+    episodes: Iterable[dict],
+) -> list[dict]:
+    return list(iter_episodes_since_min_date(config, episodes))
+
+
+def episode_published(episode: dict) -> datetime:
+    return archive_to_date(episode.get("published"))
 
 
 def sort_episodes_newest_first(episodes: Iterable[dict]) -> list[dict]:
-    return sorted(
-        episodes,
-        key=lambda item: archive_to_date(item.get("published")),
-        reverse=True,
-    )
+    return sorted(episodes, key=episode_published, reverse=True)
 
 
 def sort_rss_items_newest_first(rss: bytes) -> bytes:
@@ -664,9 +1929,104 @@ def add_stylesheet_instruction(rss: bytes, style_file: str) -> bytes:
     return stylesheet + rss
 
 
-def build_rss(config: RadioFranceFeedConfig, episodes: list[dict]) -> bytes:
-    episodes = sort_episodes_newest_first(validate_archive(episodes))
-    feed_url = public_file_url(config.output_file)
+def archive_page_name(output_file: str, page: int) -> str:
+    path = Path(output_file)
+    return str(path.with_name(f"{path.stem}-archive-{page}{path.suffix}"))
+
+
+def split_feed_history(
+    items: list,
+    current_size: int,
+    page_size: int,
+) -> tuple[list, list[list]]:
+    """Split newest-first items into the current window and archive pages.
+
+    Archive pages are numbered from the oldest items so that full pages never
+    change as new items push older ones out of the current window.
+    """
+    current = items[:current_size]
+    older = items[current_size:][::-1]
+    pages = [
+        older[start : start + page_size][::-1]
+        for start in range(0, len(older), page_size)
+    ]
+    return current, pages
+
+
+def feed_history_links(
+    output_file: str,
+    page: int | None,
+    page_count: int,
+) -> list[tuple[str, str]]:
+    """RFC 5005 links for the subscription feed (page None) or an archive page."""
+    if page is None:
+        if not page_count:
+            return []
+        return [("prev-archive", public_file_url(archive_page_name(output_file, page_count)))]
+
+    links = [("current", public_file_url(output_file))]
+    if page > 1:
+        links.append(("prev-archive", public_file_url(archive_page_name(output_file, page - 1))))
+    if page < page_count:
+        links.append(("next-archive", public_file_url(archive_page_name(output_file, page + 1))))
+    return links
+
+
+def stale_archive_pages(output_file: str, page_count: int) -> list[Path]:
+    path = Path(output_file)
+    pattern = re.compile(rf"{re.escape(path.stem)}-archive-(\d+){re.escape(path.suffix)}")
+    stale = []
+
+    for candidate in path.parent.glob(f"{path.stem}-archive-*{path.suffix}"):
+        match = pattern.fullmatch(candidate.name)
+        if match and int(match.group(1)) > page_count:
+            stale.append(candidate)
+
+    return stale
+
+
+def add_history_links(
+    rss: bytes,
+    links: list[tuple[str, str]],
+    archive_page: bool = False,
+) -> bytes:
+    if not links and not archive_page:
+        return rss
+
+    parser = etree.XMLParser(strip_cdata=False)
+    root = etree.fromstring(rss, parser)
+    channel = root.find("channel")
+    anchor = None
+
+    for link in channel.findall(f"{{{ATOM_NS}}}link"):
+        if link.get("rel") == "self":
+            anchor = link
+    if anchor is None:
+        anchor = channel.find("title")
+
+    for rel, href in reversed(links):
+        link = etree.Element(f"{{{ATOM_NS}}}link", href=href, rel=rel)
+        link.tail = anchor.tail
+        anchor.addnext(link)
+
+    if archive_page:
+        marker = etree.Element(f"{{{HISTORY_NS}}}archive", nsmap={"fh": HISTORY_NS})
+        marker.tail = anchor.tail
+        anchor.addnext(marker)
+
+    return etree.tostring(
+        root,
+        encoding="UTF-8",
+        xml_declaration=True,
+        pretty_print=True,
+    )
+
+
+def new_feed_generator(
+    config: RadioFranceFeedConfig,
+    feed_url: str,
+    updated: datetime,
+) -> FeedGenerator:
     feed_image = square_radiofrance_image_url(config.feed_image) or config.feed_image
 
     fg = FeedGenerator()
@@ -681,7 +2041,7 @@ def build_rss(config: RadioFranceFeedConfig, episodes: list[dict]) -> bytes:
     fg.link(href=feed_url, rel="self")
     fg.author({"name": config.feed_author_name})
     fg.logo(feed_image)
-    fg.updated(datetime.now(timezone.utc))
+    fg.updated(updated)
 
     fg.podcast.itunes_author(config.itunes_author)
     fg.podcast.itunes_summary(config.feed_description)
@@ -696,116 +2056,974 @@ def build_rss(config: RadioFranceFeedConfig, episodes: list[dict]) -> bytes:
     if is_itunes_safe_image(feed_image):
         fg.podcast.itunes_image(feed_image)
 
-    for episode in episodes:
-        published_dt = archive_to_date(episode.get("published"))
-        description = episode_description_for_feed(episode)
-        episode_image = square_radiofrance_image_url(episode.get("image"))
-
-        fe = fg.add_entry()
+    return fg
 
-        fe.id(episode["url"])
-        fe.title(episode["title"])
-        fe.link(href=episode["url"])
-        fe.guid(episode["url"], permalink=True)
-        fe.published(published_dt)
-        fe.updated(published_dt)
 
-        rich_description = f"""
+def add_feed_entry(
+    fg: FeedGenerator,
+    config: RadioFranceFeedConfig,
+    episode: dict,
+) -> None:
+    published_dt = archive_to_date(episode.get("published"))
+    description = episode_description_for_feed(episode)
+    episode_image = square_radiofrance_image_url(episode.get("image"))
+
+    fe = fg.add_entry()
+
+    fe.id(episode["url"])
+    fe.title(episode["title"])
+    fe.link(href=episode["url"])
+    fe.guid(episode["url"], permalink=True)
+    fe.published(published_dt)
+    fe.updated(published_dt)
+
+    rich_description = f"""
         <p>{html.escape(description)}</p>
         <p><strong>Source:</strong> <a href="{episode["url"]}">{config.source_label}</a></p>
         """
 
-        if episode_image:
-            rich_description += f"""
+    if episode_image:
+        rich_description += f"""
             <p>
               <img src="{episode_image}" alt="{html.escape(episode["title"])}" />
             </p>
             """
 
-        fe.description(description)
-        fe.content(rich_description, type="CDATA")
-        fe.enclosure(
-            episode["audio_url"],
-            str(episode.get("audio_length") or 0),
-            episode.get("audio_type") or "audio/mp4",
+    fe.description(description)
+    fe.content(rich_description, type="CDATA")
+    fe.enclosure(
+        episode["audio_url"],
+        str(episode.get("audio_length") or 0),
+        episode.get("audio_type") or "audio/mp4",
+    )
+
+    fe.podcast.itunes_author(config.itunes_author)
+    fe.podcast.itunes_summary(description)
+    fe.podcast.itunes_subtitle(description[:255])
+
+    if episode.get("duration_itunes"):
+        fe.podcast.itunes_duration(episode["duration_itunes"])
+
+    if is_itunes_safe_image(episode_image):
+        fe.podcast.itunes_image(episode_image)
+
+
+def render_channel(
+    config: RadioFranceFeedConfig,
+    output_file: str | None = None,
+    history_links: list[tuple[str, str]] | None = None,
+    archive_page: bool = False,
+    updated: datetime | None = None,
+) -> tuple[bytes, bytes]:
+    """Render a feed without items, split at the point where items belong."""
+    fg = new_feed_generator(
+        config,
+        public_file_url(output_file or config.output_file),
+        updated or datetime.now(timezone.utc),
+    )
+    links = list(history_links or [])
+    # Only the subscription feed is a WebSub topic; archive pages are static.
+    if config.websub_hub and not archive_page:
+        links.insert(0, ("hub", config.websub_hub))
+    rss = add_history_links(fg.rss_str(pretty=True), links, archive_page)
+    rss = add_stylesheet_instruction(rss, config.style_file)
+    split = rss.rindex(CHANNEL_CLOSE)
+    return rss[:split], rss[split:]
+
+
+def render_item(config: RadioFranceFeedConfig, episode: dict) -> bytes:
+    """Render one <item> exactly as it appears inside a pretty-printed feed."""
+    fg = FeedGenerator()
+    fg.load_extension("podcast")
+    fg.title(config.feed_title)
+    fg.link(href=public_file_url(config.output_file))
+    fg.description(config.feed_description)
+    add_feed_entry(fg, config, episode)
+
+    rss = fg.rss_str(pretty=True)
+    start = rss.index(ITEM_OPEN)
+    end = rss.rindex(ITEM_CLOSE) + len(ITEM_CLOSE)
+    return rss[start:end]
+
+
+def render_cache_key(config: RadioFranceFeedConfig, episode: dict) -> str:
+    payload = {
+        "episode": episode,
+        "source_label": config.source_label,
+        "itunes_author": config.itunes_author,
+        "feedgen": FEEDGEN_VERSION,
+        "version": RENDER_CACHE_VERSION,
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """SQLite store of rendered <item> fragments, keyed by render_cache_key().
+
+    Every fragment used during a run is stamped with the run's generation.
+    A run that finishes cleanly drops the fragments of its feed that it did
+    not use, so the cache follows the archive: removed or changed episodes
+    fall out. Feeds sharing a file only evict their own rows.
+    """
+
+    def __init__(self, path: str | Path, feed: str = "") -> None:
+        self.path = Path(path)
+        self.feed = feed
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "RenderCache":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fragments ("
+            "feed TEXT NOT NULL, key TEXT NOT NULL, fragment BLOB NOT NULL, "
+            "generation INTEGER NOT NULL, PRIMARY KEY (feed, key))"
         )
+        (latest,) = self._db.execute(
+            "SELECT MAX(generation) FROM fragments WHERE feed = ?",
+            (self.feed,),
+        ).fetchone()
+        self.generation = (latest or 0) + 1
+        return self
+
+    def fragment(self, config: RadioFranceFeedConfig, episode: dict) -> bytes:
+        key = render_cache_key(config, episode)
+        row = self._db.execute(
+            "SELECT fragment FROM fragments WHERE feed = ? AND key = ?",
+            (self.feed, key),
+        ).fetchone()
+
+        if row is not None:
+            self.hits += 1
+            self._db.execute(
+                "UPDATE fragments SET generation = ? WHERE feed = ? AND key = ?",
+                (self.generation, self.feed, key),
+            )
+            return row[0]
+
+        self.misses += 1
+        fragment = render_item(config, episode)
+        self._db.execute(
+            "INSERT OR REPLACE INTO fragments VALUES (?, ?, ?, ?)",
+            (self.feed, key, fragment, self.generation),
+        )
+        return fragment
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if exc_type is None:
+            self._db.execute(
+                "DELETE FROM fragments WHERE feed = ? AND generation != ?",
+                (self.feed, self.generation),
+            )
+        self._db.commit()
+        self._db.close()
+        return False
 
-        fe.podcast.itunes_author(config.itunes_author)
-        fe.podcast.itunes_summary(description)
-        fe.podcast.itunes_subtitle(description[:255])
 
-        if episode.get("duration_itunes"):
-            fe.podcast.itunes_duration(episode["duration_itunes"])
+def iter_rss_chunks(
+    config: RadioFranceFeedConfig,
+    episodes: Iterable[dict],
+    output_file: str | None = None,
+    history_links: list[tuple[str, str]] | None = None,
+    archive_page: bool = False,
+    cache: RenderCache | None = None,
+) -> Iterator[bytes]:
+    """Yield a feed document piece by piece from newest-first episodes."""
+    episodes = iter(episodes)
+    first = next(episodes, None)
+    # Archive pages must serialize identically until their items change.
+    updated = (
+        archive_to_date(first["published"])
+        if archive_page and first is not None
+        else None
+    )
+    header, footer = render_channel(
+        config,
+        output_file,
+        history_links,
+        archive_page,
+        updated,
+    )
 
-        if is_itunes_safe_image(episode_image):
-            fe.podcast.itunes_image(episode_image)
+    render = partial(cache.fragment if cache else render_item, config)
 
-    rss = sort_rss_items_newest_first(fg.rss_str(pretty=True))
-    return add_stylesheet_instruction(rss, config.style_file)
+    yield header
+    if first is not None:
+        yield render(first)
+        for episode in episodes:
+            yield render(episode)
+    yield footer
 
 
-def write_rss(config: RadioFranceFeedConfig, episodes: list[dict]) -> None:
-    atomic_write_bytes(config.output_file, build_rss(config, episodes))
+def build_rss(
+    config: RadioFranceFeedConfig,
+    episodes: list[dict],
+    output_file: str | None = None,
+    history_links: list[tuple[str, str]] | None = None,
+    archive_page: bool = False,
+) -> bytes:
+    episodes = sort_episodes_newest_first(validate_archive(episodes))
+    return b"".join(
+        iter_rss_chunks(config, episodes, output_file, history_links, archive_page)
+    )
 
 
-def build_feed(config: RadioFranceFeedConfig = FRANCE_CULTURE_CONFIG) -> None:
-    session = create_session()
+def write_feed_stream(
+    config: RadioFranceFeedConfig,
+    path: str,
+    chunks: Iterable[bytes],
+) -> bool:
+    validate = partial(validate_feed_file, style_file=config.style_file, name=path)
+    with AtomicOutput(path, config.gzip_level, config.brotli_quality, validate) as output:
+        for chunk in chunks:
+            output.write(chunk)
+    return output.changed
 
-    print("Loading archive...")
-    archive = load_archive(config)
-    known_urls = {episode["url"] for episode in archive}
-    print(f"Archive contains {len(archive)} episodes")
 
-    print("Fetching website episode links...")
-    links = get_episode_links(session, config)
-    print(f"Found {len(links)} episode links on website")
+def write_feed_documents(
+    config: RadioFranceFeedConfig,
+    episodes: Iterable[dict],
+    total: int,
+) -> None:
+    """Write the feed, and its archive pages when paged, from a sorted stream."""
+    if not config.render_cache_file:
+        write_feed_pages(config, episodes, total)
+        return
 
-    new_episodes = []
+    with RenderCache(config.render_cache_file, config.output_file) as cache:
+        write_feed_pages(config, episodes, total, cache)
+    print(f"Rendered {cache.misses} feed items, reused {cache.hits} from cache")
+
+
+def write_feed_pages(
+    config: RadioFranceFeedConfig,
+    episodes: Iterable[dict],
+    total: int,
+    cache: RenderCache | None = None,
+) -> None:
+    if not config.current_feed_size:
+        write_feed_stream(
+            config,
+            config.output_file,
+            iter_rss_chunks(config, episodes, cache=cache),
+        )
+        return
+
+    episodes = iter(episodes)
+    current = list(islice(episodes, config.current_feed_size))
+    older = max(0, total - config.current_feed_size)
+    page_count = math.ceil(older / config.archive_page_size)
+
+    # Pages count from the oldest item; see split_feed_history().
+    def page_of(position: int) -> int:
+        return (older - 1 - position) // config.archive_page_size + 1
+
+    for page, numbered in groupby(enumerate(episodes), key=lambda pair: page_of(pair[0])):
+        page_file = archive_page_name(config.output_file, page)
+        chunks = iter_rss_chunks(
+            config,
+            (episode for _, episode in numbered),
+            output_file=page_file,
+            history_links=feed_history_links(config.output_file, page, page_count),
+            archive_page=True,
+            cache=cache,
+        )
+        if write_feed_stream(config, page_file, chunks):
+            print(f"Updated archive page {page_file}")
+
+    for stale in stale_archive_pages(config.output_file, page_count):
+        remove_output(stale)
+
+    write_feed_stream(
+        config,
+        config.output_file,
+        iter_rss_chunks(
+            config,
+            current,
+            history_links=feed_history_links(config.output_file, None, page_count),
+            cache=cache,
+        ),
+    )
+
+
+def write_rss(config: RadioFranceFeedConfig, episodes: list[dict]) -> None:
+    episodes = sort_episodes_newest_first(validate_archive(episodes))
+    write_feed_documents(config, episodes, len(episodes))
+
+
+def prioritize_links(links: list[str], listing_records: dict[str, dict]) -> list[str]:
+    """Order links newest first.
+
+    Links without a listing date keep the date of the previous dated link,
+    since listing pages are already ordered newest first.
+    """
+    newest = datetime.max.replace(tzinfo=timezone.utc)
+    current = newest
+    keys = {}
 
     for link in links:
+        published = (listing_records.get(link) or {}).get("published")
+        if published:
+            current = archive_to_date(published)
+        keys[link] = current
+
+    return sorted(links, key=lambda link: keys[link], reverse=True)
+
+
+def iter_crawl_candidates(
+    config: RadioFranceFeedConfig,
+    links: list[str],
+    listing_records: dict[str, dict],
+    known_urls: set[str],
+    state: dict,
+    now: datetime,
+    report: BuildReport,
+    covered: Container[str] = (),
+) -> Iterator[str]:
+    """Yield the links worth fetching, newest first, using local state only.
+
+    Links in covered came with the official feed, which already supplied
+    their episode; older links it does not list are still fetched.
+    """
+    for link in prioritize_links(links, listing_records):
+        if link in covered:
+            print(f"Covered by the official feed: {link}")
+            continue
+
         if link in known_urls:
             print(f"Already archived: {link}")
             continue
 
-        print(f"Checking: {link}")
-        data = extract_episode_data(session, link)
-
-        if not data:
-            print(f"  -> skipped, no valid episode data found at {link}")
+        skip_entry = state["skipped"].get(link)
+        if skip_entry_is_fresh(skip_entry, now):
+            report.cached_skips += 1
+            print(f"Skipped recently ({skip_entry['reason']}): {link}")
+            if (
+                skip_entry["reason"] == SKIP_BEFORE_MIN_DATE
+                and config.stop_when_before_min_published_date
+            ):
+                print("  -> stopping, remaining links are older")
+                break
             continue
 
-        if config.min_published_date:
-            published_dt = archive_to_date(data.get("published"))
-            min_dt = parse_iso_date(config.min_published_date)
+        yield link
+
+
+class EpisodeFetcher:
+    """Fetch and parse candidate links concurrently, yielding them in order.
+
+    Network work runs on fetch_workers threads; page parsing is handed to a
+    PageParser so it does not hold the GIL. At most two pages per worker are
+    in flight. With fetch_workers <= 1 each link is fetched only when the
+    caller asks for it, as a plain loop would.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        config: RadioFranceFeedConfig,
+        listing_records: dict[str, dict],
+        budget: CrawlBudget,
+        page_count: int,
+        parser: PageParser | None = None,
+    ) -> None:
+        self.session = session
+        self.listing_records = listing_records
+        self.budget = budget
+        self.workers = max(1, config.fetch_workers)
+        self.fetch_length = not config.prefetch_lengths
+        # A parser passed in outlives the fetcher; its pool is the caller's to close.
+        self._owns_parser = parser is None
+        if self.workers <= 1 or page_count < PARSE_POOL_MIN_PAGES:
+            self.parse = PageParser(0)
+        else:
+            self.parse = parser or PageParser(config.parse_processes)
+        self._pool = None
+
+    def extract(self, link: str) -> dict | None:
+        with self.budget.task():
+            return extract_episode_data(
+                self.session,
+                link,
+                self.listing_records.get(link),
+                self.budget,
+                self.parse,
+                self.fetch_length,
+            )
+
+    def results(self, links: Iterable[str]) -> Iterator[tuple[str, Callable[[], dict | None] | None]]:
+        """Yield (link, result) in link order; result is None once the budget is spent."""
+        window = 1 if self._pool is None else 2 * self.workers
+        pending = deque()
+        deferred = False
+
+        for link in links:
+            deferred = deferred or not self.budget.can_start()
+            if deferred:
+                outcome = None
+            elif self._pool is None:
+                outcome = partial(self.extract, link)
+            else:
+                outcome = self._pool.submit(self.extract, link).result
+            pending.append((link, outcome))
+
+            while len(pending) >= window:
+                yield pending.popleft()
+
+        while pending:
+            yield pending.popleft()
+
+    def __enter__(self) -> "EpisodeFetcher":
+        if self.workers > 1:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        if self._owns_parser:
+            self.parse.__exit__(exc_type, exc, traceback)
+        return False
+
+
+def crawl_new_episodes(
+    session: requests.Session,
+    config: RadioFranceFeedConfig,
+    links: list[str],
+    listing_records: dict[str, dict],
+    known_urls: set[str],
+    state: dict,
+    now: datetime,
+    budget: CrawlBudget,
+    report: BuildReport,
+    covered: Container[str] = (),
+    parser: PageParser | None = None,
+    lengths: AudioLengthEnricher | None = None,
+) -> list[dict]:
+    """Fetch and keep the new episodes among links, newest first.
+
+    Callers crawling several batches, such as a backfill, pass one parser
+    for all of them, so its process pool starts once. New episodes without
+    an enclosure length get their HEAD submitted to lengths right away.
+    """
+    new_episodes = []
+    candidates = list(
+        iter_crawl_candidates(
+            config,
+            links,
+            listing_records,
+            known_urls,
+            state,
+            now,
+            report,
+            covered,
+        )
+    )
+    page_count = sum(
+        not listing_record_is_complete(listing_records.get(link))
+        for link in candidates
+    )
 
-            if published_dt < min_dt:
-                print(f"  -> skipped, before {config.min_published_date}")
-                if config.stop_when_before_min_published_date:
-                    print("  -> stopping, remaining links are older")
-                    break
+    with EpisodeFetcher(
+        session, config, listing_records, budget, page_count, parser
+    ) as fetcher:
+        for link, outcome in fetcher.results(candidates):
+            if outcome is None:
+                report.deferred_links.append(link)
                 continue
 
-        new_episodes.append(data)
-        print(f"  -> added: {data['title']}")
+            print(f"Checking: {link}")
+            try:
+                data = outcome()
+            except requests.RequestException as exc:
+                print(f"  -> failed, will retry next run: {exc}")
+                report.failed_links.append(link)
+                continue
 
-    hydrated_archive = hydrate_audio_lengths(session, archive)
-    all_episodes = filter_episodes_by_min_date(
-        config,
-        merge_episodes(hydrated_archive, new_episodes),
+            if not data:
+                print(f"  -> skipped, no valid episode data found at {link}")
+                record_skip(state, link, SKIP_NO_EPISODE_DATA, now)
+                continue
+
+            if config.min_published_date:
+                published_dt = archive_to_date(data.get("published"))
+                min_dt = parse_iso_date(config.min_published_date)
+
+                if published_dt < min_dt:
+                    print(f"  -> skipped, before {config.min_published_date}")
+                    record_skip(state, link, SKIP_BEFORE_MIN_DATE, now)
+                    if config.stop_when_before_min_published_date:
+                        print("  -> stopping, remaining links are older")
+                        break
+                    continue
+
+            state["skipped"].pop(link, None)
+            new_episodes.append(data)
+            if lengths is not None and not data["audio_length"]:
+                lengths.submit(data["url"], data["audio_url"])
+            print(f"  -> added: {data['title']}")
+
+    return new_episodes
+
+
+def revalidate_episode(
+    session: requests.Session,
+    episode: dict,
+    state: dict,
+    budget: CrawlBudget | None = None,
+) -> dict | None:
+    """Return the refreshed record when the episode page changed, else None."""
+    url = episode["url"]
+    validators = state["validators"].get(url, {})
+    html_page, page_validators = fetch_html_if_modified(
+        session,
+        url,
+        validators,
+        request_timeout(budget, HTML_TIMEOUT_SECONDS),
     )
 
-    if not all_episodes:
-        raise RuntimeError(f"No episodes available for {config.feed_title}")
+    if html_page is None:
+        return None
+
+    fingerprint, fields = episode_page_fingerprint(html_page)
+    state["validators"][url] = {**page_validators, "fingerprint": fingerprint}
+
+    if not fields or fingerprint == validators.get("fingerprint"):
+        return None
+
+    updated = dict(episode)
+    for key, value in fields.items():
+        if value is not None:
+            updated[key] = value
 
-    save_archive(config, all_episodes)
-    write_rss(config, all_episodes)
+    if updated["audio_url"] != episode["audio_url"]:
+        updated["audio_length"] = fetch_content_length(
+            session,
+            updated["audio_url"],
+            request_timeout(budget, HEAD_TIMEOUT_SECONDS),
+        )
 
-    print()
-    print(f"New episodes added: {len(new_episodes)}")
-    print(f"Total archived episodes: {len(all_episodes)}")
-    print(f"Created {config.output_file}")
-    print(f"Updated {config.archive_file}")
+    validate_episode(updated)
+    return updated if updated != episode else None
+
+
+def revalidate_recent_episodes(
+    session: requests.Session,
+    config: RadioFranceFeedConfig,
+    archive: list[dict],
+    state: dict,
+    now: datetime,
+    budget: CrawlBudget,
+    report: BuildReport,
+    changed_upstream: Iterable[dict] = (),
+) -> list[dict]:
+    """Recheck episodes in the revalidation window and those flagged upstream."""
+    recent = []
+    if config.revalidate_days:
+        window_start = now - timedelta(days=config.revalidate_days)
+        recent = [
+            episode for episode in sort_episodes_newest_first(archive)
+            if archive_to_date(episode["published"]) >= window_start
+        ]
+
+    recent_urls = {episode["url"] for episode in recent}
+    for episode in changed_upstream:
+        if episode["url"] not in recent_urls:
+            recent.append(episode)
+            recent_urls.add(episode["url"])
+    state["validators"] = {
+        url: validators
+        for url, validators in state["validators"].items()
+        if url in recent_urls
+    }
+    changed = []
+
+    for episode in recent:
+        if not budget.can_start():
+            print("Crawl budget low, stopping revalidation")
+            break
+
+        try:
+            with budget.task():
+                updated = revalidate_episode(session, episode, state, budget)
+        except requests.RequestException as exc:
+            print(f"Revalidation failed for {episode['url']}: {exc}")
+            continue
+
+        report.revalidated += 1
+        if updated is None:
+            continue
+
+        print(f"Updated: {updated['title']}")
+        changed.append(updated)
+
+    report.updated_episodes = len(changed)
+    return changed
+
+
+class AudioLengthEnricher:
+    """Fetch missing enclosure lengths on background threads.
+
+    HEADs are submitted as soon as an episode is known, while the crawl
+    goes on, and collected once before the archive and feed are written.
+    Collecting waits no longer than the crawl budget allows.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        budget: CrawlBudget | None = None,
+        workers: int = 4,
+    ) -> None:
+        self.session = session
+        self.budget = budget
+        self.workers = max(1, workers)
+        self.pending = 0
+        self._futures = {}
+
+    def __enter__(self) -> "AudioLengthEnricher":
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self
+
+    def submit(self, url: str, audio_url: str) -> None:
+        if url in self._futures or (self.budget and not self.budget.can_start()):
+            return
+        self._futures[url] = self._pool.submit(
+            fetch_content_length,
+            self.session,
+            audio_url,
+            request_timeout(self.budget, HEAD_TIMEOUT_SECONDS),
+        )
+
+    def lengths(self) -> dict[str, int]:
+        """Wait for the submitted HEADs until the budget runs out; 0 where unknown.
+
+        HEADs still pending then count as 0 too: their enclosures are
+        published with length="0", and the next run asks for them again.
+        """
+        remaining = self.budget.remaining() if self.budget else math.inf
+        done, pending = wait(
+            self._futures.values(),
+            timeout=max(0.0, remaining) if remaining != math.inf else None,
+        )
+        self.pending = len(pending)
+        return {
+            url: future.result() if future in done else 0
+            for url, future in self._futures.items()
+        }
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        # Late HEADs finish in the background; nothing waits for them.
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        return False
+
+
+def iter_with_audio_lengths(
+    episodes: Iterable[dict],
+    lengths: dict[str, int],
+) -> Iterator[dict]:
+    for episode in episodes:
+        if episode["url"] in lengths:
+            episode = {**episode, "audio_length": lengths[episode["url"]]}
+        yield episode
+
+
+def publish_archive(
+    config: RadioFranceFeedConfig,
+    episodes: Iterable[dict],
+) -> tuple[int, list[Path]]:
+    """Write the archive, then the feed documents and HTML pages from it."""
+    total = write_archive_stream(config, episodes)
+    write_feed_documents(config, iter_archive_file(config.archive_file), total)
+    pages = write_static_pages(
+        Path(config.output_file).read_bytes(),
+        config.output_file,
+        config.style_file,
+        config.html_page_size,
+    )
+    return total, pages
+
+
+def discovery_latency_seconds(episode: dict) -> int | None:
+    """Seconds from publication to first discovery; None for older records."""
+    if not episode.get("discovered"):
+        return None
+    latency = archive_to_date(episode["discovered"]) - episode_published(episode)
+    return max(0, int(latency.total_seconds()))
+
+
+def percentile(values: list[int], q: int) -> int | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def load_freshness_history(path: str | Path) -> list[dict]:
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_freshness(
+    config: RadioFranceFeedConfig,
+    new_episodes: list[dict],
+    now: datetime,
+) -> dict:
+    """Append this run to the freshness history and summarize the window.
+
+    The history has one JSON line per run: its time, how many episodes it
+    found, and their discovery latencies in seconds. Lines older than
+    FRESHNESS_RETENTION are dropped.
+    """
+    window_start = now - FRESHNESS_WINDOW
+    latencies = [
+        latency
+        for episode in new_episodes
+        if episode_published(episode) >= window_start
+        and (latency := discovery_latency_seconds(episode)) is not None
+    ]
+    history = [
+        run
+        for run in load_freshness_history(config.freshness_file)
+        if archive_to_date(run["at"]) >= now - FRESHNESS_RETENTION
+    ]
+    history.append({"at": date_to_archive(now), "new": len(new_episodes), "latency": latencies})
+    atomic_write_text(
+        config.freshness_file,
+        "".join(json.dumps(run, separators=(",", ":")) + "\n" for run in history),
+    )
+
+    runs = [run for run in history if archive_to_date(run["at"]) >= window_start]
+    window_latencies = [latency for run in runs for latency in run["latency"]]
+    return {
+        "runs": len(runs),
+        "empty_runs": sum(not run["new"] for run in runs),
+        "episodes": len(window_latencies),
+        **{
+            f"p{q}": percentile(window_latencies, q)
+            for q in FRESHNESS_PERCENTILES
+        },
+    }
+
+
+def build_feed(config: RadioFranceFeedConfig) -> BuildReport:
+    session = create_session(config.http2)
+    hedged = HedgedSession(session, config.hedge_budget) if config.hedge_budget else None
+    session = hedged or session
+    try:
+        budget = CrawlBudget(config.crawl_budget_seconds)
+        report = BuildReport()
+        now = datetime.now(timezone.utc)
+
+        print("Loading archive...")
+        archive = index_archive(
+            config,
+            now - timedelta(days=config.revalidate_days) if config.revalidate_days else None,
+        )
+        print(f"Archive contains {archive.count} episodes")
+        state = load_crawl_state(config)
+
+        # Enclosure HEADs run on background threads while pages are crawled, so
+        # the archive and feed are written once, with the lengths already known.
+        with AudioLengthEnricher(session, budget, config.fetch_workers) as enricher:
+            if config.prefetch_lengths:
+                for url, audio_url in archive.unenriched:
+                    enricher.submit(url, audio_url)
+
+            official_episodes, official_filled = [], []
+            covered = set()
+            if config.official_feed_url:
+                print("Fetching official feed...")
+                try:
+                    official_records = fetch_official_episodes(session, config, state, budget)
+                except requests.RequestException as exc:
+                    print(f"Official feed failed, scraping without it: {exc}")
+                    official_records = []
+                official_episodes, official_filled = seed_from_official_feed(
+                    config,
+                    official_records,
+                    archive.urls,
+                )
+                archive.urls.update(episode["url"] for episode in official_episodes)
+                if config.prefetch_lengths:
+                    for episode in official_filled + official_episodes:
+                        if not episode.get("audio_length"):
+                            enricher.submit(episode["url"], episode["audio_url"])
+                covered = {record["url"] for record in official_records}
+                report.official_episodes = len(official_episodes)
+                print(
+                    f"Official feed added {len(official_episodes)} episodes "
+                    f"and completed {len(official_filled)}"
+                )
+
+            changed_urls = set()
+            if config.sitemap_url:
+                print("Reading sitemaps...")
+                links, changed_urls = discover_sitemap_links(
+                    session,
+                    config,
+                    state,
+                    archive.urls,
+                    budget,
+                )
+                listing_records = {}
+                print(f"Sitemaps list {len(links)} new episode links")
+                print(f"Sitemaps report {len(changed_urls)} archived episodes changed")
+            else:
+                print("Fetching website episode links...")
+                links, listing_records = get_episode_links(session, config, budget)
+                print(f"Found {len(links)} episode links on website")
+                print(f"Listing pages described {len(listing_records)} of them")
+
+            new_episodes = crawl_new_episodes(
+                session,
+                config,
+                links,
+                listing_records,
+                archive.urls,
+                state,
+                now,
+                budget,
+                report,
+                covered,
+                lengths=enricher if config.prefetch_lengths else None,
+            )
+
+            if config.sitemap_url:
+                # Links the skip list recorded are settled, like added ones;
+                # failed or deferred links are crawled again next run.
+                added = {episode["url"] for episode in new_episodes}
+                state["pending_links"] += [
+                    link
+                    for link in links
+                    if link not in added and link not in state["skipped"]
+                ]
+
+            print("Revalidating recent episodes...")
+            changed_episodes = revalidate_recent_episodes(
+                session,
+                config,
+                archive.recent,
+                state,
+                now,
+                budget,
+                report,
+                (episode for episode in iter_archive(config) if episode["url"] in changed_urls)
+                if changed_urls
+                else (),
+            )
+
+            for episode in official_episodes + new_episodes:
+                episode["discovered"] = date_to_archive(now)
+            updates = official_filled + official_episodes + changed_episodes + new_episodes
+            if config.prefetch_lengths:
+                for episode in changed_episodes:
+                    if not episode.get("audio_length"):
+                        enricher.submit(episode["url"], episode["audio_url"])
+            lengths = enricher.lengths()
+        report.enriched_episodes = sum(1 for length in lengths.values() if length)
+        report.pending_lengths = enricher.pending
+
+        # The archive is streamed from disk twice: once merged into the new
+        # archive file, then from that file into the feed documents.
+        old_episodes = iter_archive(config)
+        if not archive.newest_first:
+            old_episodes = sort_episodes_newest_first(old_episodes)
+
+        episodes = iter_episodes_since_min_date(
+            config,
+            iter_validated_archive(merge_sorted_episodes(old_episodes, updates)),
+        )
+        published_items = feed_item_ids(config.output_file) if config.websub_hub else None
+
+        # Lengths the HEADs missed stay 0 rather than being asked for again;
+        # anything not tried yet is fetched inline while the budget allows.
+        report.total_episodes, pages = publish_archive(
+            config,
+            iter_hydrated_episodes(
+                session,
+                iter_with_audio_lengths(episodes, lengths),
+                budget,
+                lengths,
+            ),
+        )
+
+        # The ping is sent by websub.py once the new feed is pushed and served.
+        if config.websub_hub and feed_item_ids(config.output_file) != published_items:
+            record_pending_ping(
+                config.websub_pending_file,
+                config.websub_hub,
+                [public_file_url(config.output_file)],
+            )
+            report.hub_ping_queued = True
+
+        prune_skip_list(state, now)
+        save_crawl_state(config, state)
+        report.new_episodes = len(new_episodes) + len(official_episodes)
+        if config.freshness_file:
+            report.freshness = record_freshness(config, official_episodes + new_episodes, now)
+        if hedged:
+            report.hedging = hedged.stats()
+
+        print()
+        print(f"New episodes added: {report.new_episodes}")
+        if config.official_feed_url:
+            print(f"  from the official feed: {report.official_episodes}")
+        print(f"Links skipped from cache: {report.cached_skips}")
+        print(f"Links failed: {len(report.failed_links)}")
+        print(
+            f"Recent episodes revalidated: {report.revalidated} "
+            f"({report.updated_episodes} updated)"
+        )
+        if config.prefetch_lengths:
+            print(
+                f"Enclosure lengths fetched during the crawl: {report.enriched_episodes} "
+                f"({report.pending_lengths} left for the next run)"
+            )
+        if config.websub_hub:
+            print(f"WebSub ping queued: {'yes' if report.hub_ping_queued else 'no'}")
+        if report.hedging:
+            hedging = report.hedging
+            print(
+                f"Hedged requests: {hedging['hedged']} of {hedging['requests']} "
+                f"({hedging['hedge_wins']} won by the hedge, "
+                f"{hedging['over_budget']} over budget)"
+            )
+        print(f"Links deferred to next run: {len(report.deferred_links)}")
+        for link in report.deferred_links:
+            print(f"  - {link}")
+        if report.freshness:
+            freshness = report.freshness
+            latencies = ", ".join(
+                f"p{q} {seconds_to_itunes_duration(freshness[f'p{q}']) or '0:00'}"
+                for q in FRESHNESS_PERCENTILES
+                if freshness[f"p{q}"] is not None
+            )
+            print(
+                f"Discovery latency over {FRESHNESS_WINDOW.days} days "
+                f"({freshness['episodes']} episodes): {latencies or 'n/a'}"
+            )
+            print(f"Runs without new episodes: {freshness['empty_runs']} of {freshness['runs']}")
+        print(f"Total archived episodes: {report.total_episodes}")
+        print(f"Created {config.output_file}")
+        print(f"Updated {len(pages)} HTML pages")
+        print(f"Updated {config.archive_file}")
+        return report
+    finally:
+        # Also on failure, so the hedge threads never outlive the build.
+        if hedged:
+            hedged.close()
 
 
 if __name__ == "__main__":
-    build_feed()
+    # feed_registry imports this module, so it is imported only here.
+    from feed_registry import registry_config
+
+    build_feed(registry_config("france-culture"))
@@ -0,0 +1,75 @@
+"""Load Radio France feed configs from the declarative feeds.toml registry."""
+
+from __future__ import annotations
+
+import hashlib
+import tomllib
+from dataclasses import MISSING, fields
+from functools import lru_cache
+from pathlib import Path
+
+from build_feed import RadioFranceFeedConfig
+
+
+DEFAULT_REGISTRY_FILE = Path(__file__).with_name("feeds.toml")
+CONFIG_FIELDS = {field.name: field for field in fields(RadioFranceFeedConfig)}
+
+
+def feed_config(name: str, table: dict, defaults: dict | None = None) -> RadioFranceFeedConfig:
+    values = {**(defaults or {}), **table}
+    unknown = sorted(set(values) - set(CONFIG_FIELDS))
+    if unknown:
+        raise ValueError(f"Feed {name} has unknown fields: {', '.join(unknown)}")
+
+    missing = sorted(
+        key
+        for key, field in CONFIG_FIELDS.items()
+        if key not in values
+        and field.default is MISSING
+        and field.default_factory is MISSING
+    )
+    if missing:
+        raise ValueError(f"Feed {name} is missing fields: {', '.join(missing)}")
+    return RadioFranceFeedConfig(**values)
+
+
+def load_registry(path: str | Path = DEFAULT_REGISTRY_FILE) -> dict[str, RadioFranceFeedConfig]:
+    """Return the configs declared in a registry file, keyed by feed name."""
+    with open(path, "rb") as f:
+        registry = tomllib.load(f)
+
+    unknown = sorted(set(registry) - {"defaults", "feeds"})
+    if unknown:
+        raise ValueError(f"{path} has unknown tables: {', '.join(unknown)}")
+
+    defaults = registry.get("defaults", {})
+    configs = {
+        name: feed_config(name, table, defaults)
+        for name, table in registry.get("feeds", {}).items()
+    }
+
+    for attribute in ("output_file", "archive_file"):
+        seen = {}
+        for name, config in configs.items():
+            value = getattr(config, attribute)
+            if value in seen:
+                raise ValueError(f"Feeds {seen[value]} and {name} share {attribute} {value}")
+            seen[value] = name
+    return configs
+
+
+@lru_cache(maxsize=None)
+def cached_registry(path: str | Path = DEFAULT_REGISTRY_FILE) -> dict[str, RadioFranceFeedConfig]:
+    """load_registry() on first use, so importing a module never reads the registry."""
+    return load_registry(path)
+
+
+def registry_config(name: str) -> RadioFranceFeedConfig:
+    """One feed of the default registry, such as "france-culture"."""
+    return cached_registry()[name]
+
+
+def shard_of(name: str, shard_count: int) -> int:
+    """Stable shard of a feed name, the same on every machine and run."""
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Build the Radio France feeds of the registry, sharded across processes and nodes.
+
+Feeds are split into shards by a stable hash of their registry name, so
+`--shard 1/4` selects the same feeds on every machine. Within a node, the
+worker processes coordinate through a SQLite job table: a worker claims a
+feed under a lease, and a failed build goes back to the queue with backoff
+until it runs out of attempts. A worker that dies loses its lease, and
+another worker claims the feed once the lease expires. Jobs are keyed by
+run id, so rerunning the same id only builds what did not finish.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable
+
+from build_feed import RadioFranceFeedConfig, build_feed
+from feed_registry import DEFAULT_REGISTRY_FILE, load_registry, shard_of
+
+
+DEFAULT_QUEUE_FILE = ".cache/feed-jobs.sqlite"
+DEFAULT_RUN_ID = "local"
+DEFAULT_MAX_ATTEMPTS = 3
+# Longer than a build can take: crawl budget plus writing the outputs.
+DEFAULT_LEASE_SECONDS = 1800.0
+DEFAULT_RETRY_DELAY_SECONDS = 30.0
+POLL_SECONDS = 5.0
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobQueue:
+    """Feed build jobs of one run in a SQLite table shared by worker processes."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        run_id: str = DEFAULT_RUN_ID,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        retry_delay_seconds: float = DEFAULT_RETRY_DELAY_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.run_id = run_id
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.clock = clock
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "run TEXT NOT NULL, feed TEXT NOT NULL, shard INTEGER NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "owner TEXT, lease_until REAL NOT NULL DEFAULT 0, "
+            "available_at REAL NOT NULL DEFAULT 0, error TEXT, "
+            "PRIMARY KEY (run, feed))"
+        )
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.close()
+        return False
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers
+        # cannot read the same pending row and both claim it.
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def enqueue(self, shards: dict[str, int]) -> None:
+        """Add feed -> shard jobs to the run; jobs already in the run are kept."""
+        db = self._transaction()
+        try:
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (run, feed, shard, status) VALUES (?, ?, ?, ?)",
+                [(self.run_id, feed, shard, JOB_PENDING) for feed, shard in shards.items()],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def claim(self, owner: str, shard: int | None = None) -> str | None:
+        """Lease the next runnable feed of the shard to owner, or return None."""
+        now = self.clock()
+        shard_clause = "" if shard is None else " AND shard = ?"
+        shard_args = () if shard is None else (shard,)
+        db = self._transaction()
+        try:
+            # Leases that expired on their last attempt cannot be retried.
+            db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, error = 'lease expired' "
+                "WHERE run = ? AND status = ? AND lease_until < ? AND attempts >= ?"
+                + shard_clause,
+                (JOB_FAILED, self.run_id, JOB_RUNNING, now, self.max_attempts, *shard_args),
+            )
+            row = db.execute(
+                "SELECT feed FROM jobs WHERE run = ? AND available_at <= ? "
+                "AND (status = ? OR (status = ? AND lease_until < ?))"
+                + shard_clause
+                + " ORDER BY available_at, feed LIMIT 1",
+                (self.run_id, now, JOB_PENDING, JOB_RUNNING, now, *shard_args),
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, "
+                    "attempts = attempts + 1 WHERE run = ? AND feed = ?",
+                    (JOB_RUNNING, owner, now + self.lease_seconds, self.run_id, row[0]),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return row[0] if row else None
+
+    def _finish(self, feed: str, owner: str, sql: str, args: tuple) -> bool:
+        cursor = self.db.execute(
+            sql + " WHERE run = ? AND feed = ? AND owner = ? AND status = ?",
+            (*args, self.run_id, feed, owner, JOB_RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, feed: str, owner: str) -> bool:
+        """Mark a leased job done; False when owner no longer holds the lease."""
+        return self._finish(
+            feed,
+            owner,
+            "UPDATE jobs SET status = ?, owner = NULL, error = NULL",
+            (JOB_DONE,),
+        )
+
+    def fail(self, feed: str, owner: str, error: str) -> bool:
+        """Requeue a leased job with backoff, or fail it after its last attempt."""
+        row = self.db.execute(
+            "SELECT attempts FROM jobs WHERE run = ? AND feed = ?",
+            (self.run_id, feed),
+        ).fetchone()
+        attempts = row[0] if row else self.max_attempts
+        if attempts >= self.max_attempts:
+            return self._finish(
+                feed,
+                owner,
+                "UPDATE jobs SET status = ?, owner = NULL, error = ?",
+                (JOB_FAILED, error),
+            )
+
+        retry_at = self.clock() + self.retry_delay_seconds * 2 ** (attempts - 1)
+        return self._finish(
+            feed,
+            owner,
+            "UPDATE jobs SET status = ?, owner = NULL, available_at = ?, error = ?",
+            (JOB_PENDING, retry_at, error),
+        )
+
+    def remaining(self, shard: int | None = None) -> int:
+        """Jobs of the shard still pending or running."""
+        sql = "SELECT COUNT(*) FROM jobs WHERE run = ? AND status IN (?, ?)"
+        args = [self.run_id, JOB_PENDING, JOB_RUNNING]
+        if shard is not None:
+            sql += " AND shard = ?"
+            args.append(shard)
+        return self.db.execute(sql, args).fetchone()[0]
+
+    def jobs(self, shard: int | None = None) -> dict[str, dict]:
+        sql = "SELECT feed, status, attempts, error FROM jobs WHERE run = ?"
+        args = [self.run_id]
+        if shard is not None:
+            sql += " AND shard = ?"
+            args.append(shard)
+        return {
+            feed: {"status": status, "attempts": attempts, "error": error}
+            for feed, status, attempts, error in self.db.execute(sql + " ORDER BY feed", args)
+        }
+
+
+def run_worker(
+    queue: JobQueue,
+    configs: dict[str, RadioFranceFeedConfig],
+    owner: str,
+    shard: int | None = None,
+    build: Callable[[RadioFranceFeedConfig], object] = build_feed,
+    sleep: Callable[[float], None] = time.sleep,
+    poll_seconds: float = POLL_SECONDS,
+) -> list[str]:
+    """Build claimed feeds until the shard has no job left; returns the feeds built."""
+    built = []
+    while queue.remaining(shard):
+        feed = queue.claim(owner, shard)
+        if feed is None:
+            # Other workers hold the remaining leases, or a retry is backing off.
+            sleep(poll_seconds)
+            continue
+
+        print(f"[{owner}] Building {feed}")
+        try:
+            build(configs[feed])
+        except Exception as exc:
+            print(f"[{owner}] {feed} failed: {exc!r}")
+            queue.fail(feed, owner, repr(exc))
+            continue
+
+        if queue.complete(feed, owner):
+            built.append(feed)
+        else:
+            print(f"[{owner}] Lease on {feed} expired before the build finished")
+    return built
+
+
+def worker_process(
+    queue_file: str,
+    run_id: str,
+    configs: dict[str, RadioFranceFeedConfig],
+    shard: int | None,
+    max_attempts: int,
+    lease_seconds: float,
+    build: Callable[[RadioFranceFeedConfig], object] = build_feed,
+    poll_seconds: float = POLL_SECONDS,
+) -> None:
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    with JobQueue(queue_file, run_id, max_attempts, lease_seconds) as queue:
+        run_worker(queue, configs, owner, shard, build, poll_seconds=poll_seconds)
+
+
+def share_parse_processes(
+    configs: dict[str, RadioFranceFeedConfig],
+    processes: int,
+    cpus: int | None = None,
+) -> dict[str, RadioFranceFeedConfig]:
+    """Split the CPUs between the page parser pools of concurrent workers.
+
+    A config that leaves parse_processes unset would otherwise start one
+    process per CPU in every worker. Explicit values are kept.
+    """
+    share = max(1, (cpus or os.cpu_count() or 1) // max(1, processes))
+    return {
+        name: (
+            config
+            if config.parse_processes is not None
+            else replace(config, parse_processes=share)
+        )
+        for name, config in configs.items()
+    }
+
+
+def run_feeds(
+    configs: dict[str, RadioFranceFeedConfig],
+    queue_file: str | Path = DEFAULT_QUEUE_FILE,
+    run_id: str = DEFAULT_RUN_ID,
+    shard: int = 0,
+    shard_count: int = 1,
+    processes: int = 1,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    build: Callable[[RadioFranceFeedConfig], object] = build_feed,
+    poll_seconds: float = POLL_SECONDS,
+) -> dict[str, dict]:
+    """Queue the shard's feeds for run_id and build them; returns their job rows."""
+    if not 0 <= shard < shard_count:
+        raise ValueError(f"Shard {shard} is outside 0..{shard_count - 1}")
+
+    shards = {name: shard_of(name, shard_count) for name in configs}
+    configs = share_parse_processes(configs, processes)
+    with JobQueue(queue_file, run_id, max_attempts, lease_seconds) as queue:
+        queue.enqueue(shards)
+
+    args = (
+        str(queue_file),
+        run_id,
+        configs,
+        shard,
+        max_attempts,
+        lease_seconds,
+        build,
+        poll_seconds,
+    )
+    if processes <= 1:
+        worker_process(*args)
+    else:
+        # Spawned, not daemonic: each build may start its own page parser pool,
+        # sized by share_parse_processes so the workers do not oversubscribe.
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=worker_process, args=args, name=f"feed-worker-{index}")
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    with JobQueue(queue_file, run_id) as queue:
+        return queue.jobs(shard)
+
+
+def tracked_files(config: RadioFranceFeedConfig) -> list[str]:
+    """Committed files of a feed, for the workflow's commit and validation steps."""
+    candidates = (
+        config.output_file,
+        config.style_file,
+        config.archive_file,
+        config.state_file,
+        config.freshness_file,
+    )
+    return [path for path in candidates if path and os.path.exists(path)]
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    try:
+        shard, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected INDEX/COUNT, e.g. 0/4") from None
+    if count < 1 or not 0 <= shard < count:
+        raise argparse.ArgumentTypeError(f"shard {value} is out of range")
+    return shard, count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("feeds", nargs="*", help="registry names to build, default all")
+    parser.add_argument("--registry", default=str(DEFAULT_REGISTRY_FILE))
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_FILE, help="SQLite job table")
+    parser.add_argument("--run-id", default=DEFAULT_RUN_ID)
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1), help="INDEX/COUNT")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument(
+        "--list-files",
+        action="store_true",
+        help="print the committed files of the selected feeds and exit",
+    )
+    args = parser.parse_args(argv)
+
+    configs = load_registry(args.registry)
+    unknown = sorted(set(args.feeds) - set(configs))
+    if unknown:
+        parser.error(f"unknown feeds: {', '.join(unknown)}")
+    if args.feeds:
+        configs = {name: configs[name] for name in args.feeds}
+
+    if args.list_files:
+        for config in configs.values():
+            print("\n".join(tracked_files(config)))
+        return 0
+
+    shard, shard_count = args.shard
+    jobs = run_feeds(
+        configs,
+        args.queue,
+        args.run_id,
+        shard,
+        shard_count,
+        args.processes,
+        args.max_attempts,
+        args.lease,
+    )
+
+    print()
+    for feed, job in jobs.items():
+        detail = f" ({job['error']})" if job["error"] else ""
+        print(f"{feed}: {job['status']} after {job['attempts']} attempt(s){detail}")
+    return 0 if all(job["status"] == JOB_DONE for job in jobs.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
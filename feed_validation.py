@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Check generated RSS feeds before they are published.
+
+The builders validate each document before it replaces the file on disk,
+so a broken feed never reaches the site; a streamed feed is checked from its
+temporary file one item at a time. Run as a script, the
+module validates already written feeds and XSL styles in parallel.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlparse
+
+from lxml import etree
+
+from static_pages import compiled_stylesheet
+
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+FEED_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+ITUNES_EXPLICIT_VALUES = {"true", "false", "yes", "no", "clean"}
+# Seconds, or MM:SS / HH:MM:SS.
+ITUNES_DURATION_RE = re.compile(r"^\d+(?::[0-5]?\d){0,2}$")
+STYLESHEET_HREF_RE = re.compile(r'href="([^"]+)"')
+
+
+class FeedValidationError(ValueError):
+    """A generated feed failed validation; problems lists every check that failed."""
+
+    def __init__(self, name: str, problems: list[str]) -> None:
+        self.name = name
+        self.problems = problems
+        shown = "; ".join(problems[:5])
+        more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+        super().__init__(f"{name} failed validation: {shown}{more}")
+
+
+def is_http_url(value: str | None) -> bool:
+    parsed = urlparse(value or "")
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
+
+def parse_pub_date(value: str | None):
+    if not value:
+        return None
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return published if published.tzinfo else None
+
+
+def itunes_problems(node: etree._Element, label: str) -> list[str]:
+    problems = []
+    explicit = node.findtext(f"{{{ITUNES_NS}}}explicit")
+    if explicit is not None and explicit.strip().lower() not in ITUNES_EXPLICIT_VALUES:
+        problems.append(f"{label} has invalid itunes:explicit {explicit!r}")
+
+    duration = node.findtext(f"{{{ITUNES_NS}}}duration")
+    if duration is not None and not ITUNES_DURATION_RE.match(duration.strip()):
+        problems.append(f"{label} has invalid itunes:duration {duration!r}")
+
+    for image in node.findall(f"{{{ITUNES_NS}}}image"):
+        if not is_http_url(image.get("href")):
+            problems.append(f"{label} has an itunes:image without an http(s) href")
+    return problems
+
+
+def channel_problems(channel: etree._Element) -> list[str]:
+    problems = []
+    for tag in ("title", "link", "description"):
+        if channel.find(tag) is None:
+            problems.append(f"channel has no {tag}")
+
+    if not (channel.findtext(f"{{{ITUNES_NS}}}author") or "").strip():
+        problems.append("channel has no itunes:author")
+    if channel.find(f"{{{ITUNES_NS}}}explicit") is None:
+        problems.append("channel has no itunes:explicit")
+    for category in channel.findall(f"{{{ITUNES_NS}}}category"):
+        if not category.get("text"):
+            problems.append("channel has an itunes:category without text")
+    problems.extend(itunes_problems(channel, "channel"))
+    return problems
+
+
+def item_problems(item: etree._Element, label: str) -> list[str]:
+    problems = []
+    if not (item.findtext("title") or "").strip():
+        problems.append(f"{label} has no title")
+
+    enclosure = item.find("enclosure")
+    if enclosure is None:
+        problems.append(f"{label} has no enclosure")
+    else:
+        if not is_http_url(enclosure.get("url")):
+            problems.append(f"{label} enclosure has no http(s) url")
+        if not (enclosure.get("length") or "").isdigit():
+            problems.append(f"{label} enclosure has invalid length {enclosure.get('length')!r}")
+        if "/" not in (enclosure.get("type") or ""):
+            problems.append(f"{label} enclosure has invalid type {enclosure.get('type')!r}")
+
+    problems.extend(itunes_problems(item, label))
+    return problems
+
+
+def style_problems(document: etree._ElementTree, style_file: str | Path) -> list[str]:
+    try:
+        transform = compiled_stylesheet(style_file)
+    except (OSError, etree.XMLSyntaxError, etree.XSLTParseError) as exc:
+        return [f"style {style_file} does not compile: {exc}"]
+
+    try:
+        result = transform(document)
+    except etree.XSLTApplyError as exc:
+        return [f"style {style_file} does not render the feed: {exc}"]
+    if result.getroot() is None:
+        return [f"style {style_file} renders the feed to an empty document"]
+    return []
+
+
+def feed_problems(rss: bytes, style_file: str | Path | None = None) -> list[str]:
+    """Return every problem found in an RSS document; an empty list means valid."""
+    try:
+        root = etree.fromstring(rss, FEED_PARSER)
+    except etree.XMLSyntaxError as exc:
+        return [f"not well-formed: {exc}"]
+
+    if root.tag != "rss":
+        return [f"root element is {root.tag}, not rss"]
+    channel = root.find("channel")
+    if channel is None:
+        return ["rss has no channel"]
+
+    problems = channel_problems(channel)
+    problems.extend(items_problems(channel.iterfind("item")))
+    if style_file is not None:
+        problems.extend(style_problems(root.getroottree(), style_file))
+    return problems
+
+
+def items_problems(items: Iterable[etree._Element]) -> list[str]:
+    """Check each item, its guid against earlier ones, and newest-first order."""
+    problems = []
+    guids = set()
+    previous = None
+    for position, item in enumerate(items, 1):
+        guid = (item.findtext("guid") or "").strip()
+        label = f"item {position} ({guid or 'no guid'})"
+        problems.extend(item_problems(item, label))
+
+        if not guid:
+            problems.append(f"{label} has no guid")
+        elif guid in guids:
+            problems.append(f"{label} repeats a guid")
+        guids.add(guid)
+
+        published = parse_pub_date(item.findtext("pubDate"))
+        if published is None:
+            problems.append(f"{label} has an invalid pubDate")
+            continue
+        if previous is not None and published > previous:
+            problems.append(f"{label} is newer than the item before it")
+        previous = published
+    return problems
+
+
+def feed_file_problems(path: str | Path, style_file: str | Path | None = None) -> list[str]:
+    """feed_problems() for a file, parsed incrementally to bound memory.
+
+    Each item is dropped from the tree once checked, except the first one, so
+    the style renders the channel with its first item instead of every item.
+    """
+    context = etree.iterparse(
+        str(path),
+        events=("end",),
+        tag="item",
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+
+    def channel_items():
+        for _, item in context:
+            channel = item.getparent()
+            rss = channel.getparent() if channel is not None else None
+            if rss is None or rss.getparent() is not None or channel.tag != "channel":
+                continue
+            yield item
+            previous = item.getprevious()
+            if previous is not None and previous.tag == "item":
+                channel.remove(item)
+
+    try:
+        problems = items_problems(channel_items())
+    except etree.XMLSyntaxError as exc:
+        return [f"not well-formed: {exc}"]
+
+    root = context.root
+    if root.tag != "rss":
+        return [f"root element is {root.tag}, not rss"]
+    channel = root.find("channel")
+    if channel is None:
+        return ["rss has no channel"]
+
+    problems = channel_problems(channel) + problems
+    if style_file is not None:
+        problems.extend(style_problems(root.getroottree(), style_file))
+    return problems
+
+
+def validate_feed(
+    rss: bytes,
+    style_file: str | Path | None = None,
+    name: str = "feed",
+) -> None:
+    """Raise FeedValidationError unless rss is a valid feed."""
+    problems = feed_problems(rss, style_file)
+    if problems:
+        raise FeedValidationError(name, problems)
+
+
+def validate_feed_file(
+    path: str | Path,
+    style_file: str | Path | None = None,
+    name: str = "feed",
+) -> None:
+    """Raise FeedValidationError unless the file at path is a valid feed."""
+    problems = feed_file_problems(path, style_file)
+    if problems:
+        raise FeedValidationError(name, problems)
+
+
+def validate_feeds(
+    documents: dict[str, bytes],
+    style_file: str | Path | None = None,
+    workers: int | None = None,
+) -> None:
+    """Validate several in-memory feeds in parallel; raise for the first broken one."""
+    names = list(documents)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(partial(feed_problems, style_file=style_file), documents.values())
+        for name, problems in zip(names, results):
+            if problems:
+                raise FeedValidationError(name, problems)
+
+
+def stylesheet_file(rss: bytes, feed_path: str | Path) -> Path | None:
+    """Resolve the xml-stylesheet instruction of a feed next to the feed file."""
+    head = rss[:500]
+    start = head.find(b"<?xml-stylesheet")
+    if start == -1:
+        return None
+    end = head.find(b"?>", start)
+    match = STYLESHEET_HREF_RE.search(head[start:end].decode("utf-8", "replace"))
+    if not match:
+        return None
+    return Path(feed_path).parent / match.group(1)
+
+
+def file_problems(path: str | Path) -> list[str]:
+    """Validate a feed file with its own stylesheet, or compile an XSL file."""
+    path = Path(path)
+    try:
+        with path.open("rb") as f:
+            head = f.read(500)
+    except OSError as exc:
+        return [f"cannot read: {exc}"]
+
+    if path.suffix == ".xsl":
+        try:
+            compiled_stylesheet(path)
+        except (etree.XMLSyntaxError, etree.XSLTParseError) as exc:
+            return [f"does not compile: {exc}"]
+        return []
+    return feed_file_problems(path, stylesheet_file(head, path))
+
+
+def validate_files(
+    paths: list[str | Path],
+    workers: int | None = None,
+) -> dict[str, list[str]]:
+    """Validate files in parallel; lxml releases the GIL while parsing and transforming."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(file_problems, paths)
+        return {str(path): problems for path, problems in zip(paths, results)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="feed (.xml) or style (.xsl) files")
+    parser.add_argument("--workers", type=int, help="parallel validations")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path, problems in validate_files(args.files, args.workers).items():
+        if not problems:
+            print(f"{path}: ok")
+            continue
+        failed += 1
+        for problem in problems:
+            print(f"{path}: {problem}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""Optional HTTP/2 transport for requests sessions, backed by httpx.
+
+create_session(http2=True) mounts HTTP2Adapter for https:// URLs. Requests
+made from the crawl's worker threads then share one multiplexed connection
+per host, instead of one TCP/TLS connection each. Hosts that do not offer
+h2 through ALPN are spoken to over HTTP/1.1. Retries are driven by the same
+urllib3 Retry as the session's HTTP/1.1 adapter, so both transports retry
+the same errors and statuses with the same backoff. LocalH2Server stands in
+for an HTTP/2 host in tests.
+"""
+
+from __future__ import annotations
+
+import io
+import socket
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    HTTPError as Urllib3Error,
+    MaxRetryError,
+    ProtocolError,
+    ReadTimeoutError,
+)
+from urllib3.response import HTTPResponse
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # optional dependency, only needed for HTTP/2
+    httpx = None
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:  # optional dependency, only needed for LocalH2Server
+    h2 = None
+
+
+HTTP2_MAX_CONNECTIONS = 10
+# HTTP/1.1 connection headers have no meaning in HTTP/2 and are refused there.
+HOP_BY_HOP_HEADERS = frozenset(
+    ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+)
+
+
+class ResponseStream(io.RawIOBase):
+    """A file over an httpx response's undecoded body, for urllib3 to read."""
+
+    def __init__(self, response: "httpx.Response") -> None:
+        self.response = response
+        self.chunks = response.iter_raw()
+        self.pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.pending:
+            self.pending = next(self.chunks, b"")
+            if not self.pending:
+                self.close()
+                return 0
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+    def close(self) -> None:
+        self.response.close()
+        super().close()
+
+
+def httpx_timeout(timeout) -> "httpx.Timeout":
+    """Convert a requests timeout, one number or (connect, read), for httpx."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def retry_error(exc: Exception, url: str) -> Urllib3Error:
+    """The urllib3 error Retry counts exc as: connect, read or protocol."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return ConnectTimeoutError(str(exc))
+    if isinstance(exc, httpx.TimeoutException):
+        return ReadTimeoutError(None, url, str(exc))
+    return ProtocolError(str(exc))
+
+
+def requests_error(exc: Exception, request: requests.PreparedRequest) -> requests.RequestException:
+    """The requests exception HTTPAdapter raises for the same failure."""
+    if isinstance(exc, (httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return requests.ConnectTimeout(exc, request=request)
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.ReadTimeout(exc, request=request)
+    return requests.ConnectionError(exc, request=request)
+
+
+class HTTP2Adapter(HTTPAdapter):
+    """A requests transport adapter that sends through an HTTP/2 httpx client.
+
+    With http1=False, http:// URLs use HTTP/2 with prior knowledge, as
+    LocalH2Server expects. Cookies from responses are not stored, and the
+    client's own TLS verification and proxy settings apply.
+    """
+
+    def __init__(
+        self,
+        max_retries: Retry,
+        max_connections: int = HTTP2_MAX_CONNECTIONS,
+        http1: bool = True,
+    ) -> None:
+        if httpx is None:
+            raise RuntimeError("http2 requires the optional httpx[http2] package")
+        super().__init__(max_retries=max_retries)
+        self.client = httpx.Client(
+            http1=http1,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=False,
+        )
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ) -> requests.Response:
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        retries = self.max_retries
+
+        while True:
+            try:
+                response = self.client.send(
+                    self.client.build_request(
+                        request.method,
+                        request.url,
+                        headers=headers,
+                        content=request.body,
+                        timeout=httpx_timeout(timeout),
+                    ),
+                    stream=True,
+                )
+            except httpx.TransportError as exc:
+                try:
+                    retries = retries.increment(
+                        request.method,
+                        request.url,
+                        error=retry_error(exc, request.url),
+                    )
+                except Urllib3Error:
+                    raise requests_error(exc, request) from exc
+                retries.sleep()
+                continue
+
+            raw = HTTPResponse(
+                body=ResponseStream(response),
+                headers=list(response.headers.multi_items()),
+                status=response.status_code,
+                version=20 if response.http_version == "HTTP/2" else 11,
+                version_string=response.http_version,
+                reason=response.reason_phrase,
+                preload_content=False,
+                decode_content=False,
+                request_method=request.method,
+                request_url=request.url,
+            )
+            has_retry_after = "Retry-After" in response.headers
+            if not retries.is_retry(request.method, response.status_code, has_retry_after):
+                return self.build_response(request, raw)
+
+            try:
+                retries = retries.increment(request.method, request.url, response=raw)
+            except MaxRetryError as exc:
+                if retries.raise_on_status:
+                    raw.close()
+                    raise requests.exceptions.RetryError(exc, request=request) from exc
+                return self.build_response(request, raw)
+            retries.sleep(raw)
+            raw.close()
+
+    def close(self) -> None:
+        super().close()
+        self.client.close()
+
+
+class LocalH2Server:
+    """A cleartext HTTP/2 server on localhost, for tests.
+
+    routes maps a path to (status, headers, body); other paths get 404.
+    Bodies must fit the initial 64 KiB flow-control window. The first
+    `failures` requests are answered 503, to exercise retries. Records
+    the TCP connections accepted and every request's method, path, headers
+    and body.
+    """
+
+    def __init__(self, routes: dict[str, tuple[int, dict, bytes]], failures: int = 0) -> None:
+        if h2 is None:
+            raise RuntimeError("LocalH2Server requires the optional h2 package")
+        self.routes = routes
+        self.failures = failures
+        self.connections = 0
+        self.requests: list[dict] = []
+        self._lock = threading.Lock()
+        self._socket = None
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._socket.getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    def _response(self, request: dict) -> tuple[int, dict, bytes]:
+        with self._lock:
+            self.requests.append(request)
+            if self.failures:
+                self.failures -= 1
+                return 503, {}, b""
+        return self.routes.get(request["path"], (404, {}, b""))
+
+    def _serve(self, sock: socket.socket) -> None:
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        streams = {}
+
+        with sock:
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers = dict(event.headers)
+                        streams[event.stream_id] = {
+                            "method": headers.pop(":method"),
+                            "path": headers.pop(":path"),
+                            "headers": headers,
+                            "body": b"",
+                        }
+                    elif isinstance(event, h2.events.DataReceived):
+                        streams[event.stream_id]["body"] += event.data
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        request = streams.pop(event.stream_id)
+                        status, headers, body = self._response(request)
+                        if request["method"] == "HEAD":
+                            body = b""
+                        conn.send_headers(
+                            event.stream_id,
+                            [(":status", str(status)), *headers.items()],
+                            end_stream=not body,
+                        )
+                        size = conn.max_outbound_frame_size
+                        for start in range(0, len(body), size):
+                            conn.send_data(
+                                event.stream_id,
+                                body[start : start + size],
+                                end_stream=start + size >= len(body),
+                            )
+                sock.sendall(conn.data_to_send())
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, _ = self._socket.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            thread = threading.Thread(target=self._serve, args=(sock,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self) -> "LocalH2Server":
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        thread = threading.Thread(target=self._accept, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self._socket.close()
+        return False
@@ -0,0 +1,99 @@
+"""JSON encoding and decoding through orjson when it is installed.
+
+The builder parses JSON-LD on every page it reads and rewrites whole
+archives on every run. orjson does both several times faster than the
+stdlib json module. It is optional: without it, every function here is the
+stdlib call it replaces. Output does not depend on which library ran, so
+archive files stay byte for byte the same and their git diffs stay small.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import chain, islice
+from typing import Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional dependency, only needed for speed
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses it, so one except clause catches both.
+JSONDecodeError = json.JSONDecodeError
+# Values orjson writes exactly like json.dumps. Floats are not among them:
+# orjson writes 1e16 and null where json writes 1e+16 and NaN.
+EXACT_TYPES = frozenset((str, int, bool, type(None)))
+STR_TYPE = frozenset((str,))
+DICT_TYPE = frozenset((dict,))
+# Items encoded per call by iter_dumps_list; about 180 KiB of archive text.
+LIST_BATCH = 256
+# orjson parses integers beyond 64 bits as floats, without an error, and has
+# no option to keep them. Every such literal has at least 19 digits in a row;
+# mapping all digits to "0" lets a plain substring search find those runs.
+DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"0" * 9)
+LONG_DIGIT_RUN = b"0" * 19
+
+
+def loads(data: str | bytes):
+    """Parse a JSON document from text or UTF-8 bytes, like json.loads."""
+    if orjson is not None:
+        # Encoded once here, which orjson would otherwise do itself. Lone
+        # surrogates pass through and make orjson refuse the document.
+        encoded = data.encode("utf-8", "surrogatepass") if isinstance(data, str) else data
+        # A long digit run may be a big integer, or only part of a string:
+        # either way json parses it exactly.
+        if LONG_DIGIT_RUN not in encoded.translate(DIGITS_TO_ZERO):
+            try:
+                return orjson.loads(encoded)
+            except orjson.JSONDecodeError:
+                # NaN or invalid JSON: json decides.
+                pass
+    return json.loads(data)
+
+
+def encodes_exactly(value) -> bool:
+    """Whether orjson's output for value matches json.dumps."""
+    kind = type(value)
+    if kind in EXACT_TYPES:
+        return True
+    if kind is dict:
+        if not STR_TYPE.issuperset(map(type, value)):
+            return False
+        items = value.values()
+    elif kind is list:
+        items = value
+        if DICT_TYPE.issuperset(map(type, value)):
+            # A list of objects, such as a batch of archive items, in one pass.
+            if not STR_TYPE.issuperset(map(type, chain.from_iterable(value))):
+                return False
+            items = list(chain.from_iterable(map(dict.values, value)))
+    else:
+        return False
+    # Archive items are flat; only nested containers need the recursive walk.
+    return EXACT_TYPES.issuperset(map(type, items)) or all(map(encodes_exactly, items))
+
+
+def dumps_indented(value) -> str:
+    """The text of json.dumps(value, ensure_ascii=False, indent=2)."""
+    if orjson is not None and encodes_exactly(value):
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and lone surrogates; json handles them.
+            pass
+    return json.dumps(value, ensure_ascii=False, indent=2)
+
+
+def iter_dumps_list(values: Iterable, batch: int = LIST_BATCH) -> Iterator[str]:
+    """The text of dumps_indented(list(values)) in pieces, without holding the list."""
+    values = iter(values)
+    first = True
+
+    while chunk := list(islice(values, batch)):
+        # "[\n  a,\n  b\n]" -> "\n  a,\n  b", joined by commas across batches.
+        text = dumps_indented(chunk)
+        yield ("[" if first else ",") + text[1:-2]
+        first = False
+
+    yield "[]" if first else "\n]"
@@ -4,14 +4,34 @@
 
 from __future__ import annotations
 
+import copy
 import io
 import os
+import re
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from email.utils import formatdate
-from typing import Callable
-
-from build_feed import atomic_write_bytes, create_session, public_file_url
+from typing import Callable, Mapping
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr, unescape
+
+from build_feed import (
+    DEFAULT_GZIP_LEVEL,
+    HISTORY_LINK_RELS,
+    HISTORY_NS,
+    archive_page_name,
+    create_session,
+    feed_history_links,
+    public_file_url,
+    remove_output,
+    split_feed_history,
+    stale_archive_pages,
+    write_if_changed,
+    write_static_pages,
+)
+from feed_validation import validate_feeds
+from static_pages import DEFAULT_HTML_PAGE_SIZE
+from websub import DEFAULT_HUB, PENDING_PINGS_FILE, feed_item_ids, record_pending_ping
 
 
 ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
@@ -19,6 +39,7 @@ GPOD_NS = "http://www.google.com/schemas/play-podcasts/1.0"
 ATOM_NS = "http://www.w3.org/2005/Atom"
 ET.register_namespace("itunes", ITUNES_NS)
 ET.register_namespace("atom", ATOM_NS)
+ET.register_namespace("fh", HISTORY_NS)
 
 
 @dataclass(frozen=True)
@@ -29,6 +50,13 @@ class GrossesTetesConfig:
     output_remaining: str = "only_remaining_feed.xml"
     style_file: str = "grosses-tetes-style.xsl"
     min_best_duration_min: int = 20
+    html_page_size: int | None = DEFAULT_HTML_PAGE_SIZE
+    current_feed_size: int | None = None
+    archive_page_size: int = 100
+    gzip_level: int | None = DEFAULT_GZIP_LEVEL
+    brotli_quality: int | None = None
+    websub_hub: str | None = None
+    websub_pending_file: str = PENDING_PINGS_FILE
     integrale_image_file: str = "Integrales.jpg"
     best_image_file: str = "Extras.jpg"
     autres_image_file: str = "Autres.jpg"
@@ -51,7 +79,23 @@ class GrossesTetesConfig:
         return self.min_best_duration_min * 60
 
 
-CONFIG = GrossesTetesConfig()
+CONFIG = GrossesTetesConfig(websub_hub=DEFAULT_HUB)
+
+ITEM_INDENT = b"    "
+NAMESPACE_DECLARATION_RE = re.compile(rb'\sxmlns:([^\s=]+)="([^"]*)"')
+
+
+@dataclass(frozen=True)
+class SourceItem:
+    """The bytes an item was parsed from, and the prefixes they rely on.
+
+    render_xml copies these bytes instead of serializing the item, so items
+    that have a SourceItem must not be modified.
+    """
+
+    data: memoryview
+    namespaces: tuple[tuple[str, str], ...]
+
 
 INTEGRALE_PREFIXES = ("L'INTÉGRALE", "DÉBRIEF")
 BEST_PREFIXES = (
@@ -118,15 +162,111 @@ def source_channel(root: ET.Element) -> ET.Element:
     return channel
 
 
+def source_item_spans(raw: bytes) -> tuple[list[tuple[int, int]], tuple[tuple[str, str], ...]] | None:
+    """Byte ranges of the channel's items in raw, and the prefixes declared above them.
+
+    Returns None when item bytes cannot be copied into another document as
+    they are: a document that is not UTF-8, has a DOCTYPE or a default
+    namespace, or has an empty-element <item/>.
+    """
+    if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return None
+
+    parser = expat.ParserCreate()
+    stack = []
+    spans = []
+    namespaces = {}
+    channels = 0
+    item_start = None
+    usable = True
+
+    def xml_declaration(version, encoding, standalone):
+        nonlocal usable
+        if encoding and encoding.lower() not in ("utf-8", "utf8"):
+            usable = False
+
+    def doctype(*args):
+        nonlocal usable
+        usable = False
+
+    def start(name, attrs):
+        nonlocal channels, item_start, usable
+        stack.append(name)
+        if len(stack) <= 2:
+            for key, value in attrs.items():
+                if key == "xmlns":
+                    usable = False
+                elif key.startswith("xmlns:"):
+                    namespaces[key[6:]] = value
+            if len(stack) == 2 and name == "channel":
+                channels += 1
+        elif len(stack) == 3 and name == "item" and stack[1] == "channel" and channels == 1:
+            item_start = parser.CurrentByteIndex
+
+    def end(name):
+        nonlocal item_start, usable
+        if item_start is not None and len(stack) == 3:
+            # The index is that of the end tag, or of the start tag for <item/>.
+            end_index = parser.CurrentByteIndex
+            if raw.startswith(b"</", end_index):
+                spans.append((item_start, raw.index(b">", end_index) + 1))
+            else:
+                usable = False
+            item_start = None
+        stack.pop()
+
+    parser.XmlDeclHandler = xml_declaration
+    parser.StartDoctypeDeclHandler = doctype
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.Parse(raw, True)
+    return (spans, tuple(namespaces.items())) if usable else None
+
+
+def parse_source_feed(raw: bytes) -> tuple[ET.Element, dict[ET.Element, SourceItem]]:
+    """Parse the source feed, with the bytes of each item for render_xml."""
+    root = ET.fromstring(raw)
+    items = source_channel(root).findall("item")
+    found = source_item_spans(raw)
+    if found is None or len(found[0]) != len(items):
+        return root, {}
+
+    spans, namespaces = found
+    data = memoryview(raw)
+    return root, {
+        item: SourceItem(data[start:end], namespaces)
+        for item, (start, end) in zip(items, spans)
+    }
+
+
+def copy_without_items(root: ET.Element) -> ET.Element:
+    """Deep-copy a feed root, except for the items of its channel."""
+    channel = source_channel(root)
+    copied = ET.Element(root.tag, root.attrib)
+    copied.text, copied.tail = root.text, root.tail
+    for child in root:
+        if child is not channel:
+            copied.append(copy.deepcopy(child))
+            continue
+        new_channel = ET.SubElement(copied, channel.tag, channel.attrib)
+        new_channel.text, new_channel.tail = channel.text, channel.tail
+        new_channel.extend(copy.deepcopy(node) for node in channel if node.tag != "item")
+    return copied
+
+
 def new_root_with_filtered_items(
-    raw: bytes,
+    source_root: ET.Element,
     predicate_item: Callable[[ET.Element], bool],
 ) -> tuple[ET.Element, ET.Element]:
-    root = ET.fromstring(raw)
+    """A copy of the source root keeping only matching items.
+
+    The items themselves are shared with the source tree, not copied.
+    """
+    root = copy_without_items(source_root)
     channel = source_channel(root)
-    for item in list(channel.findall("item")):
-        if not predicate_item(item):
-            channel.remove(item)
+    channel.extend(
+        item for item in source_channel(source_root).findall("item") if predicate_item(item)
+    )
     return root, channel
 
 
@@ -173,6 +313,110 @@ def ensure_atom_self_link(channel: ET.Element, feed_url: str) -> None:
     channel.insert(idx + 1, atom_link)
 
 
+def ensure_hub_link(channel: ET.Element, hub_url: str | None) -> None:
+    """Advertise our WebSub hub, dropping any hub copied from the source feed."""
+    for old in list(channel.findall(f"{{{ATOM_NS}}}link")):
+        if old.get("rel") == "hub":
+            channel.remove(old)
+    if not hub_url:
+        return
+
+    children = list(channel)
+    idx = 0
+    for index, child in enumerate(children):
+        if child.tag == f"{{{ATOM_NS}}}link" and child.get("rel") == "self":
+            idx = index + 1
+
+    link = ET.Element(f"{{{ATOM_NS}}}link")
+    link.set("href", hub_url)
+    link.set("rel", "hub")
+    channel.insert(idx, link)
+
+
+def apply_history_links(
+    channel: ET.Element,
+    links: list[tuple[str, str]],
+    archive_page: bool = False,
+) -> None:
+    for old in list(channel.findall(f"{{{ATOM_NS}}}link")):
+        if old.get("rel") in HISTORY_LINK_RELS:
+            channel.remove(old)
+    remove_children(channel, f"{{{HISTORY_NS}}}archive")
+
+    children = list(channel)
+    idx = 0
+    for index, child in enumerate(children):
+        if child.tag == f"{{{ATOM_NS}}}link" and child.get("rel") == "self":
+            idx = index + 1
+
+    for rel, href in reversed(links):
+        link = ET.Element(f"{{{ATOM_NS}}}link")
+        link.set("href", href)
+        link.set("rel", rel)
+        channel.insert(idx, link)
+
+    if archive_page:
+        channel.insert(idx, ET.Element(f"{{{HISTORY_NS}}}archive"))
+
+
+def archive_page_root(
+    root: ET.Element,
+    items: list[ET.Element],
+    output_file: str,
+    page: int,
+    page_count: int,
+) -> ET.Element:
+    page_root = copy_without_items(root)
+    channel = source_channel(page_root)
+    channel.extend(items)
+
+    ensure_atom_self_link(channel, public_file_url(archive_page_name(output_file, page)))
+    ensure_hub_link(channel, None)
+    apply_history_links(
+        channel,
+        feed_history_links(output_file, page, page_count),
+        archive_page=True,
+    )
+
+    # Archive pages must serialize identically until their items change.
+    newest = safe_text(items[0], "pubDate") if items else ""
+    for tag in ("pubDate", "lastBuildDate"):
+        node = channel.find(tag)
+        if node is not None and newest:
+            node.text = newest
+    return page_root
+
+
+def split_feed_pages(
+    root: ET.Element,
+    output_file: str,
+    config: GrossesTetesConfig = CONFIG,
+) -> tuple[ET.Element, dict[str, ET.Element]]:
+    """Return the bounded current feed root and its archive page roots."""
+    channel = source_channel(root)
+    items = channel.findall("item")
+    current, pages = split_feed_history(
+        items,
+        config.current_feed_size,
+        config.archive_page_size,
+    )
+    archive_roots = {
+        archive_page_name(output_file, page): archive_page_root(
+            root, page_items, output_file, page, len(pages)
+        )
+        for page, page_items in enumerate(pages, 1)
+    }
+
+    current_root = copy_without_items(root)
+    current_channel = source_channel(current_root)
+    current_channel.extend(current)
+    apply_history_links(
+        current_channel,
+        feed_history_links(output_file, None, len(pages)),
+    )
+    return current_root, archive_roots
+
+
 def finalize_channel(
     channel: ET.Element,
     src_title: str,
@@ -181,6 +425,7 @@ def finalize_channel(
     title_suffix: str,
     summary_text: str,
     now: str,
+    hub_url: str | None = None,
 ) -> None:
     feed_url = public_file_url(output_file)
     title_text = f"{src_title} ({title_suffix})"
@@ -208,6 +453,7 @@ def finalize_channel(
 
     apply_cover(channel, cover_url, title_text, feed_url)
     ensure_atom_self_link(channel, feed_url)
+    ensure_hub_link(channel, hub_url)
 
     for tag in ("pubDate", "lastBuildDate"):
         node = channel.find(tag)
@@ -255,16 +501,75 @@ def item_count(channel: ET.Element) -> int:
     return len(channel.findall("item"))
 
 
-def render_xml(root: ET.Element, style_file: str) -> bytes:
-    strip_text_edges(root)
-    ET.indent(root, space="  ")
-    buffer = io.BytesIO()
-    ET.ElementTree(root).write(buffer, encoding="utf-8", xml_declaration=True)
-    return add_stylesheet_instruction(buffer.getvalue(), style_file)
+def render_item(item: ET.Element) -> bytes:
+    # Items are shared between the split feeds; normalize a copy.
+    item = copy.deepcopy(item)
+    strip_text_edges(item)
+    ET.indent(item, space="  ", level=2)
+    item.tail = None
+    return ET.tostring(item, encoding="utf-8")
+
+
+def declare_namespaces(xml_bytes: bytes, namespaces: set[tuple[str, str]]) -> bytes | None:
+    """Add namespace declarations to the root start tag, or None on a prefix clash."""
+    root_start = xml_bytes.index(b"<", xml_bytes.index(b"?>") + 2)
+    root_end = xml_bytes.index(b">", root_start)
+    declared = {
+        prefix.decode("utf-8"): unescape(uri.decode("utf-8"), {"&quot;": '"'})
+        for prefix, uri in NAMESPACE_DECLARATION_RE.findall(xml_bytes, root_start, root_end)
+    }
+    missing = []
+    for prefix, uri in sorted(namespaces):
+        if prefix not in declared:
+            missing.append(f" xmlns:{prefix}={quoteattr(uri)}")
+        elif declared[prefix] != uri:
+            return None
+    if not missing:
+        return xml_bytes
+    return xml_bytes[:root_end] + "".join(missing).encode("utf-8") + xml_bytes[root_end:]
+
 
+def render_xml(
+    root: ET.Element,
+    style_file: str,
+    sources: Mapping[ET.Element, SourceItem] | None = None,
+) -> bytes:
+    """Serialize a feed, copying the source bytes of items found in sources.
 
-def write_xml(root: ET.Element, out_path: str, style_file: str) -> None:
-    atomic_write_bytes(out_path, render_xml(root, style_file))
+    Only the channel header is rendered and normalized; each source item is
+    spliced in as the slice of the fetched feed it was parsed from. Items
+    without source bytes are serialized on their own.
+    """
+    sources = sources or {}
+    channel = source_channel(root)
+    items = channel.findall("item")
+
+    header = ET.Element(root.tag, root.attrib)
+    header_channel = ET.SubElement(header, channel.tag, channel.attrib)
+    header_channel.extend(node for node in channel if node.tag != "item")
+    strip_text_edges(header)
+    ET.indent(header, space="  ")
+    buffer = io.BytesIO()
+    ET.ElementTree(header).write(buffer, encoding="utf-8", xml_declaration=True)
+    head = buffer.getvalue()
+
+    item_sources = [sources.get(item) for item in items]
+    namespaces = {pair for source in item_sources if source for pair in source.namespaces}
+    declared = declare_namespaces(head, namespaces) if namespaces else head
+    if declared is None:
+        # A header prefix means something else in the source: render every item.
+        item_sources = [None] * len(items)
+    else:
+        head = declared
+    head = add_stylesheet_instruction(head, style_file)
+
+    # Items go before the channel's closing tag, after the indentation line break.
+    split_at = head.rindex(b"</channel>") - 2
+    parts = [head[:split_at]]
+    for item, source in zip(items, item_sources):
+        parts.extend((ITEM_INDENT, source.data if source else render_item(item), b"\n"))
+    parts.append(head[split_at:])
+    return b"".join(parts)
 
 
 def fetch_source_feed(config: GrossesTetesConfig = CONFIG) -> bytes:
@@ -278,15 +583,16 @@ def build_split_feeds(
     raw: bytes,
     config: GrossesTetesConfig = CONFIG,
     now: str | None = None,
-) -> dict[str, ET.Element]:
+) -> tuple[dict[str, ET.Element], dict[ET.Element, SourceItem]]:
+    """The split feed roots by output file, and the source bytes of their items."""
     now = now or formatdate(usegmt=True)
-    src_root = ET.fromstring(raw)
+    src_root, sources = parse_source_feed(raw)
     src_title = safe_text(source_channel(src_root), "title")
     if not src_title:
         raise ValueError("Source RSS channel has no title")
 
     root_i, ch_i = new_root_with_filtered_items(
-        raw,
+        src_root,
         lambda item: is_integrale_title(safe_text(item, "title")),
     )
     finalize_channel(
@@ -297,10 +603,11 @@ def build_split_feeds(
         "L’intégrale",
         config.integrale_summary,
         now,
+        config.websub_hub,
     )
 
     root_b, ch_b = new_root_with_filtered_items(
-        raw,
+        src_root,
         lambda item: is_best_episode(item, config),
     )
     finalize_channel(
@@ -311,10 +618,11 @@ def build_split_feeds(
         "Extras",
         config.best_summary,
         now,
+        config.websub_hub,
     )
 
     root_r, ch_r = new_root_with_filtered_items(
-        raw,
+        src_root,
         lambda item: is_remaining_item(item, config),
     )
     finalize_channel(
@@ -325,6 +633,7 @@ def build_split_feeds(
         "Other Episodes",
         config.remaining_summary,
         now,
+        config.websub_hub,
     )
 
     outputs = {
@@ -332,22 +641,64 @@ def build_split_feeds(
         config.output_best: root_b,
         config.output_remaining: root_r,
     }
-    return outputs
+    return outputs, sources
 
 
 def write_split_feeds(
     roots: dict[str, ET.Element],
     config: GrossesTetesConfig = CONFIG,
+    sources: Mapping[ET.Element, SourceItem] | None = None,
 ) -> dict[str, str]:
+    """Render every split feed and archive page, validate them all, then write."""
     results = {}
+    documents = {}
+    stale_pages = []
     for output_file, root in roots.items():
         if item_count(source_channel(root)) == 0:
             if os.path.exists(output_file):
                 results[output_file] = "preserved"
                 continue
             raise RuntimeError(f"Refusing to create empty split feed: {output_file}")
-        write_xml(root, output_file, config.style_file)
+        if config.current_feed_size:
+            root, archive_roots = split_feed_pages(root, output_file, config)
+            for page_file, page_root in archive_roots.items():
+                documents[page_file] = render_xml(page_root, config.style_file, sources)
+            stale_pages.extend(stale_archive_pages(output_file, len(archive_roots)))
+
+        documents[output_file] = render_xml(root, config.style_file, sources)
         results[output_file] = "rebuilt"
+
+    # Nothing is written unless every document of every feed is valid.
+    validate_feeds(documents, config.style_file)
+
+    new_items = []
+    for path, xml_bytes in documents.items():
+        published_items = feed_item_ids(path) if path in results else None
+        changed = write_if_changed(
+            path,
+            xml_bytes,
+            config.gzip_level,
+            config.brotli_quality,
+        )
+        if path not in results:
+            if changed:
+                print(f"Updated archive page {path}")
+            continue
+        if changed and feed_item_ids(path) != published_items:
+            new_items.append(public_file_url(path))
+        write_static_pages(
+            xml_bytes,
+            path,
+            config.style_file,
+            config.html_page_size,
+        )
+    for stale in stale_pages:
+        remove_output(stale)
+
+    # websub.py sends one ping for every changed split feed after the push.
+    if config.websub_hub and new_items:
+        record_pending_ping(config.websub_pending_file, config.websub_hub, new_items)
+        print(f"Queued a WebSub ping for {len(new_items)} feeds")
     return results
 
 
@@ -359,8 +710,8 @@ def main(config: GrossesTetesConfig = CONFIG) -> None:
         )
 
     raw = fetch_source_feed(config)
-    roots = build_split_feeds(raw, config)
-    results = write_split_feeds(roots, config)
+    roots, sources = build_split_feeds(raw, config)
+    results = write_split_feeds(roots, config, sources)
 
     verb = "rebuilt" if results[config.output_integrale] == "rebuilt" else "preserved"
     print(f"{verb} {config.output_integrale}")
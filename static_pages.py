@@ -0,0 +1,119 @@
+"""Render the generated feeds to static HTML pages with their XSL styles."""
+
+from __future__ import annotations
+
+import copy
+import functools
+import re
+from pathlib import Path
+
+from lxml import etree
+
+
+DEFAULT_HTML_PAGE_SIZE = 50
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_stylesheet(path: str, mtime_ns: int) -> etree.XSLT:
+    return etree.XSLT(etree.parse(path))
+
+
+def compiled_stylesheet(style_file: str | Path) -> etree.XSLT:
+    """Compile an XSL file once per process; feeds sharing a style share it."""
+    path = Path(style_file).resolve()
+    return _compile_stylesheet(str(path), path.stat().st_mtime_ns)
+
+
+def html_page_name(output_file: str | Path, page: int) -> Path:
+    output = Path(output_file)
+    if page == 1:
+        return output.with_suffix(".html")
+    return output.with_name(f"{output.stem}-page-{page}.html")
+
+
+def paginate_feed(rss: bytes, page_size: int) -> list[etree._ElementTree]:
+    parser = etree.XMLParser(strip_cdata=False)
+    root = etree.fromstring(rss, parser)
+    channel = root.find("channel")
+    if channel is None:
+        raise ValueError("RSS has no channel")
+
+    items = channel.findall("item")
+    for item in items:
+        channel.remove(item)
+
+    chunks = [items[i : i + page_size] for i in range(0, len(items), page_size)] or [[]]
+    pages = []
+    for chunk in chunks:
+        page_root = copy.deepcopy(root)
+        page_channel = page_root.find("channel")
+        for item in chunk:
+            page_channel.append(item)
+        pages.append(etree.ElementTree(page_root))
+    return pages
+
+
+def add_page_navigation(
+    document: etree._ElementTree,
+    output_file: str | Path,
+    page: int,
+    page_count: int,
+) -> None:
+    if page_count < 2:
+        return
+
+    body = document.getroot().find("body")
+    if body is None:
+        return
+
+    nav = etree.SubElement(body, "nav", {"class": "wrap pages"})
+    if page > 1:
+        previous = etree.SubElement(
+            nav,
+            "a",
+            href=html_page_name(output_file, page - 1).name,
+            rel="prev",
+        )
+        previous.text = "← Épisodes plus récents"
+        previous.tail = " "
+
+    label = etree.SubElement(nav, "span")
+    label.text = f"Page {page} / {page_count}"
+
+    if page < page_count:
+        label.tail = " "
+        following = etree.SubElement(
+            nav,
+            "a",
+            href=html_page_name(output_file, page + 1).name,
+            rel="next",
+        )
+        following.text = "Épisodes plus anciens →"
+
+
+def render_static_pages(
+    rss: bytes,
+    output_file: str | Path,
+    style_file: str | Path,
+    page_size: int = DEFAULT_HTML_PAGE_SIZE,
+) -> dict[Path, bytes]:
+    transform = compiled_stylesheet(style_file)
+    pages = paginate_feed(rss, page_size)
+    rendered = {}
+
+    for page, document in enumerate(pages, 1):
+        result = transform(document)
+        add_page_navigation(result, output_file, page, len(pages))
+        rendered[html_page_name(output_file, page)] = bytes(result)
+
+    return rendered
+
+
+def stale_page_files(output_file: str | Path, keep: dict[Path, bytes]) -> list[Path]:
+    output = Path(output_file)
+    pattern = re.compile(rf"{re.escape(output.stem)}-page-\d+\.html")
+    return [
+        path
+        for path in output.parent.glob(f"{output.stem}-page-*.html")
+        if pattern.fullmatch(path.name) and path not in keep
+    ]
@@ -0,0 +1,156 @@
+import json
+from dataclasses import replace
+
+import requests
+
+from backfill import RateLimitedSession, backfill, load_journal
+from feed_registry import registry_config
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+SHOW_URL = FRANCE_CULTURE_CONFIG.show_url
+
+
+class FakeResponse:
+    def __init__(self, text="", headers=None, status_code=200):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.encoding = None
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        if url not in self.pages:
+            return FakeResponse(status_code=404)
+        return FakeResponse(self.pages[url])
+
+    def head(self, url, **kwargs):
+        return FakeResponse(headers={"Content-Length": "42"})
+
+
+def listing_page(days, next_page=None):
+    items = [
+        {
+            "@type": "RadioEpisode",
+            "url": f"{SHOW_URL}/episode-{day}",
+            "name": f"Episode {day}",
+            "description": f"Description {day}",
+            "dateCreated": f"2026-05-{day:02d}T10:00:00+00:00",
+            "image": f"https://example.com/{day}/300x300",
+            "mainEntity": {
+                "contentUrl": f"https://media.example.com/{day}.mp3",
+                "duration": "PT59M",
+            },
+        }
+        for day in days
+    ]
+    data = {"@graph": [{"@type": "ItemList", "itemListElement": items}]}
+    anchors = "".join(
+        f'<a href="{item["url"].removeprefix("https://www.radiofrance.fr")}">x</a>'
+        for item in items
+    )
+    link = f'<link rel="next" href="{next_page}">' if next_page else ""
+    return (
+        f'<html><head>{link}<script type="application/ld+json">{json.dumps(data)}'
+        f"</script></head><body>{anchors}</body></html>"
+    )
+
+
+def test_backfill_walks_pagination_and_resumes_from_the_journal(tmp_path):
+    page_2 = f"{SHOW_URL}?p=2"
+    page_3 = f"{SHOW_URL}?p=3"
+    session = FakeSession(
+        {
+            SHOW_URL: listing_page([20, 19], page_2),
+            page_2: listing_page([18, 17], page_3),
+            page_3: listing_page([16]) + f'<a href="{SHOW_URL}/cassé-1">x</a>',
+        }
+    )
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        archive_file=str(tmp_path / "episodes.json"),
+        state_file=str(tmp_path / "state.json"),
+        fetch_workers=2,
+    )
+    journal_file = tmp_path / "backfill.json"
+
+    journal = backfill(config, journal_file, session, batch_size=2, max_pages=2)
+
+    archive = json.loads((tmp_path / "episodes.json").read_text(encoding="utf-8"))
+    assert [episode["title"] for episode in archive] == [
+        "Episode 20",
+        "Episode 19",
+        "Episode 18",
+        "Episode 17",
+    ]
+    assert journal["next_page"] == page_3
+    assert load_journal(journal_file, config)["pages_done"] == 2
+
+    session.calls.clear()
+    journal = backfill(config, journal_file, session, batch_size=2)
+
+    archive = json.loads((tmp_path / "episodes.json").read_text(encoding="utf-8"))
+    assert len(archive) == 5
+    assert archive[-1]["audio_length"] == 42
+    assert journal["finished"]
+    assert journal["failures"] == {f"{SHOW_URL}/cassé-1": 1}
+    assert session.calls[0] == page_3
+
+
+def test_rate_limited_session_spaces_requests():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    session = RateLimitedSession(FakeSession({"u": ""}), 2, lambda: now[0], sleep)
+    for _ in range(3):
+        session.get("u")
+
+    assert sleeps == [0.5, 0.5]
+
+
+def test_backfill_keeps_its_batch_when_a_listing_page_fails(tmp_path):
+    page_2 = f"{SHOW_URL}?p=2"
+    # page_2 is missing, so fetching it fails with a 404 after page 1 was crawled.
+    session = FakeSession({SHOW_URL: listing_page([20, 19], page_2)})
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        archive_file=str(tmp_path / "episodes.json"),
+        state_file=str(tmp_path / "state.json"),
+        fetch_workers=1,
+    )
+    journal_file = tmp_path / "backfill.json"
+
+    journal = backfill(config, journal_file, session, batch_size=50)
+
+    archive = json.loads((tmp_path / "episodes.json").read_text(encoding="utf-8"))
+    assert [episode["title"] for episode in archive] == ["Episode 20", "Episode 19"]
+    saved = load_journal(journal_file, config)
+    assert saved["next_page"] == page_2 and not saved["finished"]
+    assert saved["pages_done"] == 1 and saved["links_added"] == 2
+    assert saved["page_failures"] == {page_2: 1}
+    assert journal == saved
@@ -0,0 +1,30 @@
+from benchmarks.bench_scale import CASES, NOW, SPLIT_CONFIG, regressions, run_suite
+from benchmarks.synthetic import synthetic_audiomeans_feed
+from keep_integrale import build_split_feeds, item_count, source_channel
+
+
+def test_synthetic_audiomeans_feed_fills_every_split_feed():
+    roots, _ = build_split_feeds(synthetic_audiomeans_feed(16), SPLIT_CONFIG, NOW)
+
+    counts = {path: item_count(source_channel(root)) for path, root in roots.items()}
+    assert counts == {
+        SPLIT_CONFIG.output_integrale: 4,
+        SPLIT_CONFIG.output_best: 6,
+        SPLIT_CONFIG.output_remaining: 6,
+    }
+
+
+def test_suite_runs_every_case_and_the_gate_flags_regressions():
+    results = run_suite([20], repeat=1)
+    assert sorted(results) == sorted(CASES)
+    assert regressions(results, results) == []
+
+    baseline = {
+        "build_rss": {"20": {"seconds": 1e-6, "peak_mib": 1000.0}},
+        "render_xml": {"20": {"seconds": 1000.0, "peak_mib": 1e-6}},
+        "unknown": {"20": {"seconds": 0.0, "peak_mib": 0.0}},
+    }
+    problems = regressions(results, baseline)
+    assert len(problems) == 2
+    assert problems[0].startswith("build_rss at 20 items: seconds")
+    assert problems[1].startswith("render_xml at 20 items: peak_mib")
@@ -0,0 +1,190 @@
+import importlib
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+import backfill
+import build_bachelot_feed
+import build_rollin_feed
+import feed_registry
+from feed_registry import load_registry, registry_config, shard_of
+from feed_runner import (
+    JOB_DONE,
+    JOB_FAILED,
+    JobQueue,
+    run_feeds,
+    run_worker,
+    share_parse_processes,
+)
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+ROLLIN_CONFIG = registry_config("rollin")
+BACHELOT_CONFIG = registry_config("bachelot")
+
+
+def test_registry_declares_the_builder_configs():
+    configs = load_registry()
+
+    assert configs["france-culture"] == FRANCE_CULTURE_CONFIG
+    assert configs["rollin"] == ROLLIN_CONFIG
+    assert configs["bachelot"] == BACHELOT_CONFIG
+    assert registry_config("rollin") is registry_config("rollin")
+
+
+def test_importing_the_builders_does_not_read_the_registry(monkeypatch):
+    def broken_registry(*args):
+        raise ValueError("Feed x has unknown fields: typo")
+
+    modules = [backfill, build_bachelot_feed, build_rollin_feed, feed_registry]
+    with monkeypatch.context() as patch:
+        patch.setattr(feed_registry, "load_registry", broken_registry)
+        feed_registry.cached_registry.cache_clear()
+        for module in modules[:-1]:
+            importlib.reload(module)
+        with pytest.raises(ValueError):
+            registry_config("rollin")
+    for module in reversed(modules):
+        importlib.reload(module)
+
+
+def test_registry_applies_defaults_and_rejects_unknown_fields(tmp_path):
+    registry = tmp_path / "feeds.toml"
+    show = "\n".join(
+        f'{key} = "{value}"'
+        for key, value in {
+            "show_url": "https://www.radiofrance.fr/franceinter/podcasts/x",
+            "show_path": "/franceinter/podcasts/x/",
+            "style_file": "x.xsl",
+            "feed_title": "X",
+            "feed_subtitle": "X",
+            "feed_description": "X",
+            "feed_image": "https://example.com/x.jpg",
+            "feed_author_name": "X",
+            "itunes_author": "X",
+            "source_label": "X",
+        }.items()
+    )
+    registry.write_text(
+        '[defaults]\nitunes_category = "News"\nmax_links_to_check = 5\n'
+        f'[feeds.x]\n{show}\noutput_file = "x.xml"\narchive_file = "x.json"\n'
+        "max_links_to_check = 9\n",
+        encoding="utf-8",
+    )
+
+    config = load_registry(registry)["x"]
+    assert config.itunes_category == "News"
+    assert config.max_links_to_check == 9
+
+    registry.write_text(registry.read_text(encoding="utf-8") + "max_link = 1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="unknown fields: max_link"):
+        load_registry(registry)
+
+
+def test_shards_are_stable_and_cover_every_feed():
+    names = [f"show-{index}" for index in range(200)]
+    shards = [shard_of(name, 4) for name in names]
+
+    assert shards == [shard_of(name, 4) for name in names]
+    assert shard_of("france-culture", 4) == 3
+    assert all(shards.count(shard) > 30 for shard in range(4))
+
+
+def test_job_queue_leases_retries_and_gives_up():
+    now = [1000.0]
+    queue = JobQueue(
+        ":memory:",
+        "run",
+        max_attempts=2,
+        lease_seconds=60,
+        retry_delay_seconds=10,
+        clock=lambda: now[0],
+    )
+    queue.enqueue({"a": 0, "b": 0, "c": 1})
+    queue.enqueue({"a": 0})
+
+    assert queue.claim("w1", shard=0) == "a"
+    assert queue.claim("w2", shard=0) == "b"
+    assert queue.claim("w2", shard=0) is None
+    assert queue.fail("b", "w2", "boom")
+    assert queue.claim("w2", shard=0) is None
+
+    now[0] += 61
+    # w1 stalled: its lease on "a" expired, and "b" finished backing off.
+    assert queue.claim("w2", shard=0) == "a"
+    assert not queue.complete("a", "w1")
+    assert queue.complete("a", "w2")
+    assert queue.claim("w2", shard=0) == "b"
+    assert queue.fail("b", "w2", "boom again")
+
+    jobs = queue.jobs()
+    assert jobs["a"] == {"status": JOB_DONE, "attempts": 2, "error": None}
+    assert jobs["b"] == {"status": JOB_FAILED, "attempts": 2, "error": "boom again"}
+    assert queue.remaining(shard=0) == 0
+    assert queue.remaining() == 1
+
+
+def test_worker_retries_a_failing_build(tmp_path):
+    attempts = []
+
+    def build(config):
+        attempts.append(config.output_file)
+        if len(attempts) == 1:
+            raise RuntimeError("listing page timed out")
+
+    configs = {"rollin": ROLLIN_CONFIG, "bachelot": BACHELOT_CONFIG}
+    with JobQueue(tmp_path / "jobs.sqlite", retry_delay_seconds=0) as queue:
+        queue.enqueue({"rollin": 0, "bachelot": 0})
+        built = run_worker(queue, configs, "w", build=build, sleep=lambda seconds: None)
+
+    assert built == ["rollin", "bachelot"]
+    assert attempts == [
+        BACHELOT_CONFIG.output_file,
+        ROLLIN_CONFIG.output_file,
+        BACHELOT_CONFIG.output_file,
+    ]
+
+
+def record_build(config):
+    with open(config.archive_file, "a", encoding="utf-8") as f:
+        f.write(config.output_file + "\n")
+
+
+def test_worker_processes_build_each_feed_of_the_shard_once(tmp_path):
+    log = tmp_path / "builds.log"
+    names = [f"show-{index}" for index in range(12)]
+    configs = {
+        name: replace(FRANCE_CULTURE_CONFIG, output_file=name, archive_file=str(log))
+        for name in names
+    }
+    shard = shard_of(names[0], 2)
+
+    jobs = run_feeds(
+        configs,
+        tmp_path / "jobs.sqlite",
+        run_id="test",
+        shard=shard,
+        shard_count=2,
+        processes=2,
+        build=record_build,
+        poll_seconds=0.05,
+    )
+
+    expected = sorted(name for name in names if shard_of(name, 2) == shard)
+    assert sorted(Path(log).read_text(encoding="utf-8").split()) == expected
+    assert sorted(jobs) == expected
+    assert all(job["status"] == JOB_DONE for job in jobs.values())
+
+
+def test_worker_processes_share_the_cpus_between_their_parser_pools():
+    configs = {
+        "default": FRANCE_CULTURE_CONFIG,
+        "explicit": replace(FRANCE_CULTURE_CONFIG, parse_processes=2),
+    }
+
+    shared = share_parse_processes(configs, processes=3, cpus=8)
+    assert shared["default"].parse_processes == 2
+    assert shared["explicit"].parse_processes == 2
+    assert share_parse_processes(configs, processes=4, cpus=2)["default"].parse_processes == 1
+    assert share_parse_processes(configs, processes=1, cpus=8)["default"].parse_processes == 8
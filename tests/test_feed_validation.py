@@ -0,0 +1,128 @@
+import shutil
+from dataclasses import replace
+
+import pytest
+
+import feed_validation
+from build_feed import build_rss, write_feed_stream
+from feed_registry import registry_config
+from feed_validation import (
+    FeedValidationError,
+    feed_file_problems,
+    feed_problems,
+    main,
+    validate_feeds,
+)
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+
+
+def episode(day, **overrides):
+    record = {
+        "title": f"Episode {day}",
+        "description": "",
+        "audio_url": f"https://example.com/{day}.mp3",
+        "audio_type": "audio/mpeg",
+        "duration_seconds": 1800,
+        "duration_itunes": "00:30:00",
+        "published": f"2026-05-{day:02d}T10:00:00+00:00",
+        "image": None,
+        "url": f"https://example.com/{day}",
+        "audio_length": 1000,
+    }
+    record.update(overrides)
+    return record
+
+
+def feed_bytes(days=(3, 2, 1)):
+    return build_rss(FRANCE_CULTURE_CONFIG, [episode(day) for day in days])
+
+
+def test_generated_feed_passes_every_check_including_its_style():
+    assert feed_problems(feed_bytes(), FRANCE_CULTURE_CONFIG.style_file) == []
+
+
+def test_feed_problems_reports_each_broken_invariant():
+    rss = feed_bytes()
+    broken = (
+        rss.replace(b"https://example.com/2</guid>", b"https://example.com/3</guid>")
+        .replace(b'length="1000"', b'length="?"', 1)
+        .replace(b"Sat, 02 May 2026", b"Sun, 31 May 2026")
+        .replace(b"<itunes:duration>00:30:00", b"<itunes:duration>half an hour", 1)
+    )
+
+    problems = feed_problems(broken)
+
+    assert any("repeats a guid" in problem for problem in problems)
+    assert any("invalid length '?'" in problem for problem in problems)
+    assert any("newer than the item before it" in problem for problem in problems)
+    assert any("invalid itunes:duration" in problem for problem in problems)
+    assert feed_problems(rss[:-20])[0].startswith("not well-formed")
+
+
+def test_feed_file_problems_match_the_in_memory_checks(tmp_path, monkeypatch):
+    rss = feed_bytes(range(9, 0, -1))
+    broken = rss.replace(b"https://example.com/4</guid>", b"https://example.com/6</guid>")
+    path = tmp_path / "feed.xml"
+    styled = []
+
+    def record_style(document, style_file):
+        styled.append(len(document.getroot().find("channel").findall("item")))
+        return []
+
+    for document in (rss, broken, b"<feed/>", b"<rss/>"):
+        path.write_bytes(document)
+        assert feed_file_problems(path) == feed_problems(document)
+    path.write_bytes(rss[:-20])
+    assert feed_file_problems(path)[0].startswith("not well-formed")
+
+    monkeypatch.setattr(feed_validation, "style_problems", record_style)
+    path.write_bytes(rss)
+    assert feed_file_problems(path, FRANCE_CULTURE_CONFIG.style_file) == []
+    # Checked items leave the tree; the style renders only the first one.
+    assert styled == [1]
+
+
+def test_feed_problems_renders_the_xsl_style(tmp_path):
+    style = tmp_path / "broken.xsl"
+    style.write_text(
+        '<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">'
+        '<xsl:template match="/"><xsl:message terminate="yes">no</xsl:message>'
+        "</xsl:template></xsl:stylesheet>",
+        encoding="utf-8",
+    )
+
+    assert "does not render" in feed_problems(feed_bytes(), style)[0]
+
+
+def test_broken_feed_never_replaces_the_published_file(tmp_path):
+    target = tmp_path / "feed.xml"
+    target.write_bytes(b"published")
+    config = replace(FRANCE_CULTURE_CONFIG, gzip_level=6)
+    broken = feed_bytes().replace(b"<title>Episode 2</title>", b"<title></title>")
+
+    with pytest.raises(FeedValidationError, match="has no title"):
+        write_feed_stream(config, str(target), [broken])
+
+    assert target.read_bytes() == b"published"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["feed.xml"]
+
+
+def test_validate_feeds_and_cli_check_several_feeds(tmp_path, capsys):
+    good = feed_bytes()
+    bad = feed_bytes((1, 2)).replace(b"Fri, 01 May 2026", b"Sun, 31 May 2026")
+
+    validate_feeds({"a.xml": good, "b.xml": good}, FRANCE_CULTURE_CONFIG.style_file)
+    with pytest.raises(FeedValidationError) as error:
+        validate_feeds({"a.xml": good, "b.xml": bad})
+    assert error.value.name == "b.xml"
+
+    shutil.copy("feed-style.xsl", tmp_path)
+    (tmp_path / "good.xml").write_bytes(good)
+    (tmp_path / "bad.xml").write_bytes(bad.replace(b"feed-style.xsl", b"missing.xsl"))
+    assert main([str(tmp_path / "good.xml"), "feed-style.xsl"]) == 0
+    assert main([str(tmp_path / "good.xml"), str(tmp_path / "bad.xml")]) == 1
+    output = capsys.readouterr().out
+    assert "bad.xml: style" in output
+    assert "good.xml: ok" in output
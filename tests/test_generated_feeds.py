@@ -81,6 +81,8 @@ def test_radiofrance_archives_match_generated_feeds():
     for archive_path, feed_path in pairs:
         archive = json.loads((ROOT / archive_path).read_text(encoding="utf-8"))
         items = channel(feed_path).findall("item")
+        for page in sorted(ROOT.glob(f"{Path(feed_path).stem}-archive-*.xml")):
+            items.extend(channel(page.name).findall("item"))
         archive_urls = {episode["url"] for episode in archive}
         feed_guids = {item.findtext("guid") for item in items}
         assert archive_urls == feed_guids
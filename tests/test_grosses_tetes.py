@@ -3,6 +3,7 @@ import xml.etree.ElementTree as ET
 import pytest
 
 from keep_integrale import (
+    ATOM_NS,
     GrossesTetesConfig,
     ITUNES_NS,
     build_split_feeds,
@@ -14,15 +15,26 @@ from keep_integrale import (
     item_count,
     is_remaining_item,
     parse_itunes_duration_to_seconds,
+    render_xml,
     source_channel,
     write_split_feeds,
 )
+from websub import read_pending_pings
 
 
-def make_item(title, duration="00:30:00"):
+def make_item(title, duration="00:30:00", pub_date="Fri, 01 May 2026 06:00:00 GMT"):
     item = ET.Element("item")
     ET.SubElement(item, "title").text = title
+    ET.SubElement(item, "guid").text = f"urn:test:{title}"
+    ET.SubElement(
+        item,
+        "enclosure",
+        url="https://media.example.com/episode.mp3",
+        length="1000",
+        type="audio/mpeg",
+    )
     ET.SubElement(item, f"{{{ITUNES_NS}}}duration").text = duration
+    ET.SubElement(item, "pubDate").text = pub_date
     return item
 
 
@@ -30,6 +42,8 @@ def make_feed(*items):
     root = ET.Element("rss", version="2.0")
     channel = ET.SubElement(root, "channel")
     ET.SubElement(channel, "title").text = "Les Grosses Têtes"
+    ET.SubElement(channel, f"{{{ITUNES_NS}}}author").text = "RTL"
+    ET.SubElement(channel, f"{{{ITUNES_NS}}}explicit").text = "false"
     for item in items:
         channel.append(item)
     return ET.tostring(root, encoding="utf-8", xml_declaration=True)
@@ -75,7 +89,7 @@ def test_build_split_feeds_allows_empty_categories():
         make_item("Une autre émission", "00:05:00"),
     )
 
-    roots = build_split_feeds(raw)
+    roots, _ = build_split_feeds(raw)
 
     assert item_count(source_channel(roots["only_integrale_feed.xml"])) == 0
     assert item_count(source_channel(roots["only_best_feed.xml"])) == 1
@@ -92,12 +106,12 @@ def test_write_split_feeds_preserves_existing_file_when_category_is_empty(tmp_pa
         make_item("BEST OF - Une sélection", "00:30:00"),
         make_item("Une autre émission", "00:05:00"),
     )
-    roots = build_split_feeds(raw, config)
+    roots, sources = build_split_feeds(raw, config)
 
     existing = tmp_path / "only_integrale_feed.xml"
     existing.write_text("keep me", encoding="utf-8")
 
-    results = write_split_feeds(roots, config)
+    results = write_split_feeds(roots, config, sources)
 
     assert existing.read_text(encoding="utf-8") == "keep me"
     assert results[str(existing)] == "preserved"
@@ -105,3 +119,156 @@ def test_write_split_feeds_preserves_existing_file_when_category_is_empty(tmp_pa
     assert results[str(tmp_path / "only_remaining_feed.xml")] == "rebuilt"
     ET.parse(tmp_path / "only_best_feed.xml")
     ET.parse(tmp_path / "only_remaining_feed.xml")
+
+
+def test_write_split_feeds_publishes_stable_archive_pages(tmp_path):
+    config = GrossesTetesConfig(
+        output_integrale=str(tmp_path / "only_integrale_feed.xml"),
+        output_best=str(tmp_path / "only_best_feed.xml"),
+        output_remaining=str(tmp_path / "only_remaining_feed.xml"),
+        current_feed_size=2,
+        archive_page_size=2,
+        html_page_size=None,
+    )
+    raw = make_feed(
+        *[
+            make_item(
+                f"L'INTÉGRALE - Émission {day}",
+                pub_date=f"{day:02d} May 2026 18:00:00 GMT",
+            )
+            for day in range(5, 0, -1)
+        ],
+        make_item("BEST OF - Une sélection", "00:30:00"),
+        make_item("Une autre émission", "00:05:00"),
+    )
+
+    roots, sources = build_split_feeds(raw, config, now="Mon, 18 May 2026")
+    write_split_feeds(roots, config, sources)
+    page = tmp_path / "only_integrale_feed-archive-1.xml"
+    first = page.read_bytes()
+    roots, sources = build_split_feeds(raw, config, now="Tue, 19 May 2026")
+    write_split_feeds(roots, config, sources)
+
+    assert page.read_bytes() == first
+    assert (tmp_path / "only_integrale_feed-archive-2.xml").exists()
+    current = source_channel(ET.parse(tmp_path / "only_integrale_feed.xml").getroot())
+    assert item_count(current) == 2
+    archive = source_channel(ET.fromstring(first))
+    assert [item.findtext("title") for item in archive.findall("item")] == [
+        "L'INTÉGRALE - Émission 2",
+        "L'INTÉGRALE - Émission 1",
+    ]
+    assert archive.find("{http://purl.org/syndication/history/1.0}archive") is not None
+
+
+def test_write_split_feeds_queues_a_hub_ping_for_feeds_with_new_items(tmp_path):
+    items = [
+        make_item("L'INTÉGRALE - Émission 2", pub_date="02 May 2026 18:00:00 GMT"),
+        make_item("BEST OF - Une sélection", "00:30:00"),
+        make_item("Une autre émission", "00:05:00"),
+    ]
+    hub_url = "https://hub.example.com/"
+    pending = tmp_path / "pending.tsv"
+    config = GrossesTetesConfig(
+        output_integrale=str(tmp_path / "only_integrale_feed.xml"),
+        output_best=str(tmp_path / "only_best_feed.xml"),
+        output_remaining=str(tmp_path / "only_remaining_feed.xml"),
+        html_page_size=None,
+        websub_hub=hub_url,
+        websub_pending_file=str(pending),
+    )
+    roots, sources = build_split_feeds(make_feed(*items), config, now="Mon")
+    write_split_feeds(roots, config, sources)
+    first = read_pending_pings(pending)[hub_url]
+    pending.unlink()
+
+    roots, sources = build_split_feeds(make_feed(*items), config, now="Tue")
+    write_split_feeds(roots, config, sources)
+    assert not pending.exists()
+
+    newer = make_item("L'INTÉGRALE - Émission 3", pub_date="03 May 2026 18:00:00 GMT")
+    roots, sources = build_split_feeds(make_feed(newer, *items), config, now="Wed")
+    write_split_feeds(roots, config, sources)
+
+    assert len(first) == 3
+    assert read_pending_pings(pending) == {hub_url: [first[0]]}
+    assert first[0].endswith("only_integrale_feed.xml")
+
+    channel = source_channel(ET.parse(tmp_path / "only_integrale_feed.xml").getroot())
+    hubs = [
+        link.get("href")
+        for link in channel.iter(f"{{{ATOM_NS}}}link")
+        if link.get("rel") == "hub"
+    ]
+    assert hubs == [hub_url]
+
+
+SOURCE_ITEM = (
+    b"<item>\n\t<title>L'INT\xc3\x89GRALE - \xc3\x89mission du 4 mai 2026  </title>"
+    b"<guid isPermaLink='false'>urn:test:4</guid>"
+    b"<description><![CDATA[<p>Avec   Laurent Ruquier</p>]]></description>"
+    b"<pubDate>Mon, 04 May 2026 18:00:00 GMT</pubDate>"
+    b'<enclosure url="https://media.example.com/4.mp3" length="1000" type="audio/mpeg"/>'
+    b"<itunes:duration>01:30:00</itunes:duration>"
+    b'<podcast:transcript url="https://media.example.com/4.vtt" type="text/vtt"/>'
+    b"</item>"
+)
+
+
+def source_feed(item=SOURCE_ITEM, encoding="UTF-8", atom_ns=ATOM_NS):
+    return (
+        f'<?xml version="1.0" encoding="{encoding}"?>\n'
+        f'<rss version="2.0" xmlns:itunes="{ITUNES_NS}" xmlns:atom="{atom_ns}"'
+        ' xmlns:podcast="https://podcastindex.org/namespace/1.0"><channel>'
+        "<title>Les Grosses T\u00eates</title>"
+        "<itunes:author>RTL</itunes:author><itunes:explicit>false</itunes:explicit>"
+    ).encode(encoding) + item + b"</channel></rss>"
+
+
+def test_render_xml_copies_source_items_byte_for_byte():
+    config = GrossesTetesConfig(websub_hub=None)
+    roots, sources = build_split_feeds(source_feed(), config, now="Mon, 18 May 2026")
+
+    xml_bytes = render_xml(roots[config.output_integrale], config.style_file, sources)
+
+    assert b"\n    " + SOURCE_ITEM + b"\n  </channel>" in xml_bytes
+    # Without the source bytes, the same item is serialized instead.
+    assert SOURCE_ITEM not in render_xml(roots[config.output_integrale], config.style_file)
+    item = source_channel(ET.fromstring(xml_bytes)).find("item")
+    transcript = item.find("{https://podcastindex.org/namespace/1.0}transcript")
+    assert transcript.get("type") == "text/vtt"
+    assert item.findtext("description") == "<p>Avec   Laurent Ruquier</p>"
+
+
+@pytest.mark.parametrize(
+    ("raw", "tag"),
+    [
+        # Item bytes are not UTF-8.
+        (
+            source_feed(SOURCE_ITEM.decode("utf-8").encode("latin-1"), "ISO-8859-1"),
+            f"{{{ITUNES_NS}}}duration",
+        ),
+        # The source's atom prefix is not the Atom namespace the header uses.
+        (
+            source_feed(
+                SOURCE_ITEM.replace(b"</item>", b"<atom:x>1</atom:x></item>"),
+                atom_ns="urn:x",
+            ),
+            "{urn:x}x",
+        ),
+    ],
+)
+def test_render_xml_serializes_items_it_cannot_copy(raw, tag):
+    config = GrossesTetesConfig(websub_hub=None)
+    roots, sources = build_split_feeds(raw, config, now="Mon, 18 May 2026")
+
+    xml_bytes = render_xml(roots[config.output_integrale], config.style_file, sources)
+
+    # Items are shared between the split feeds, so rendering leaves them as parsed.
+    shared = source_channel(roots[config.output_integrale]).find("item")
+    assert shared.findtext("title") == "L'INTÉGRALE - Émission du 4 mai 2026  "
+    assert SOURCE_ITEM not in xml_bytes
+    channel = source_channel(ET.fromstring(xml_bytes))
+    assert channel.find("item/title").text == "L'INTÉGRALE - Émission du 4 mai 2026"
+    assert channel.find(f"item/{tag}") is not None
+    assert channel.find(f"{{{ATOM_NS}}}link").get("rel") == "self"
@@ -0,0 +1,85 @@
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+from build_feed import HEADERS, create_session, session_retry
+from http2_transport import HTTP2Adapter, LocalH2Server
+
+
+def h2_session(server: LocalH2Server) -> requests.Session:
+    session = create_session()
+    session.mount(server.url, HTTP2Adapter(session_retry(), http1=False))
+    return session
+
+
+def test_create_session_sends_https_over_http2_when_asked():
+    url = "https://www.radiofrance.fr/"
+    assert isinstance(create_session(http2=True).get_adapter(url), HTTP2Adapter)
+    assert not isinstance(create_session().get_adapter(url), HTTP2Adapter)
+
+
+def test_concurrent_requests_share_one_connection():
+    page = "<html>épisode</html>".encode("utf-8")
+    routes = {
+        f"/episode-{index}": (200, {"content-type": "text/html; charset=utf-8"}, page)
+        for index in range(16)
+    }
+    with LocalH2Server(routes) as server, h2_session(server) as session:
+        with ThreadPoolExecutor(8) as pool:
+            texts = list(
+                pool.map(
+                    lambda index: session.get(f"{server.url}episode-{index}", timeout=5).text,
+                    range(16),
+                )
+            )
+
+    assert texts == ["<html>épisode</html>"] * 16
+    assert server.connections == 1
+    assert len(server.requests) == 16
+    assert server.requests[0]["headers"]["user-agent"] == HEADERS["User-Agent"]
+    assert "connection" not in server.requests[0]["headers"]
+
+
+def test_http2_adapter_keeps_retries_streaming_and_decoding():
+    body = gzip.compress(b"<head></head>" + b"x" * 40000)
+    routes = {
+        "/page": (200, {"content-encoding": "gzip", "content-length": str(len(body))}, body),
+        "/audio.mp3": (200, {"content-length": "4242"}, b""),
+        "/hub": (204, {}, b""),
+    }
+    with LocalH2Server(routes, failures=1) as server, h2_session(server) as session:
+        with session.get(f"{server.url}page", stream=True, timeout=(5, 5)) as response:
+            chunks = list(response.iter_content(16 * 1024))
+        head = session.head(f"{server.url}audio.mp3", timeout=5)
+        ping = session.post(f"{server.url}hub", data=[("hub.mode", "publish")], timeout=5)
+        missing = session.get(f"{server.url}missing", timeout=5)
+
+    # The 503 was retried like an HTTP/1.1 one, without a backoff sleep yet.
+    assert [request["path"] for request in server.requests] == [
+        "/page",
+        "/page",
+        "/audio.mp3",
+        "/hub",
+        "/missing",
+    ]
+    assert b"".join(chunks) == b"<head></head>" + b"x" * 40000
+    assert head.headers["Content-Length"] == "4242"
+    assert ping.status_code == 204
+    assert server.requests[3]["body"] == b"hub.mode=publish"
+    assert missing.status_code == 404
+
+
+def test_http2_adapter_raises_requests_errors_once_retries_run_out():
+    with LocalH2Server({}) as server:
+        url = server.url
+    adapter = HTTP2Adapter(session_retry().new(total=0), http1=False)
+    session = requests.Session()
+    session.mount(url, adapter)
+
+    with pytest.raises(requests.ConnectionError):
+        session.get(url, timeout=1)
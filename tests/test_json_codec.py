@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+import build_feed
+import json_codec
+from build_feed import iter_archive_file, iter_archive_json
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"title": "Été \"{}\"\n\x00\x1f\x7f  😀", "n": None, "ok": True, "length": 2**40},
+        {"nested": [1, {"a": [], "b": {}}], "empty": ""},
+        {"float": 1e16, "nan": float("nan"), "small": 1.5e-7},
+        {"big": 2**70},
+        {1: "non-str key"},
+        {"surrogate": "\ud800"},
+    ],
+)
+def test_dumps_indented_matches_json_dumps(codec, value):
+    expected = json.dumps(value, ensure_ascii=False, indent=2)
+    assert json_codec.dumps_indented(value) == expected
+
+    values = [value, {"plain": 1}] * 3
+    for batch in (1, 2, 256):
+        text = "".join(json_codec.iter_dumps_list(values, batch))
+        assert text == json.dumps(values, ensure_ascii=False, indent=2)
+
+
+def test_loads_accepts_what_json_accepts(codec):
+    soup = BeautifulSoup('<script>{"name": "Épisode"}</script>', "html.parser")
+
+    assert json_codec.loads(soup.script.string) == {"name": "Épisode"}
+    assert json_codec.loads("[\"é\", 1]".encode("utf-8")) == ["é", 1]
+    assert json_codec.loads(f"[NaN, {2**70}]")[1] == 2**70
+    assert json_codec.loads('{"id": "1234567890123456789012"}') == {"id": "1234567890123456789012"}
+    assert json_codec.loads('["\ud800"]') == ["\ud800"]
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads("{broken")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "1" * 30,
+        str(2**64),
+        str(-(2**63) - 1),
+        str(2**63 - 1),
+        f'{{"length": {2**70}, "n": [-{2**65}]}}',
+    ],
+)
+def test_loads_keeps_integers_beyond_64_bits_exact(codec, text):
+    # orjson would return floats for these without raising.
+    for data in (text, text.encode("utf-8")):
+        assert json_codec.loads(data) == json.loads(text)
+        assert repr(json_codec.loads(data)) == repr(json.loads(text))
+
+
+def test_archive_reads_any_layout_and_writes_the_same_bytes(codec, tmp_path, monkeypatch):
+    episodes = [
+        {"url": f"https://example.com/{i}", "title": "Été\n  }", "n": [i, {"a": None}]}
+        for i in range(40)
+    ]
+    text = "".join(iter_archive_json(episodes))
+    # A hand-edited item with a nested object closing at the item indent.
+    edited = text.replace('"n": [\n      3,', '"n": [\n  {"x": 1\n  }, 3,', 1)
+    path = tmp_path / "episodes.json"
+
+    assert text == json.dumps(episodes, ensure_ascii=False, indent=2) + "\n"
+    for layout in (text, edited, json.dumps(episodes)):
+        path.write_text(layout, encoding="utf-8")
+        for chunk in (5, 300, 1 << 16):
+            monkeypatch.setattr(build_feed, "ARCHIVE_READ_CHUNK", chunk)
+            assert list(iter_archive_file(path)) == json.loads(layout)
@@ -1,19 +1,77 @@
+import gzip
+import io
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
 import pytest
+import requests
 
+import build_feed
 from build_feed import (
-    FRANCE_CULTURE_CONFIG,
+    AudioLengthEnricher,
+    BuildReport,
+    CrawlBudget,
+    HedgedSession,
+    PageParser,
+    HISTORY_NS,
+    SKIP_BEFORE_MIN_DATE,
+    SKIP_NO_EPISODE_DATA,
+    SESSION_RETRIES,
+    SESSION_RETRY_SLEEP_SECONDS,
     RadioFranceFeedConfig,
+    RenderCache,
+    extract_episode_data,
     extract_episode_links_from_soup,
+    extract_listing_episodes_from_soup,
+    fetch_episode_html,
+    find_next_page_url,
+    iter_archive_file,
+    iter_archive_json,
+    date_to_archive,
     parse_duration_to_seconds,
+    parse_episode_page,
+    read_episode_page,
+    crawl_new_episodes,
+    discover_sitemap_links,
+    load_crawl_state,
+    merge_episodes,
+    merge_sorted_episodes,
     parse_iso_date,
+    parse_listing_page,
+    parse_official_feed,
+    prioritize_links,
+    percentile,
+    prune_skip_list,
     public_file_url,
+    record_freshness,
+    record_skip,
+    revalidate_episode,
+    save_crawl_state,
+    seed_from_official_feed,
     seconds_to_itunes_duration,
+    session_retry,
+    skip_entry_is_fresh,
+    split_feed_history,
     square_radiofrance_image_url,
     validate_archive,
+    write_feed_documents,
+    write_if_changed,
+    write_rss,
 )
-from build_bachelot_feed import BACHELOT_CONFIG
-from build_rollin_feed import ROLLIN_CONFIG
+from feed_registry import registry_config
+from websub import read_pending_pings
 from bs4 import BeautifulSoup
+from lxml import etree
+
+
+FRANCE_CULTURE_CONFIG = registry_config("france-culture")
+ROLLIN_CONFIG = registry_config("rollin")
+BACHELOT_CONFIG = registry_config("bachelot")
 
 
 def test_duration_helpers():
@@ -111,9 +169,1021 @@ def test_radiofrance_link_extraction_accepts_legacy_episode_slugs():
     ]
 
 
+def test_strained_listing_parse_finds_the_same_links_as_a_full_parse():
+    show = "/francemusique/podcasts/la-chronique-de-roselyne-bachelot"
+    html_page = f"""
+        <html><head><link rel="next" href="?p=2&amp;x=1"></head><body>
+        <a href="{show}">show</a>
+        <a href="{BACHELOT_CONFIG.show_url}">show url</a>
+        <div><p><a href="{show}/champagne-ardent-3491601">new slug</a></p></div>
+        <a href="https://www.radiofrance.fr{show}/champagne-ardent-3491601">again</a>
+        <a href="/francemusique/podcasts/autre/../la-chronique-de-roselyne-bachelot/dot-1">dots</a>
+        <a href="{show}-cheikha-remitti-1064980?from=home&amp;t=1">legacy</a>
+        <a href="{show}/champagne-ardent-3491601#player">fragment</a>
+        <a href="/francemusique/podcasts/autre-emission/x">other show</a>
+        <a>no href</a>
+        <a href="{show}/champagne-ardent-3491601">repeat</a>
+        </body></html>
+    """
+    full = BeautifulSoup(html_page, "html.parser")
+    strained = parse_listing_page(html_page)
+
+    links = extract_episode_links_from_soup(strained, BACHELOT_CONFIG)
+    assert links == [
+        f"https://www.radiofrance.fr{show}/champagne-ardent-3491601",
+        f"https://www.radiofrance.fr{show}/dot-1",
+        f"https://www.radiofrance.fr{show}-cheikha-remitti-1064980?from=home&t=1",
+        f"https://www.radiofrance.fr{show}/champagne-ardent-3491601#player",
+    ]
+    assert links == extract_episode_links_from_soup(full, BACHELOT_CONFIG)
+    assert find_next_page_url(strained, BACHELOT_CONFIG.show_url) == (
+        f"https://www.radiofrance.fr{show}?p=2&x=1"
+    )
+
+
 def test_public_file_url_defaults_to_github_pages(monkeypatch):
     monkeypatch.delenv("GTRSS_PUBLIC_BASE_URL", raising=False)
     assert public_file_url("feed.xml") == "https://datojulien.github.io/GTRSS/feed.xml"
 
     monkeypatch.setenv("GTRSS_PUBLIC_BASE_URL", "https://example.com/custom")
     assert public_file_url("feed.xml") == "https://example.com/custom/feed.xml"
+
+
+EPISODE_URL = (
+    "https://www.radiofrance.fr/franceculture/podcasts/le-cours-de-l-histoire/"
+    "une-histoire-1234"
+)
+
+
+class FakeResponse:
+    def __init__(self, text="", headers=None, status_code=200):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.raw = io.BytesIO(self.content)
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.encoding = None
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def iter_content(self, chunk_size=1):
+        while chunk := self.raw.read(chunk_size):
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, pages=None, lengths=None, etags=None):
+        self.pages = pages or {}
+        self.lengths = lengths or {}
+        self.etags = etags or {}
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append(("GET", url))
+        if url not in self.pages:
+            return FakeResponse(status_code=404)
+        etag = self.etags.get(url)
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(status_code=304)
+        return FakeResponse(self.pages[url], headers={"ETag": etag} if etag else {})
+
+    def head(self, url, **kwargs):
+        self.calls.append(("HEAD", url))
+        return FakeResponse(headers={"Content-Length": str(self.lengths.get(url, 0))})
+
+    def post(self, url, data=None, **kwargs):
+        self.calls.append(("POST", url, data))
+        return FakeResponse(status_code=204)
+
+
+def radio_episode_jsonld(**overrides):
+    episode = {
+        "@type": "RadioEpisode",
+        "url": EPISODE_URL,
+        "name": "Une histoire",
+        "description": "<p>Une description</p>",
+        "dateCreated": "2026-05-18T10:05:02+00:00",
+        "image": {
+            "url": (
+                "https://www.radiofrance.fr/pikapi/images/"
+                "951b7b95-d363-43f8-9fda-e162b17396fc/1200x680"
+            ),
+        },
+        "mainEntity": {
+            "contentUrl": "https://media.example.com/episode.mp3",
+            "duration": "PT58M56S",
+            "encodingFormat": "audio/mpeg",
+        },
+    }
+    episode.update(overrides)
+    return episode
+
+
+def listing_html(*episodes):
+    data = {"@graph": [{"@type": "ItemList", "itemListElement": list(episodes)}]}
+    return f"""
+        <script type="application/ld+json">{json.dumps(data)}</script>
+        <a href="{EPISODE_URL.removeprefix("https://www.radiofrance.fr")}">episode</a>
+    """
+
+
+def test_listing_jsonld_builds_episode_without_page_fetch():
+    soup = BeautifulSoup(listing_html(radio_episode_jsonld()), "html.parser")
+    links = extract_episode_links_from_soup(soup, FRANCE_CULTURE_CONFIG)
+    records = extract_listing_episodes_from_soup(soup, links)
+    session = FakeSession(lengths={"https://media.example.com/episode.mp3": 42})
+
+    data = extract_episode_data(session, EPISODE_URL, records[EPISODE_URL])
+
+    assert session.calls == [("HEAD", "https://media.example.com/episode.mp3")]
+    assert data["title"] == "Une histoire"
+    assert data["description"] == "Une description"
+    assert data["duration_itunes"] == "58:56"
+    assert data["audio_length"] == 42
+    assert data["image"].endswith("/300x300")
+
+
+@pytest.mark.parametrize(
+    "missing",
+    [
+        {"mainEntity": {}},
+        {"description": None},
+        {"image": None},
+        {"mainEntity": {"contentUrl": "https://media.example.com/episode.mp3"}},
+    ],
+    ids=["audio", "description", "image", "duration"],
+)
+def test_incomplete_listing_record_falls_back_to_episode_page(missing):
+    soup = BeautifulSoup(
+        listing_html(radio_episode_jsonld(**missing)),
+        "html.parser",
+    )
+    records = extract_listing_episodes_from_soup(soup, [EPISODE_URL])
+    # The page lacks the description, unless the listing lacks it too.
+    page_fields = {} if "description" in missing else {"description": None}
+    page = {"@graph": [radio_episode_jsonld(**page_fields)]}
+    session = FakeSession(
+        pages={
+            EPISODE_URL: (
+                f'<script type="application/ld+json">{json.dumps(page)}</script>'
+            ),
+        },
+    )
+
+    data = extract_episode_data(session, EPISODE_URL, records[EPISODE_URL])
+
+    assert ("GET", EPISODE_URL) in session.calls
+    assert data["audio_url"] == "https://media.example.com/episode.mp3"
+    assert data["description"] == "Une description"
+    assert data["duration_itunes"] == "58:56"
+    assert data["image"].endswith("/300x300")
+
+
+def test_episode_page_reading_stops_after_head_and_radio_episode():
+    other = {"@graph": [{"@type": "BreadcrumbList"}]}
+    episode = {"@graph": [radio_episode_jsonld(description=None)]}
+    page = (
+        "<html><head>"
+        '<meta property="og:description" content="Résumé">'
+        f'<script type="application/ld+json">{json.dumps(other)}</script>'
+        f'<script type="application/ld+json">{json.dumps(episode)}</script>'
+        "</head><body>" + "<p>Commentaires é</p>" * 5000 + "</body></html>"
+    ).encode("utf-8")
+    consumed = []
+
+    def chunks(data, size=1000):
+        for start in range(0, len(data), size):
+            consumed.append(size)
+            yield data[start : start + size]
+
+    streamed = read_episode_page(chunks(page))
+
+    assert sum(consumed) < len(page) / 10
+    assert streamed.endswith("</head>")
+    assert parse_episode_page(streamed) == parse_episode_page(page.decode("utf-8"))
+    assert parse_episode_page(streamed)["description"] == "Résumé"
+
+    without_episode = page.replace(b"RadioEpisode", b"RadioSeries")
+    consumed.clear()
+    assert read_episode_page(chunks(without_episode, 7)) == without_episode.decode("utf-8")
+    assert sum(consumed) >= len(without_episode)
+
+
+def test_episode_page_fetch_reuses_the_connection_after_a_short_remainder():
+    episode = {"@graph": [radio_episode_jsonld()]}
+    head = (
+        "<html><head>"
+        f'<script type="application/ld+json">{json.dumps(episode)}</script>'
+        "</head><body>"
+    )
+    pages = {
+        "/short": (head + "<p>Commentaires</p>" * 500 + "</body></html>").encode("utf-8"),
+        "/long": (head + "<p>Commentaires</p>" * 20000 + "</body></html>").encode("utf-8"),
+    }
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            body = pages[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with requests.Session() as session:
+            for path in ("/short", "/short", "/long", "/short"):
+                html = fetch_episode_html(session, base + path)
+                assert html.endswith("</head>")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # The long page's remainder is cut off, so only the page after it reconnects.
+    assert len(connections) == 2
+
+
+def test_skip_list_entries_expire_per_reason(tmp_path):
+    config = replace(FRANCE_CULTURE_CONFIG, state_file=str(tmp_path / "state.json"))
+    now = datetime(2026, 5, 18, tzinfo=timezone.utc)
+    state = load_crawl_state(config)
+    record_skip(state, "https://example.com/no-audio", SKIP_NO_EPISODE_DATA, now)
+    record_skip(state, "https://example.com/old", SKIP_BEFORE_MIN_DATE, now)
+    save_crawl_state(config, state)
+
+    state = load_crawl_state(config)
+    later = now + timedelta(days=1)
+    assert not skip_entry_is_fresh(state["skipped"]["https://example.com/no-audio"], later)
+    assert skip_entry_is_fresh(state["skipped"]["https://example.com/old"], later)
+
+    prune_skip_list(state, later)
+    assert list(state["skipped"]) == ["https://example.com/old"]
+
+
+def test_prioritize_links_orders_newest_first_and_keeps_listing_neighbours():
+    records = {
+        "https://example.com/b": {"published": "2026-05-10T00:00:00+00:00"},
+        "https://example.com/d": {"published": "2026-05-12T00:00:00+00:00"},
+    }
+    links = [
+        "https://example.com/a",
+        "https://example.com/b",
+        "https://example.com/c",
+        "https://example.com/d",
+    ]
+
+    assert prioritize_links(links, records) == [
+        "https://example.com/a",
+        "https://example.com/d",
+        "https://example.com/b",
+        "https://example.com/c",
+    ]
+
+
+def test_crawl_defers_remaining_links_when_budget_runs_out():
+    ticks = iter(range(0, 1000, 30))
+    budget = CrawlBudget(45, clock=lambda: next(ticks))
+    records = {
+        f"https://example.com/{index}": {
+            "title": f"Episode {index}",
+            "description": "Une description",
+            "audio_url": f"https://media.example.com/{index}.mp3",
+            "duration_seconds": 3540,
+            "published": f"2026-05-1{index}T00:00:00+00:00",
+            "image": "https://example.com/300x300",
+        }
+        for index in range(3)
+    }
+    report = BuildReport()
+
+    episodes = crawl_new_episodes(
+        FakeSession(),
+        replace(FRANCE_CULTURE_CONFIG, fetch_workers=1),
+        list(records),
+        records,
+        set(),
+        {"skipped": {}},
+        datetime(2026, 5, 20, tzinfo=timezone.utc),
+        budget,
+        report,
+    )
+
+    assert [episode["url"] for episode in episodes] == ["https://example.com/2"]
+    assert report.deferred_links == ["https://example.com/1", "https://example.com/0"]
+
+
+def test_budget_timeout_leaves_room_for_every_retry_of_a_request():
+    now = [0.0]
+    budget = CrawlBudget(240, clock=lambda: now[0])
+    assert budget.timeout(25) == 25
+
+    # Every attempt times out and every retry sleeps: the request still ends in time.
+    now[0] = 200.0
+    timeout = budget.timeout(25)
+    worst_case = (SESSION_RETRIES + 1) * timeout + SESSION_RETRY_SLEEP_SECONDS
+    assert timeout < 25
+    assert worst_case == pytest.approx(budget.remaining())
+    assert session_retry().total == SESSION_RETRIES
+
+
+def test_concurrent_crawl_parses_pages_in_a_process_pool_and_keeps_order():
+    pages = {}
+    for day in range(10, 18):
+        url = f"{EPISODE_URL}-{day}"
+        episode = radio_episode_jsonld(
+            name=f"Episode {day}",
+            dateCreated=f"2026-05-{day}T10:00:00+00:00",
+            mainEntity={"contentUrl": f"https://media.example.com/{day}.mp3"},
+        )
+        pages[url] = (
+            '<script type="application/ld+json">'
+            f'{json.dumps({"@graph": [episode]})}</script>'
+        )
+    links = list(reversed(pages))
+    config = replace(FRANCE_CULTURE_CONFIG, fetch_workers=3, parse_processes=1)
+    report = BuildReport()
+
+    def crawl(batch, parser):
+        return crawl_new_episodes(
+            FakeSession(pages=pages),
+            config,
+            batch,
+            {},
+            set(),
+            {"skipped": {}},
+            datetime(2026, 5, 20, tzinfo=timezone.utc),
+            CrawlBudget(None),
+            report,
+            parser=parser,
+        )
+
+    # Two batches, as a backfill crawls listing page by listing page, share
+    # one parser: its process pool starts once and survives both crawls.
+    with PageParser(1) as parser:
+        episodes = crawl(links[:4], parser)
+        pool = parser._pool
+        episodes += crawl(links[4:], parser)
+        assert pool is not None and parser._pool is pool
+        assert parser("<html></html>") is None
+
+    assert [episode["url"] for episode in episodes] == links
+    assert episodes[0]["title"] == "Episode 17"
+    assert not report.failed_links and not report.deferred_links
+
+
+def sitemap_xml(kind, entries):
+    tag = "sitemap" if kind == "sitemapindex" else "url"
+    body = "".join(
+        f"<{tag}><loc>{loc}</loc><lastmod>{lastmod}</lastmod></{tag}>"
+        for loc, lastmod in entries
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<{kind} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</{kind}>'
+    )
+
+
+def test_sitemap_discovery_uses_lastmod_watermarks_and_etags():
+    index_url = "https://www.radiofrance.fr/sitemap.xml"
+    child_url = "https://www.radiofrance.fr/sitemap-2026-05.xml"
+    other_url = "https://www.radiofrance.fr/sitemap-2026-04.xml"
+    show = "https://www.radiofrance.fr/franceculture/podcasts/le-cours-de-l-histoire"
+    archived, older, newer = f"{show}/archive-1", f"{show}/older-2", f"{show}/newer-3"
+    session = FakeSession(
+        pages={
+            index_url: sitemap_xml(
+                "sitemapindex",
+                [(child_url, "2026-05-20"), (other_url, "2026-04-30")],
+            ),
+            child_url: sitemap_xml(
+                "urlset",
+                [
+                    (archived, "2026-05-10T08:00:00+00:00"),
+                    (older, "2026-05-11T08:00:00+00:00"),
+                    (newer, "2026-05-19T08:00:00+00:00"),
+                    ("https://www.radiofrance.fr/franceinter/autre", "2026-05-19"),
+                ],
+            ),
+            other_url: sitemap_xml("urlset", [(f"{show}/avril-4", "2026-04-02")]),
+        },
+        etags={index_url: '"i1"', child_url: '"c1"', other_url: '"o1"'},
+    )
+    config = replace(FRANCE_CULTURE_CONFIG, sitemap_url=index_url)
+    state = {"skipped": {}, "validators": {}}
+
+    links, changed = discover_sitemap_links(session, config, state, {archived})
+
+    assert links == [newer, older, f"{show}/avril-4"]
+    assert changed == set()
+
+    session.calls.clear()
+    assert discover_sitemap_links(session, config, state, {archived}) == ([], set())
+    assert session.calls == [("GET", index_url)]
+
+    session.pages[index_url] = sitemap_xml(
+        "sitemapindex",
+        [(child_url, "2026-05-21"), (other_url, "2026-04-30")],
+    )
+    session.pages[child_url] = sitemap_xml(
+        "urlset",
+        [(archived, "2026-05-21T08:00:00+00:00"), (newer, "2026-05-19T08:00:00+00:00")],
+    )
+    session.etags.update({index_url: '"i2"', child_url: '"c2"'})
+    session.calls.clear()
+
+    links, changed = discover_sitemap_links(session, config, state, {archived, newer})
+
+    assert changed == {archived}
+    assert links == []
+    assert session.calls == [("GET", index_url), ("GET", child_url)]
+
+
+def test_sitemap_mode_crawls_at_most_max_links_and_settles_skipped_links(tmp_path, monkeypatch):
+    index_url = "https://www.radiofrance.fr/sitemap.xml"
+    show = "https://www.radiofrance.fr/franceculture/podcasts/le-cours-de-l-histoire"
+    empty, failing, overflow = f"{show}/vide-3", f"{show}/en-panne-2", f"{show}/plus-tard-1"
+    session = FakeSession(
+        pages={
+            index_url: sitemap_xml(
+                "urlset",
+                [
+                    (empty, "2026-05-19T08:00:00+00:00"),
+                    (failing, "2026-05-18T08:00:00+00:00"),
+                    (overflow, "2026-05-17T08:00:00+00:00"),
+                ],
+            ),
+            empty: "<html></html>",
+        },
+        etags={index_url: '"s1"'},
+    )
+    monkeypatch.setattr(build_feed, "create_session", lambda http2=False: session)
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        sitemap_url=index_url,
+        max_links_to_check=2,
+        output_file=str(tmp_path / "feed.xml"),
+        archive_file=str(tmp_path / "episodes.json"),
+        state_file=str(tmp_path / "state.json"),
+        freshness_file=str(tmp_path / "freshness.jsonl"),
+        websub_pending_file=str(tmp_path / "pending.tsv"),
+        render_cache_file=None,
+        html_page_size=None,
+        gzip_level=None,
+    )
+    archived = {
+        "title": "Déjà archivé",
+        "description": "",
+        "audio_url": "https://media.example.com/1.mp3",
+        "audio_type": "audio/mpeg",
+        "duration_seconds": 3540,
+        "duration_itunes": "59:00",
+        "published": "2026-05-01T03:00:00+00:00",
+        "image": None,
+        "url": f"{show}/archive-0",
+        "audio_length": 999,
+    }
+    (tmp_path / "episodes.json").write_text(json.dumps([archived]), encoding="utf-8")
+
+    report = build_feed.build_feed(config)
+
+    state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+    assert ("GET", overflow) not in session.calls
+    assert report.failed_links == [failing]
+    # The page without episode data is in the skip list, so it is not pending.
+    assert sorted(state["pending_links"]) == [failing, overflow]
+
+    session.calls.clear()
+    build_feed.build_feed(config)
+
+    state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+    assert ("GET", empty) not in session.calls
+    assert ("GET", overflow) in session.calls
+    assert sorted(state["pending_links"]) == [failing, overflow]
+
+
+def test_official_feed_seeds_archive_and_scrapes_only_the_links_it_misses(tmp_path):
+    show = "https://www.radiofrance.fr/franceculture/podcasts/le-cours-de-l-histoire"
+    rss = f"""<?xml version="1.0" encoding="UTF-8"?>
+        <rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+          <channel>
+            <item>
+              <title>Épisode officiel</title>
+              <link>{show}/officiel-2</link>
+              <pubDate>Tue, 19 May 2026 05:00:00 +0200</pubDate>
+              <enclosure url="https://media.example.com/2.mp3" length="1234" type="audio/mpeg"/>
+              <itunes:duration>01:02:03</itunes:duration>
+            </item>
+            <item>
+              <title>Déjà archivé</title>
+              <link>{show}/archive-1</link>
+              <pubDate>Mon, 18 May 2026 05:00:00 +0200</pubDate>
+              <enclosure url="https://media.example.com/1.mp3" length="999" type="audio/mpeg"/>
+              <itunes:duration>3540</itunes:duration>
+            </item>
+            <item><title>Sans lien</title><link>https://example.com/x</link></item>
+          </channel>
+        </rss>""".encode()
+    archived = {
+        "title": "Déjà archivé",
+        "description": "",
+        "audio_url": "https://media.example.com/1.mp3",
+        "audio_type": "audio/mpeg",
+        "duration_seconds": None,
+        "duration_itunes": None,
+        "published": "2026-05-18T03:00:00+00:00",
+        "image": None,
+        "url": f"{show}/archive-1",
+        "audio_length": None,
+    }
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        archive_file=str(tmp_path / "episodes.json"),
+        official_feed_url="https://example.com/official.xml",
+    )
+    (tmp_path / "episodes.json").write_text(json.dumps([archived]), encoding="utf-8")
+
+    records = parse_official_feed(rss, config)
+    new, filled = seed_from_official_feed(config, records, {archived["url"]})
+
+    assert [record["url"] for record in records] == [f"{show}/officiel-2", archived["url"]]
+    assert new[0]["published"] == "2026-05-19T03:00:00+00:00"
+    assert new[0]["duration_itunes"] == "1:02:03"
+    assert new[0]["audio_length"] == 1234
+    assert filled == [dict(archived, audio_length=999, duration_seconds=3540, duration_itunes="59:00")]
+
+    listing = {
+        f"{show}/gap-3": {"published": "2026-05-20T03:00:00+00:00"},
+        new[0]["url"]: {"published": new[0]["published"]},
+        f"{show}/ancien-0": {"published": "2026-05-10T03:00:00+00:00"},
+    }
+    session = FakeSession()
+    crawled = crawl_new_episodes(
+        session,
+        replace(config, fetch_workers=1),
+        list(listing),
+        listing,
+        {archived["url"], new[0]["url"]},
+        {"skipped": {}},
+        datetime(2026, 5, 20, tzinfo=timezone.utc),
+        CrawlBudget(None),
+        BuildReport(),
+        {record["url"] for record in records},
+    )
+
+    # Older than the official feed's newest item, but missing from it.
+    assert crawled == []
+    assert session.calls == [("GET", f"{show}/gap-3"), ("GET", f"{show}/ancien-0")]
+
+
+def test_build_fetches_enclosure_lengths_during_the_crawl_and_writes_once(tmp_path, monkeypatch):
+    record = {
+        "title": "Une histoire",
+        "description": "Une description",
+        "audio_url": "https://media.example.com/episode.mp3",
+        "duration_seconds": 3536,
+        "duration_itunes": "58:56",
+        "published": "2026-05-18T10:05:02+00:00",
+        "image": "https://example.com/300x300",
+    }
+    session = FakeSession(lengths={record["audio_url"]: 4242})
+    monkeypatch.setattr(build_feed, "create_session", lambda http2=False: session)
+    monkeypatch.setattr(
+        build_feed,
+        "get_episode_links",
+        lambda *args: ([EPISODE_URL], {EPISODE_URL: record}),
+    )
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        output_file=str(tmp_path / "feed.xml"),
+        archive_file=str(tmp_path / "episodes.json"),
+        state_file=str(tmp_path / "state.json"),
+        freshness_file=str(tmp_path / "freshness.jsonl"),
+        websub_pending_file=str(tmp_path / "pending.tsv"),
+        render_cache_file=None,
+        html_page_size=None,
+        gzip_level=None,
+    )
+
+    assert extract_episode_data(session, EPISODE_URL, record, fetch_length=False)[
+        "audio_length"
+    ] is None
+    assert session.calls == []
+    publishes = []
+    publish_archive = build_feed.publish_archive
+    monkeypatch.setattr(
+        build_feed,
+        "publish_archive",
+        lambda *args: publishes.append(args) or publish_archive(*args),
+    )
+
+    report = build_feed.build_feed(config)
+
+    archive = json.loads((tmp_path / "episodes.json").read_text(encoding="utf-8"))
+    enclosure = etree.parse(str(tmp_path / "feed.xml")).find("channel/item/enclosure")
+    assert len(publishes) == 1
+    assert report.enriched_episodes == 1
+    assert archive[0]["audio_length"] == 4242
+    assert enclosure.get("length") == "4242"
+    # The hub is pinged after the push, by websub.py, not by the builder.
+    assert session.calls == [("HEAD", record["audio_url"])]
+    assert report.hub_ping_queued
+    assert read_pending_pings(config.websub_pending_file) == {
+        config.websub_hub: [public_file_url(config.output_file)],
+    }
+    assert archive[0]["discovered"]
+
+    session.calls.clear()
+    report = build_feed.build_feed(config)
+
+    assert session.calls == []
+    assert not report.hub_ping_queued
+
+
+def test_enclosure_lengths_still_pending_when_the_budget_ends_are_published_as_zero():
+    release = threading.Event()
+
+    class SlowEnclosureSession(FakeSession):
+        def head(self, url, **kwargs):
+            if url.endswith("slow.mp3"):
+                release.wait(5)
+            return super().head(url, **kwargs)
+
+    now = [0.0]
+    budget = CrawlBudget(100, clock=lambda: now[0])
+    session = SlowEnclosureSession(lengths={"https://media.example.com/fast.mp3": 42})
+    started = time.monotonic()
+    with AudioLengthEnricher(session, budget, workers=2) as enricher:
+        enricher.submit("https://example.com/fast", "https://media.example.com/fast.mp3")
+        enricher.submit("https://example.com/slow", "https://media.example.com/slow.mp3")
+        time.sleep(0.1)
+        now[0] = 99.8
+        lengths = enricher.lengths()
+    release.set()
+
+    assert time.monotonic() - started < 2
+    assert lengths == {"https://example.com/fast": 42, "https://example.com/slow": 0}
+    assert enricher.pending == 1
+
+
+def test_freshness_history_reports_latency_percentiles_and_empty_runs(tmp_path):
+    config = replace(FRANCE_CULTURE_CONFIG, freshness_file=str(tmp_path / "freshness.jsonl"))
+    start = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    (tmp_path / "freshness.jsonl").write_text(
+        '{"at":"2026-01-01T00:00:00+00:00","new":1,"latency":[1]}\n',
+        encoding="utf-8",
+    )
+
+    for hour, delay in enumerate([None, 600, None, 3600, 60]):
+        now = start + timedelta(hours=hour)
+        episodes = []
+        if delay is not None:
+            episodes.append({
+                "published": date_to_archive(now - timedelta(seconds=delay)),
+                "discovered": date_to_archive(now),
+            })
+        summary = record_freshness(config, episodes, now)
+
+    lines = (tmp_path / "freshness.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5
+    assert json.loads(lines[-1]) == {"at": "2026-05-01T04:00:00+00:00", "new": 1, "latency": [60]}
+    assert summary == {"runs": 5, "empty_runs": 2, "episodes": 3, "p50": 600, "p90": 3600, "p99": 3600}
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+
+
+def test_revalidation_uses_etag_and_fingerprint_to_detect_changes():
+    page = {"@graph": [radio_episode_jsonld()]}
+    html_page = f'<script type="application/ld+json">{json.dumps(page)}</script>'
+    session = FakeSession(
+        pages={EPISODE_URL: html_page},
+        lengths={"https://media.example.com/episode.mp3": 42},
+        etags={EPISODE_URL: '"v1"'},
+    )
+    stored = extract_episode_data(session, EPISODE_URL)
+    state = {"skipped": {}, "validators": {}}
+
+    assert revalidate_episode(session, stored, state) is None
+    assert state["validators"][EPISODE_URL]["etag"] == '"v1"'
+    assert revalidate_episode(session, stored, state) is None
+
+    page = {"@graph": [radio_episode_jsonld(name="Un titre corrigé")]}
+    session.pages[EPISODE_URL] = (
+        f'<script type="application/ld+json">{json.dumps(page)}</script>'
+    )
+    session.etags[EPISODE_URL] = '"v2"'
+    updated = revalidate_episode(session, stored, state)
+
+    assert updated["title"] == "Un titre corrigé"
+    assert updated["audio_length"] == 42
+
+
+def test_split_feed_history_keeps_full_archive_pages_stable():
+    current, pages = split_feed_history(list(range(9, -1, -1)), 3, 3)
+
+    assert current == [9, 8, 7]
+    assert pages == [[2, 1, 0], [5, 4, 3], [6]]
+
+    current, pages = split_feed_history(list(range(10, -1, -1)), 3, 3)
+
+    assert pages == [[2, 1, 0], [5, 4, 3], [7, 6]]
+
+
+def test_paged_rss_links_current_feed_and_archive_pages(tmp_path):
+    episodes = [
+        {
+            "title": f"Episode {day}",
+            "description": "",
+            "audio_url": f"https://example.com/{day}.mp3",
+            "audio_type": "audio/mpeg",
+            "duration_seconds": None,
+            "duration_itunes": None,
+            "published": f"2026-05-{day:02d}T10:00:00+00:00",
+            "image": None,
+            "url": f"https://example.com/{day}",
+            "audio_length": 1,
+        }
+        for day in range(1, 8)
+    ]
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        output_file=str(tmp_path / "feed.xml"),
+        render_cache_file=None,
+        current_feed_size=2,
+        archive_page_size=3,
+    )
+
+    write_rss(config, episodes)
+    first_page = (tmp_path / "feed-archive-1.xml").read_bytes()
+    write_rss(config, episodes[:6])
+
+    assert (tmp_path / "feed-archive-1.xml").read_bytes() == first_page
+    assert not (tmp_path / "feed-archive-3.xml").exists()
+
+    atom = "{http://www.w3.org/2005/Atom}link"
+    current = etree.parse(str(tmp_path / "feed.xml")).getroot().find("channel")
+    assert len(current.findall("item")) == 2
+    assert [link.get("rel") for link in current.iter(atom)] == ["self", "hub", "prev-archive"]
+
+    archive = etree.fromstring(first_page).find("channel")
+    assert archive.find(f"{{{HISTORY_NS}}}archive") is not None
+    assert [link.get("rel") for link in archive.iter(atom)] == [
+        "self",
+        "current",
+        "next-archive",
+    ]
+    assert [item.findtext("title") for item in archive.findall("item")] == [
+        "Episode 3",
+        "Episode 2",
+        "Episode 1",
+    ]
+
+
+def test_write_if_changed_maintains_precompressed_siblings(tmp_path):
+    target = tmp_path / "feed.xml"
+    data = b"<rss>" + b"<item/>" * 200 + b"</rss>"
+
+    assert write_if_changed(target, data, gzip_level=6)
+    gz_bytes = (tmp_path / "feed.xml.gz").read_bytes()
+    assert gzip.decompress(gz_bytes) == data
+    assert not write_if_changed(target, data, gzip_level=6)
+
+    (tmp_path / "feed.xml.br").write_bytes(b"stale")
+    assert not write_if_changed(target, data, gzip_level=6)
+    assert not (tmp_path / "feed.xml.br").exists()
+
+    assert write_if_changed(target, data + b"\n", gzip_level=6)
+    assert (tmp_path / "feed.xml.gz").read_bytes() != gz_bytes
+
+    write_if_changed(target, data)
+    assert not (tmp_path / "feed.xml.gz").exists()
+
+
+def test_archive_file_streams_round_trip_with_small_reads(tmp_path, monkeypatch):
+    episodes = [
+        {"url": f"https://example.com/{i}", "title": "Été \"{}\"\n", "n": [i, {"a": None}]}
+        for i in range(5)
+    ]
+    path = tmp_path / "episodes.json"
+    text = "".join(iter_archive_json(episodes))
+
+    assert text == json.dumps(episodes, ensure_ascii=False, indent=2) + "\n"
+    assert "".join(iter_archive_json([])) == "[]\n"
+
+    path.write_text(text, encoding="utf-8")
+    monkeypatch.setattr(build_feed, "ARCHIVE_READ_CHUNK", 7)
+    assert list(iter_archive_file(path)) == episodes
+
+    path.write_text("[1, 2] 3", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_archive_file(path))
+
+
+def test_streaming_merge_and_feed_match_list_pipeline(tmp_path, monkeypatch):
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(build_feed, "datetime", FixedDatetime)
+    episodes = [
+        {
+            "title": f"Episode {day}",
+            "description": "",
+            "audio_url": f"https://example.com/{day}.mp3",
+            "audio_type": "audio/mpeg",
+            "duration_seconds": None,
+            "duration_itunes": None,
+            "published": f"2026-05-{day:02d}T10:00:00+00:00",
+            "image": None,
+            "url": f"https://example.com/{day}",
+            "audio_length": 1,
+        }
+        for day in range(9, 0, -1)
+    ]
+    updates = [
+        dict(episodes[4], title="Corrigé"),
+        dict(episodes[0], published="2026-05-10T10:00:00+00:00", url="https://example.com/10"),
+    ]
+
+    merged = list(merge_sorted_episodes(iter(episodes), updates))
+    assert merged == merge_episodes(episodes, updates)
+
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        output_file=str(tmp_path / "feed.xml"),
+        render_cache_file=None,
+        websub_hub=None,
+    )
+    write_feed_documents(config, iter(merged), len(merged))
+
+    # The list pipeline: one feedgen document holding every item, sorted
+    # by sort_rss_items_newest_first rather than spliced fragment by fragment.
+    fg = build_feed.new_feed_generator(
+        config,
+        build_feed.public_file_url(config.output_file),
+        FixedDatetime.now(timezone.utc),
+    )
+    for episode in merged:
+        build_feed.add_feed_entry(fg, config, episode)
+    expected = build_feed.sort_rss_items_newest_first(fg.rss_str(pretty=True))
+    expected = build_feed.add_stylesheet_instruction(expected, config.style_file)
+    assert (tmp_path / "feed.xml").read_bytes() == expected
+
+
+def test_render_cache_reuses_fragments_and_follows_the_archive(tmp_path):
+    episodes = [
+        {
+            "title": f"Episode {day}",
+            "description": "Résumé <b>échappé</b>",
+            "audio_url": f"https://example.com/{day}.mp3",
+            "audio_type": "audio/mpeg",
+            "duration_seconds": 60,
+            "duration_itunes": "1:00",
+            "published": f"2026-05-{day:02d}T10:00:00+00:00",
+            "image": None,
+            "url": f"https://example.com/{day}",
+            "audio_length": 1,
+        }
+        for day in range(5, 0, -1)
+    ]
+    cache_file = tmp_path / "render-cache.sqlite"
+    config = replace(
+        FRANCE_CULTURE_CONFIG,
+        output_file=str(tmp_path / "feed.xml"),
+        render_cache_file=str(cache_file),
+    )
+
+    with RenderCache(cache_file) as cache:
+        first = [cache.fragment(config, episode) for episode in episodes]
+    assert (cache.hits, cache.misses) == (0, 5)
+    assert first == [build_feed.render_item(config, episode) for episode in episodes]
+
+    episodes[0] = dict(episodes[0], title="Titre corrigé")
+    with RenderCache(cache_file) as cache:
+        second = [cache.fragment(config, episode) for episode in episodes[:4]]
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert second[1:] == first[1:4]
+    assert "Titre corrigé".encode() in second[0]
+
+    with RenderCache(cache_file) as cache:
+        count = cache._db.execute("SELECT COUNT(*) FROM fragments").fetchone()[0]
+    assert count == 4
+
+
+class StalledSession:
+    """Answers every request at once, except the first, which waits for release."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+        self.responses = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        response = FakeResponse(f"réponse {len(self.calls)}")
+        self.responses.append(response)
+        if len(self.calls) == 1:
+            self.release.wait(5)
+        return response
+
+    def post(self, url, **kwargs):
+        self.calls.append(("POST", url))
+        return FakeResponse(status_code=204)
+
+
+def test_hedged_session_answers_with_the_faster_copy_within_budget():
+    session = StalledSession()
+    hedged = HedgedSession(session, budget_ratio=0.5, initial_delay=0.05)
+
+    response = hedged.get("https://www.radiofrance.fr/a")
+    session.release.set()
+    assert response.text == "réponse 2"
+    assert session.calls == [("GET", "https://www.radiofrance.fr/a")] * 2
+
+    # The primary answered after the hedge won; its response gets closed.
+    hedged.close()
+    hedged._executor.shutdown(wait=True)
+    assert session.responses[0].closed
+
+    # One hedge out of one request is over the 0.5 budget: no second hedge.
+    over = HedgedSession(StalledSession(), budget_ratio=0.5, initial_delay=0.05)
+    over.hedged = over.requests = 1
+    threading.Timer(0.2, over.session.release.set).start()
+    assert over.head("https://www.radiofrance.fr/b").text == "réponse 1"
+    assert len(over.session.calls) == 1
+    assert over.post("https://hub.example.com/").status_code == 204
+    over.close()
+
+    assert hedged.stats() == {"requests": 1, "hedged": 1, "hedge_wins": 1, "over_budget": 0}
+    assert over.stats() == {"requests": 2, "hedged": 1, "hedge_wins": 0, "over_budget": 1}
+
+
+def test_hedge_threshold_does_not_count_time_queued_behind_other_requests():
+    class SlowFirstSession:
+        def request(self, method, url, **kwargs):
+            if url.endswith("/slow"):
+                time.sleep(0.3)
+            return FakeResponse(url)
+
+    # Hedges are never allowed, so every request reaching the threshold counts.
+    hedged = HedgedSession(SlowFirstSession(), budget_ratio=0, max_workers=1, initial_delay=0.1)
+    slow = threading.Thread(target=hedged.get, args=("https://www.radiofrance.fr/slow",))
+    slow.start()
+    time.sleep(0.02)
+    # Queued for about 0.3 s behind /slow, then answered at once.
+    assert hedged.get("https://www.radiofrance.fr/fast").text.endswith("/fast")
+    slow.join()
+    hedged.close()
+
+    assert hedged.stats()["over_budget"] == 1
+
+
+def test_build_closes_the_hedged_session_when_it_fails(monkeypatch):
+    closed = []
+    monkeypatch.setattr(build_feed, "create_session", lambda http2=False: FakeSession())
+    monkeypatch.setattr(HedgedSession, "close", lambda self: closed.append(self))
+
+    def broken_archive(*args):
+        raise OSError("archive unreadable")
+
+    monkeypatch.setattr(build_feed, "index_archive", broken_archive)
+
+    with pytest.raises(OSError):
+        build_feed.build_feed(replace(FRANCE_CULTURE_CONFIG, hedge_budget=0.05))
+    assert len(closed) == 1
+
+
+def test_hedge_threshold_follows_each_hosts_latency_percentile():
+    hedged = HedgedSession(StalledSession(), budget_ratio=0.1, initial_delay=3.0, min_delay=0.25)
+    for index in range(20):
+        hedged._latencies.setdefault("fast.example.com", deque()).append(0.1)
+        hedged._latencies.setdefault("slow.example.com", deque()).append(0.5 + index / 10)
+    hedged._latencies["new.example.com"] = deque([0.1] * 3)
+
+    assert hedged.threshold("fast.example.com") == 0.25
+    assert hedged.threshold("slow.example.com") == pytest.approx(2.3)
+    assert hedged.threshold("new.example.com") == 3.0
+    hedged.close()
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from lxml import etree
+
+from build_feed import write_static_pages
+from static_pages import compiled_stylesheet, html_page_name, render_static_pages
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def make_rss(count):
+    items = "".join(
+        f"""
+        <item>
+          <title>Épisode {index}</title>
+          <link>https://example.com/{index}</link>
+          <enclosure url="https://example.com/{index}.mp3" length="1" type="audio/mpeg"/>
+        </item>"""
+        for index in range(count)
+    )
+    return f"""<?xml version='1.0' encoding='UTF-8'?>
+    <rss version="2.0"><channel><title>Flux</title>{items}</channel></rss>
+    """.encode("utf-8")
+
+
+def test_stylesheets_are_compiled_once_per_file():
+    style = ROOT / "grosses-tetes-style.xsl"
+    assert compiled_stylesheet(style) is compiled_stylesheet(str(style))
+
+
+def test_render_static_pages_paginates_with_navigation(tmp_path):
+    output = tmp_path / "feed.xml"
+    pages = render_static_pages(make_rss(5), output, ROOT / "feed-style.xsl", 2)
+
+    assert list(pages) == [
+        tmp_path / "feed.html",
+        tmp_path / "feed-page-2.html",
+        tmp_path / "feed-page-3.html",
+    ]
+    first = etree.HTML(pages[tmp_path / "feed.html"])
+    assert [a.text for a in first.iterfind(".//article//h2/a")] == ["Épisode 0", "Épisode 1"]
+    assert first.find(".//nav/a[@rel='next']").get("href") == "feed-page-2.html"
+    last = etree.HTML(pages[tmp_path / "feed-page-3.html"])
+    assert last.find(".//nav/a[@rel='prev']").get("href") == "feed-page-2.html"
+
+
+def test_write_static_pages_skips_unchanged_pages_and_removes_stale_ones(tmp_path):
+    output = tmp_path / "feed.xml"
+    style = ROOT / "feed-style.xsl"
+
+    assert len(write_static_pages(make_rss(3), output, style, 1)) == 3
+    assert write_static_pages(make_rss(3), output, style, 1) == []
+
+    write_static_pages(make_rss(1), output, style, 1)
+
+    assert html_page_name(output, 1).exists()
+    assert not html_page_name(output, 2).exists()
+    assert not html_page_name(output, 3).exists()
@@ -0,0 +1,67 @@
+import requests
+
+from websub import (
+    LocalHub,
+    feed_item_ids,
+    main,
+    notify_hub,
+    notify_pending_pings,
+    record_pending_ping,
+)
+
+
+def test_notify_hub_batches_topics_and_retries_with_backoff():
+    sleeps = []
+    topics = ["https://example.com/a.xml", "https://example.com/b.xml"]
+
+    with LocalHub(failures=2) as hub:
+        assert notify_hub(requests.Session(), hub.url, topics, sleep=sleeps.append)
+
+    assert hub.requests == 3
+    assert hub.pings == [topics]
+    assert sleeps == [2.0, 4.0]
+
+
+def test_notify_hub_reports_an_unreachable_hub_without_raising(capsys):
+    sleeps = []
+    with LocalHub() as hub:
+        assert notify_hub(requests.Session(), hub.url, [], sleep=sleeps.append)
+        assert hub.requests == 0
+        stopped = hub.url
+
+    assert not notify_hub(requests.Session(), stopped, ["x"], attempts=2, sleep=sleeps.append)
+    assert sleeps == [2.0]
+    assert "was not notified" in capsys.readouterr().out
+
+
+def test_feed_item_ids_reads_the_guids_of_a_written_feed(tmp_path):
+    feed = tmp_path / "feed.xml"
+    assert feed_item_ids(feed) is None
+
+    feed.write_text(
+        "<rss><channel><item><guid> a </guid></item><item><guid>b</guid></item>"
+        "</channel></rss>",
+        encoding="utf-8",
+    )
+    assert feed_item_ids(feed) == {"a", "b"}
+
+
+def test_pending_pings_are_sent_once_per_hub_and_kept_until_they_succeed(tmp_path):
+    pending = tmp_path / "pending.tsv"
+    with LocalHub(failures=1) as hub, LocalHub() as other:
+        record_pending_ping(pending, hub.url, ["https://example.com/a.xml"])
+        record_pending_ping(pending, other.url, ["https://example.com/b.xml"])
+        record_pending_ping(
+            pending,
+            hub.url,
+            ["https://example.com/c.xml", "https://example.com/a.xml"],
+        )
+
+        assert not notify_pending_pings(requests.Session(), pending, attempts=1)
+        assert pending.exists()
+        assert main(["--pending-file", str(pending)]) == 0
+
+    assert not pending.exists()
+    assert hub.pings == [["https://example.com/a.xml", "https://example.com/c.xml"]]
+    assert other.pings == [["https://example.com/b.xml"]] * 2
+    assert main(["--pending-file", str(pending)]) == 0
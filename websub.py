@@ -0,0 +1,185 @@
+"""WebSub publisher side: tell a hub when a generated feed has new items.
+
+Feeds advertise the hub with <atom:link rel="hub">. Builders record every
+feed whose item set changed in a pending file; once the feeds are pushed
+and served, `python websub.py` sends each hub one publish ping for them.
+The hub then fetches those feeds and pushes them to subscribers, so
+podcast apps need not poll. LocalHub stands in for a hub in tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs
+
+import requests
+from lxml import etree
+
+
+DEFAULT_HUB = "https://pubsubhubbub.appspot.com/"
+# One "hub<TAB>topic" line per changed feed, appended by every builder.
+PENDING_PINGS_FILE = "websub-pending.tsv"
+PING_ATTEMPTS = 4
+PING_BACKOFF_SECONDS = 2.0
+PING_TIMEOUT_SECONDS = 20
+
+
+def feed_item_ids(path: str | Path) -> frozenset[str] | None:
+    """The guids of a written feed's items, or None when the feed does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    ids = set()
+    for _, guid in etree.iterparse(str(path), tag="guid", resolve_entities=False, huge_tree=True):
+        ids.add((guid.text or "").strip())
+        guid.clear()
+    return frozenset(ids)
+
+
+def notify_hub(
+    session: requests.Session,
+    hub_url: str,
+    topic_urls: list[str],
+    attempts: int = PING_ATTEMPTS,
+    backoff_seconds: float = PING_BACKOFF_SECONDS,
+    sleep: Callable[[float], None] = time.sleep,
+) -> bool:
+    """Send one publish ping covering every topic, retrying with exponential backoff."""
+    if not topic_urls:
+        return True
+
+    data = [("hub.mode", "publish")] + [("hub.url", url) for url in topic_urls]
+    error = None
+    for attempt in range(attempts):
+        if attempt:
+            sleep(backoff_seconds * 2 ** (attempt - 1))
+        try:
+            response = session.post(hub_url, data=data, timeout=PING_TIMEOUT_SECONDS)
+        except requests.RequestException as exc:
+            error = repr(exc)
+            continue
+
+        if 200 <= response.status_code < 300:
+            return True
+        error = f"HTTP {response.status_code}"
+        # Other client errors will not succeed on a retry.
+        if response.status_code < 500 and response.status_code != 429:
+            break
+
+    print(f"WebSub hub {hub_url} was not notified: {error}")
+    return False
+
+
+def record_pending_ping(path: str | Path, hub_url: str, topic_urls: list[str]) -> None:
+    """Queue topics for the hub; builders run in parallel, so lines are appended."""
+    if not topic_urls:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(f"{hub_url}\t{url}\n" for url in topic_urls))
+
+
+def read_pending_pings(path: str | Path) -> dict[str, list[str]]:
+    """The queued topics of each hub, in first-recorded order."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+
+    pings = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        hub_url, _, topic_url = line.partition("\t")
+        topics = pings.setdefault(hub_url, [])
+        if topic_url and topic_url not in topics:
+            topics.append(topic_url)
+    return pings
+
+
+def notify_pending_pings(
+    session: requests.Session,
+    path: str | Path = PENDING_PINGS_FILE,
+    **kwargs,
+) -> bool:
+    """Send each hub one ping for its queued topics; the file goes once all succeed."""
+    notified = all(
+        [
+            notify_hub(session, hub_url, topic_urls, **kwargs)
+            for hub_url, topic_urls in read_pending_pings(path).items()
+        ]
+    )
+    if notified:
+        Path(path).unlink(missing_ok=True)
+    return notified
+
+
+class LocalHub:
+    """A WebSub hub on localhost that records publish pings.
+
+    The first `failures` pings are answered 503, to exercise retries.
+    """
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.pings: list[list[str]] = []
+        self.requests = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                hub.requests += 1
+
+                if form.get("hub.mode") != ["publish"] or not form.get("hub.url"):
+                    status = 400
+                elif hub.failures:
+                    hub.failures -= 1
+                    status = 503
+                else:
+                    hub.pings.append(form["hub.url"])
+                    status = 204
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "LocalHub":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        return False
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pending-file", default=PENDING_PINGS_FILE)
+    args = parser.parse_args(argv)
+    return 0 if notify_pending_pings(requests.Session(), args.pending_file) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())